@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark da AST em arena (ArenaAST) contra a árvore de NoAST
+Mede a memória retida pela AST de um programa grande, o pico durante a
+análise sintática e o tempo da análise sintática e da semântica em cada forma
+
+Uso: python benchmarks/benchmark_arena.py [megabytes]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from benchmark_lexico import gerar_programa
+
+
+def medir(tokens, compacto: bool):
+    """Retorna (AST, erros, tempo, memória retida, pico) da análise sintática"""
+    parser = AnalisadorSintatico()
+    analisar = parser.analisar_compacto if compacto else parser.analisar
+
+    inicio = time.perf_counter()
+    ast, erros = analisar(tokens)
+    tempo = time.perf_counter() - inicio
+    del ast
+
+    gc.collect()
+    tracemalloc.start()
+    ast, erros = analisar(tokens)
+    retida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ast, erros, tempo, retida, pico
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    codigo = gerar_programa(megabytes)
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar_compacto(codigo)
+
+    print("=" * 60)
+    print("BENCHMARK DA AST EM ARENA RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Tamanho do código: {len(codigo) / (1024 * 1024):.1f} MB ({len(tokens):,} tokens)\n")
+
+    resultados = {}
+    for nome, compacto in (('NoAST', False), ('ArenaAST', True)):
+        ast, erros, tempo, retida, pico = medir(tokens, compacto)
+
+        inicio = time.perf_counter()
+        AnalisadorSemantico().analisar(ast)
+        tempo_semantico = time.perf_counter() - inicio
+
+        resultados[nome] = ast.to_dict()
+        print(f"{nome:<10} sintática {tempo:6.2f} s  semântica {tempo_semantico:6.2f} s  "
+              f"retida {retida / 2**20:7.1f} MB  pico {pico / 2**20:7.1f} MB")
+        del ast
+
+    mesma = resultados['NoAST'] == resultados['ArenaAST']
+    print(f"\nMesma árvore: {'✅' if mesma else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise sintática de expressões Rainbow
+Mede o AnalisadorSintatico em um programa gerado com muitas expressões e em
+cadeias longas de operadores (binários e unários) que não podem esbarrar no
+limite de recursão do Python
+
+Uso: python benchmarks/benchmark_expressoes.py [linhas]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+
+OPERADORES = ['OU', 'E', 'igual', 'diferente', '>', '<', '>=', '<=', '+', '-', '*', '/', '%']
+OPERANDOS = ['1', '#a', '#b', '2.5', '"x"', 'Verdadeiro', 'Falso']
+
+
+def gerar_expressao(aleatorio: random.Random, termos: int) -> str:
+    partes = [aleatorio.choice(OPERANDOS)]
+    for _ in range(termos - 1):
+        operando = aleatorio.choice(OPERANDOS)
+        if aleatorio.random() < 0.15:
+            operando = f"({operando} + 1)"
+        elif aleatorio.random() < 0.1:
+            operando = f"NAO {operando}"
+        partes.append(aleatorio.choice(OPERADORES))
+        partes.append(operando)
+    return " ".join(partes)
+
+
+def gerar_programa(linhas: int) -> str:
+    aleatorio = random.Random(7)
+    partes = ["RAINBOW."]
+    for i in range(linhas):
+        partes.append(f"#v{i % 50} recebe {gerar_expressao(aleatorio, aleatorio.randint(1, 12))}.")
+    return "\n".join(partes)
+
+
+def medir(codigo: str, repeticoes: int = 5):
+    """Retorna (melhor tempo em segundos, número de tokens, erros sintáticos)"""
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    melhor = float('inf')
+    erros = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _, erros = AnalisadorSintatico().analisar(tokens)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, len(tokens), erros
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("=" * 60)
+    print("BENCHMARK DE EXPRESSÕES DO ANALISADOR SINTÁTICO RAINBOW 🌈")
+    print("=" * 60)
+
+    casos = [
+        (f"{linhas:,} atribuições", gerar_programa(linhas)),
+        ("cadeia de 100.000 '+'", "RAINBOW.\n#x recebe " + " + ".join(["1"] * 100000) + "."),
+        ("cadeia de 100.000 '*'/'+'", "RAINBOW.\n#x recebe " +
+         " + ".join(["2 * 3"] * 50000) + "."),
+        ("20.000 'NAO' aninhados", "RAINBOW.\n#x recebe " + "NAO " * 20000 + "Verdadeiro."),
+    ]
+    for nome, codigo in casos:
+        tempo, total_tokens, erros = medir(codigo)
+        situacao = '✅' if not erros else f'❌ {erros[0]}'
+        print(f"{nome:<28}{tempo:>8.3f} s {total_tokens / tempo:>12,.0f} tokens/s  {situacao}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise léxica incremental Rainbow
+Aplica edições de linhas a um programa gerado com LexicoIncremental e compara o
+tempo por edição com a reanálise completa do buffer; o resultado de cada edição é
+conferido contra AnalisadorLexico.analisar
+
+Uso: python benchmarks/benchmark_incremental.py [linhas] [edicoes]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico, LexicoIncremental
+from benchmark_lexico import TRECHO
+
+
+# Linhas usadas nas edições, incluindo chaves desbalanceadas e erros léxicos
+LINHAS_EDICAO = [
+    '#x recebe #x + 1.',
+    'se (#x > 2) {',
+    '}',
+    '} senao {',
+    'mostrar("texto não fechado).',
+    '#valor recebe 2.a3 @ ç.',
+    '// comentário {',
+    '',
+]
+
+
+def gerar_programa(linhas: int) -> str:
+    partes = ["RAINBOW."]
+    n = 0
+    while len(partes) < linhas:
+        partes.extend(TRECHO.format(n=n).splitlines())
+        n += 1
+    return "\n".join(partes[:linhas])
+
+
+def chaves(tokens):
+    return [(t.tipo, t.lexema, t.linha, t.coluna) for t in tokens]
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    edicoes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    aleatorio = random.Random(42)
+
+    analisador = AnalisadorLexico()
+    buffer = LexicoIncremental(analisador, gerar_programa(linhas))
+
+    print("=" * 60)
+    print("BENCHMARK DA ANÁLISE LÉXICA INCREMENTAL RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Linhas: {len(buffer.linhas):,}  Edições: {edicoes}\n")
+
+    tempo_edicao = tempo_completo = 0.0
+    divergencias = 0
+    for _ in range(edicoes):
+        inicio = aleatorio.randint(1, len(buffer.linhas))
+        fim = min(len(buffer.linhas), inicio + aleatorio.choice((-1, 0, 0, 0, 1, 2)))
+        texto = "\n".join(aleatorio.choice(LINHAS_EDICAO) for _ in range(aleatorio.choice((0, 1, 1, 1, 2))))
+
+        t0 = time.perf_counter()
+        buffer.editar(inicio, fim, texto)
+        tempo_edicao += time.perf_counter() - t0
+
+        codigo = buffer.codigo()
+        t0 = time.perf_counter()
+        tokens, erros = AnalisadorLexico().analisar(codigo)
+        tempo_completo += time.perf_counter() - t0
+
+        if chaves(buffer.tokens) != chaves(tokens) or buffer.erros != erros:
+            divergencias += 1
+
+    print(f"{'incremental':<14}{tempo_edicao / edicoes * 1000:>9.3f} ms/edição")
+    print(f"{'completa':<14}{tempo_completo / edicoes * 1000:>9.3f} ms/edição "
+          f"{tempo_completo / tempo_edicao:>8.1f}x")
+    print(f"\n{'✅ resultados idênticos' if not divergencias else f'❌ {divergencias} edições divergentes'}")
+
+
+if __name__ == "__main__":
+    main()
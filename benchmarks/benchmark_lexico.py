@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark do analisador léxico Rainbow
+Compara a varredura original, caractere a caractere ('caracteres'), com a
+varredura por expressão regular única ('padrao') em um arquivo de vários MB
+
+Uso: python benchmarks/benchmark_lexico.py [megabytes]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico
+
+
+# Trecho com todas as classes de lexema: palavras reservadas, variáveis,
+# números, textos com escape, operadores, chaves e comentários
+TRECHO = '''// Bloco {n}
+#soma recebe 0.
+#media recebe 12.75.
+para #i de 1 ate 100 passo 1 {{
+    se (#i % 3 igual 0 E #i >= 10) {{
+        #soma recebe #soma + #i * 2.
+    }} senaose (#i <= -5 OU NAO Verdadeiro) {{
+        mostrar("Valor:\\t" + #i).
+    }} senao {{
+        #soma recebe #soma - 1.
+    }}
+}}
+enquanto (#soma > 0) {{
+    #soma recebe #soma / 2.
+}}
+mostrar("Total de {n}: " + #soma).
+'''
+
+
+def gerar_programa(megabytes: float) -> str:
+    """Repete o trecho até atingir o tamanho pedido"""
+    partes = ["RAINBOW.\n"]
+    tamanho = 0
+    n = 0
+    while tamanho < megabytes * 1024 * 1024:
+        trecho = TRECHO.format(n=n)
+        partes.append(trecho)
+        tamanho += len(trecho)
+        n += 1
+    return "".join(partes)
+
+
+def medir(modo: str, codigo: str, repeticoes: int = 5):
+    """Retorna (melhor tempo em segundos, tokens, erros)"""
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        analisador = AnalisadorLexico(modo=modo)
+        inicio = time.perf_counter()
+        resultado = analisador.analisar(codigo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return (melhor,) + resultado
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    codigo = gerar_programa(megabytes)
+
+    print("=" * 60)
+    print("BENCHMARK DO ANALISADOR LÉXICO RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Tamanho do código: {len(codigo) / (1024 * 1024):.1f} MB "
+          f"({codigo.count(chr(10)) + 1:,} linhas)\n")
+
+    resultados = {modo: medir(modo, codigo) for modo in ('caracteres', 'padrao')}
+
+    base = resultados['caracteres']
+    for modo, (tempo, tokens, erros) in resultados.items():
+        mesmos = ([(t.tipo, t.lexema, t.linha, t.coluna) for t in tokens] ==
+                  [(t.tipo, t.lexema, t.linha, t.coluna) for t in base[1]] and erros == base[2])
+        print(f"{modo:<12}{tempo:>8.3f} s {len(tokens) / tempo:>14,.0f} tokens/s "
+              f"{base[0] / tempo:>7.2f}x  {'✅' if mesmos else '❌ tokens diferentes'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos motores de execução do interpretador Rainbow
+Compara o interpretador por linhas, o executor AST, a máquina virtual
+e o transpilador Python em laços numéricos apertados
+
+Uso: python benchmarks/benchmark_motores.py [iteracoes_externas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from interpretador_rainbow import InterpretadorRainbow
+
+
+def gerar_programa(externas: int, internas: int = 50) -> str:
+    """Gera um programa com dois laços 'para' aninhados e aritmética simples"""
+    return f'''RAINBOW.
+
+#soma recebe 0.
+para #i de 1 ate {externas} passo 1 {{
+    para #j de 1 ate {internas} passo 1 {{
+        #produto recebe #i * #j.
+        #soma recebe #soma + #produto.
+    }}
+}}
+mostrar(#soma).
+'''
+
+
+def medir(motor: str, codigo: str, repeticoes: int = 3):
+    """Retorna (melhor tempo em segundos, saída do programa)"""
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        interpretador = InterpretadorRainbow(motor=motor)
+        inicio = time.perf_counter()
+        sucesso, resultado = interpretador.executar_codigo(codigo)
+        duracao = time.perf_counter() - inicio
+        if not sucesso:
+            raise RuntimeError(f"Motor '{motor}' falhou: {resultado}")
+        melhor = min(melhor, duracao)
+    return melhor, resultado
+
+
+def main():
+    externas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    codigo = gerar_programa(externas)
+    total_iteracoes = externas * 50
+
+    print("=" * 60)
+    print("BENCHMARK DOS MOTORES DE EXECUÇÃO RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Iterações do laço interno: {total_iteracoes}\n")
+
+    tempos = {}
+    saidas = {}
+    for motor in ('linhas', 'ast', 'vm', 'python'):
+        tempos[motor], saidas[motor] = medir(motor, codigo)
+
+    if len(set(saidas.values())) != 1:
+        print(f"⚠️  Saídas divergentes: {saidas}")
+
+    base = tempos['linhas']
+    print(f"{'Motor':<10}{'Tempo (s)':>12}{'Iter/s':>14}{'Speedup':>10}")
+    print("-" * 46)
+    for motor, tempo in tempos.items():
+        print(f"{motor:<10}{tempo:>12.4f}{total_iteracoes / tempo:>14,.0f}{base / tempo:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark do otimizador da AST Rainbow
+Executa um programa cujos laços usam constantes, expressões constantes, ramos
+de depuração desligados e variáveis que nunca são lidas nos motores ast, vm e
+python, com e sem OtimizadorAST, e compara o tamanho do bytecode gerado. Saídas
+e variáveis finais das duas versões são conferidas (as variáveis removidas pelo
+otimizador ficam de fora)
+
+Uso: python benchmarks/benchmark_otimizador.py [iteracoes_externas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from otimizador_ast import OtimizadorAST
+from executor_ast import ExecutorAST
+from gerador_bytecode import GeradorBytecode
+from maquina_virtual import MaquinaVirtual
+from transpilador_python import TranspiladorPython, ExecutorPython
+
+
+def gerar_programa(externas: int) -> str:
+    """Laços com constantes atribuídas uma vez, expressões constantes e código morto"""
+    return f'''RAINBOW.
+
+#depurar recebe Falso.
+#largura recebe 8.
+#altura recebe #largura * 2 + 1.
+#escala recebe (#altura - 1) / #largura.
+#prefixo recebe "total: ".
+#total recebe 0.
+para #i de 1 ate {externas} passo 1 {{
+    para #j de 1 ate 50 passo 1 {{
+        #total recebe #total + #j * #escala + #largura * #altura - (3 * 4 + 2).
+        #ultimo recebe #j * #largura.
+        se (#depurar) {{
+            mostrar("j: " + #j).
+        }} senaose (#total > 100000 E #altura > 10) {{
+            #total recebe #total % (#largura * 1000).
+        }}
+        enquanto (#depurar E #total < 0) {{
+            #total recebe #total + 1.
+        }}
+    }}
+}}
+mostrar(#prefixo + #total).
+'''
+
+
+def preparar(codigo: str, otimizar: bool):
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    ast, _ = AnalisadorSintatico().analisar(tokens)
+    analisador = AnalisadorSemantico()
+    analisador.analisar(ast)
+    otimizador = None
+    if otimizar:
+        otimizador = OtimizadorAST(analisador)
+        otimizador.otimizar(ast)
+    return ast, analisador, otimizador
+
+
+def gerar_bytecode(ast, analisador):
+    return GeradorBytecode().gerar(ast, analisador.tabela_simbolos.obter_slots())
+
+
+def executar(motor: str, ast, analisador):
+    """Retorna (tempo em segundos, saída, variáveis)"""
+    saida = []
+    entrada = lambda prompt: ""
+    if motor == 'ast':
+        executor, alvo = ExecutorAST(saida.append, entrada), ast
+    elif motor == 'vm':
+        executor = MaquinaVirtual(saida.append, entrada)
+        alvo = gerar_bytecode(ast, analisador)
+    else:
+        executor = ExecutorPython(saida.append, entrada)
+        alvo = TranspiladorPython(analisador.tipos).compilar(ast)
+    inicio = time.perf_counter()
+    variaveis = executor.executar(alvo)
+    return time.perf_counter() - inicio, saida, dict(variaveis)
+
+
+def main():
+    externas = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    codigo = gerar_programa(externas)
+
+    print("=" * 60)
+    print("BENCHMARK DO OTIMIZADOR DA AST RAINBOW 🌈")
+    print("=" * 60)
+
+    original = preparar(codigo, False)
+    inicio = time.perf_counter()
+    otimizado = preparar(codigo, True)
+    otimizador = otimizado[2]
+    print(f"Otimização (com as análises): {(time.perf_counter() - inicio) * 1000:.2f} ms")
+    for nome, total in otimizador.estatisticas.items():
+        print(f"  {nome}: {total}")
+    instrucoes_sem = len(gerar_bytecode(*original[:2]).codigo)
+    instrucoes_com = len(gerar_bytecode(*otimizado[:2]).codigo)
+    print(f"Bytecode: {instrucoes_sem} → {instrucoes_com} instruções")
+
+    divergencias = 0
+    for motor in ('ast', 'vm', 'python'):
+        tempo_sem, saida_sem, variaveis_sem = min(executar(motor, *original[:2]) for _ in range(3))
+        tempo_com, saida_com, variaveis_com = min(executar(motor, *otimizado[:2]) for _ in range(3))
+        if (saida_sem, {nome: variaveis_sem.get(nome) for nome in variaveis_com}) != (saida_com, variaveis_com):
+            divergencias += 1
+        print(f"\n{motor}:")
+        print(f"  {'original':<12}{tempo_sem:>8.4f} s")
+        print(f"  {'otimizado':<12}{tempo_com:>8.4f} s {tempo_sem / tempo_com:>8.2f}x")
+
+    print(f"\n{'✅ resultados idênticos' if not divergencias else f'❌ {divergencias} motores divergentes'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise léxica paralela Rainbow
+Mede AnalisadorLexico.analisar_paralelo com 1 até N processos em um programa gerado
+e confere que tokens e erros são iguais aos da análise em um único processo
+
+Uso: python benchmarks/benchmark_paralelo.py [megabytes] [processos]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico
+from benchmark_lexico import gerar_programa
+
+
+def medir(codigo: str, processos: int):
+    """Retorna (tempo em segundos, tokens, erros)"""
+    analisador = AnalisadorLexico(estatisticas=False)
+    inicio = time.perf_counter()
+    tokens, erros = analisador.analisar_paralelo(codigo, processos=processos)
+    return time.perf_counter() - inicio, tokens, erros
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 32
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    codigo = gerar_programa(megabytes)
+
+    print("=" * 60)
+    print("BENCHMARK DA ANÁLISE LÉXICA PARALELA RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Tamanho do código: {len(codigo) / (1024 * 1024):.1f} MB  "
+          f"CPUs: {os.cpu_count()}\n")
+
+    base = None
+    processos = 1
+    while processos <= maximo:
+        tempo, tokens, erros = medir(codigo, processos)
+        if base is None:
+            base = (tempo, tokens, erros)
+        mesmos = (tokens.tipos == base[1].tipos and tokens.linhas == base[1].linhas and
+                  tokens.colunas == base[1].colunas and tokens.inicios == base[1].inicios and
+                  erros == base[2])
+        print(f"{processos:>3} processo(s){tempo:>9.3f} s {base[0] / tempo:>7.2f}x  "
+              f"{'✅' if mesmos else '❌ tokens diferentes'}")
+        processos *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ASTs profundas
+Analisa semanticamente, converte para dicionário e escreve em texto árvores com
+milhares de níveis (blocos 'se'/'enquanto' aninhados, cadeias de '+' e de 'NAO'),
+que os percursos com pilha explícita atravessam sem esbarrar no limite de
+recursão do Python; tempo e pico de memória devem crescer linearmente
+
+Uso: python benchmarks/benchmark_profundidade.py [profundidade]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, ArenaAST, NoAST, TipoNo
+from analisador_semantico import AnalisadorSemantico
+
+
+def gerar_blocos(profundidade: int) -> NoAST:
+    """
+    Programa com 'se' e 'enquanto' alternados, aninhados até a profundidade pedida
+    (montado direto em NoAST: o parser de comandos ainda é recursivo)
+    """
+    corpo = NoAST(TipoNo.BLOCO, "bloco", [
+        NoAST(TipoNo.ATRIBUICAO, "#x", [NoAST(TipoNo.LITERAL, "1", [], profundidade + 2, 1)],
+              profundidade + 2, 1)
+    ], profundidade + 2, 1)
+    for nivel in range(profundidade, 0, -1):
+        condicao = NoAST(TipoNo.EXPRESSAO_BINARIA, "<", [
+            NoAST(TipoNo.VARIAVEL, "#x", [], nivel + 1, 5),
+            NoAST(TipoNo.LITERAL, "10", [], nivel + 1, 10),
+        ], nivel + 1, 8)
+        tipo, valor = (TipoNo.CONDICIONAL, "se") if nivel % 2 else (TipoNo.LACO_ENQUANTO, "enquanto")
+        comando = NoAST(tipo, valor, [condicao, corpo], nivel + 1, 1)
+        corpo = NoAST(TipoNo.BLOCO, "bloco", [comando], nivel + 1, 1)
+    inicio = NoAST(TipoNo.ATRIBUICAO, "#x", [NoAST(TipoNo.LITERAL, "0", [], 1, 10)], 1, 1)
+    return NoAST(TipoNo.PROGRAMA, "RAINBOW", [inicio, *corpo.filhos], 0, 1)
+
+
+def analisar_codigo(codigo: str) -> NoAST:
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    ast, erros = AnalisadorSintatico().analisar(tokens)
+    assert not erros, erros[0]
+    return ast
+
+
+def medir(funcao):
+    """Retorna (tempo em segundos, pico de memória em bytes, resultado) de funcao()"""
+    inicio = time.perf_counter()
+    funcao()
+    tempo = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico, resultado
+
+
+def main():
+    profundidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print("=" * 72)
+    print("BENCHMARK DE ASTs PROFUNDAS RAINBOW 🌈")
+    print(f"Profundidade: {profundidade:,} (limite de recursão: {sys.getrecursionlimit():,})")
+    print("=" * 72)
+
+    casos = [
+        ("blocos se/enquanto", gerar_blocos),
+        ("cadeia de '+'", lambda n: analisar_codigo(
+            "RAINBOW.\n#x recebe " + " + ".join(["1"] * n) + ".")),
+        ("'NAO' aninhados", lambda n: analisar_codigo(
+            "RAINBOW.\n#x recebe " + "NAO " * n + "Verdadeiro.")),
+    ]
+    parser = AnalisadorSintatico()
+    # O texto tem indentação proporcional à profundidade: descartá-lo mede só o percurso
+    descarte = open(os.devnull, 'w', encoding='utf-8')
+    print(f"{'caso':<22}{'nós':>8}{'percurso':>16}{'tempo':>10}{'pico':>12}")
+    for nome, gerar in casos:
+        # Metade da profundidade como referência: o dobro de nós deve custar ~2x
+        for n in (profundidade // 2, profundidade):
+            ast = gerar(n)
+            arena = ArenaAST()
+            raiz_arena = arena.no(arena.acrescentar(ast))
+            percursos = [
+                ("semântica", lambda: AnalisadorSemantico().analisar(ast)),
+                ("to_dict", ast.to_dict),
+                ("to_dict (arena)", raiz_arena.to_dict),
+                ("texto", lambda: parser._escrever_ast(descarte, ast, 0)),
+            ]
+            for percurso, funcao in percursos:
+                tempo, pico, resultado = medir(funcao)
+                situacao = ''
+                if percurso == "semântica":
+                    erros, _ = resultado
+                    situacao = '✅' if not erros else f'❌ {erros[0]}'
+                print(f"{nome:<22}{len(arena):>8,}{percurso:>16}{tempo:>9.3f}s"
+                      f"{pico / 1024:>9,.0f} KB  {situacao}")
+    descarte.close()
+
+
+if __name__ == "__main__":
+    main()
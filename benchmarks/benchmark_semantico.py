@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark do analisador semântico Rainbow
+Mede o custo por nó da análise semântica em ASTs sintéticas grandes (comandos
+com blocos e atribuições com expressões longas) com o despacho por tabelas de
+TipoNo, com a cadeia if/elif que ele substituiu (reproduzida em
+AnalisadorSemanticoEncadeado) e com um passo extra registrado com registrar_passo
+
+Uso: python benchmarks/benchmark_semantico.py [megabytes]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, TipoNo
+from analisador_semantico import AnalisadorSemantico, TipoSimbolo
+from percurso_ast import iterar_ast, reduzir_ast
+import benchmark_expressoes
+import benchmark_lexico
+
+
+class AnalisadorSemanticoEncadeado(AnalisadorSemantico):
+    """O mesmo analisador com o despacho anterior às tabelas: cadeias if/elif por tipo de nó"""
+
+    def _analisar_no(self, no):
+        if no.tipo == TipoNo.PROGRAMA:
+            return self._analisar_programa(no)
+        elif no.tipo == TipoNo.DECLARACAO_VARIAVEL:
+            return self._analisar_declaracao_variavel(no)
+        elif no.tipo == TipoNo.ATRIBUICAO:
+            return self._analisar_atribuicao(no)
+        elif no.tipo == TipoNo.CONDICIONAL:
+            return self._analisar_condicional(no)
+        elif no.tipo == TipoNo.LACO_PARA:
+            return self._analisar_laco_para(no)
+        elif no.tipo == TipoNo.LACO_ENQUANTO:
+            return self._analisar_laco_enquanto(no)
+        elif no.tipo == TipoNo.BLOCO:
+            return self._analisar_bloco(no)
+        else:
+            return self._analisar_expressao(no)
+
+    def _analisar_expressao(self, no):
+        self._raizes.append(no)
+        if not no.filhos:
+            return self._tipo_expressao(no, [])
+        return reduzir_ast(no, self._tipo_expressao)
+
+    def _tipo_expressao(self, no, tipos_filhos):
+        if no.tipo == TipoNo.LITERAL:
+            return self._analisar_literal(no, tipos_filhos)
+        elif no.tipo == TipoNo.VARIAVEL:
+            return self._analisar_variavel(no, tipos_filhos)
+        elif no.tipo == TipoNo.EXPRESSAO_BINARIA:
+            return self._analisar_expressao_binaria(no, tipos_filhos)
+        elif no.tipo == TipoNo.EXPRESSAO_UNARIA:
+            return self._analisar_expressao_unaria(no, tipos_filhos)
+        elif no.tipo == TipoNo.CHAMADA_FUNCAO:
+            return self._analisar_chamada_funcao(no, tipos_filhos)
+        else:
+            return TipoSimbolo.INDEFINIDO
+
+
+def contar_variaveis(analisador: AnalisadorSemantico, no):
+    """Passo extra de exemplo: conta as referências a variáveis"""
+    analisador.referencias = getattr(analisador, 'referencias', 0) + 1
+
+
+def medir(ast, classe, com_passo: bool, repeticoes: int = 5):
+    """Retorna (melhor tempo em segundos, erros, avisos)"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        analisador = classe()
+        if com_passo:
+            analisador.registrar_passo(TipoNo.VARIAVEL, contar_variaveis)
+        inicio = time.perf_counter()
+        erros, avisos = analisador.analisar(ast)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, erros, avisos
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    print("=" * 72)
+    print("BENCHMARK DO ANALISADOR SEMÂNTICO RAINBOW 🌈")
+    print("=" * 72)
+
+    casos = [
+        ("comandos e blocos", benchmark_lexico.gerar_programa(megabytes)),
+        ("expressões longas", benchmark_expressoes.gerar_programa(int(megabytes * 20000))),
+    ]
+    for nome, codigo in casos:
+        tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+        ast, _ = AnalisadorSintatico().analisar(tokens)
+        nos = sum(1 for _ in iterar_ast(ast))
+        print(f"\n{nome}: {nos:,} nós")
+        resultados = {}
+        for rotulo, classe, com_passo in (("cadeia if/elif", AnalisadorSemanticoEncadeado, False),
+                                          ("tabelas", AnalisadorSemantico, False),
+                                          ("tabelas + passo", AnalisadorSemantico, True)):
+            tempo, erros, avisos = medir(ast, classe, com_passo)
+            resultados[rotulo] = (tempo, [str(e) for e in erros], [str(a) for a in avisos])
+            print(f"  {rotulo:<18}{tempo:>8.3f} s {tempo / nos * 1e9:>8.0f} ns/nó  "
+                  f"{len(erros):,} erros, {len(avisos):,} avisos")
+        cadeia, tabelas = resultados["cadeia if/elif"], resultados["tabelas"]
+        iguais = "✅" if cadeia[1:] == tabelas[1:] else "❌ diagnósticos diferentes"
+        print(f"  tabelas / cadeia: {tabelas[0] / cadeia[0]:.2f}x  {iguais}")
+
+
+if __name__ == "__main__":
+    main()
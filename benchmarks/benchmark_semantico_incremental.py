@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise semântica incremental Rainbow
+Aplica edições de linhas com LexicoIncremental, reanalisa a sintaxe com
+AnalisadorSintatico.analisar_incremental e mede o tempo por edição de
+AnalisadorSemantico.analisar_incremental contra a análise completa; diagnósticos,
+símbolos e slots de cada edição são conferidos contra analisar
+
+Uso: python benchmarks/benchmark_semantico_incremental.py [linhas] [edicoes]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analisador_lexico import AnalisadorLexico, LexicoIncremental
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from benchmark_incremental import LINHAS_EDICAO, gerar_programa
+
+
+# Edições que mudam tipos, declarações e usos de variáveis globais
+LINHAS_SEMANTICAS = [
+    '#soma recebe "texto".',
+    'numero #soma recebe 1.',
+    'texto #nova recebe "a".',
+    'mostrar(#nova + 1).',
+    '#media recebe Verdadeiro.',
+    'enquanto (#soma) {',
+]
+
+
+def resultado(analisador: AnalisadorSemantico, erros, avisos):
+    tabela = analisador.tabela_simbolos
+    return ([str(erro) for erro in erros], [str(aviso) for aviso in avisos],
+            [simbolo.to_dict() for simbolo in tabela.obter_todos_simbolos()],
+            tabela.obter_slots())
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    edicoes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    aleatorio = random.Random(42)
+
+    buffer = LexicoIncremental(AnalisadorLexico(estatisticas=False), gerar_programa(linhas))
+    parser = AnalisadorSintatico()
+    semantico = AnalisadorSemantico()
+    ast, _ = parser.analisar_incremental(buffer.tokens)
+    semantico.analisar_incremental(ast)
+
+    print("=" * 60)
+    print("BENCHMARK DA ANÁLISE SEMÂNTICA INCREMENTAL RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Linhas: {len(buffer.linhas):,}  Edições: {edicoes}\n")
+
+    tempo_incremental = tempo_completo = 0.0
+    divergencias = 0
+    for _ in range(edicoes):
+        # A primeira linha (RAINBOW.) fica fora das edições
+        inicio = aleatorio.randint(2, len(buffer.linhas))
+        fim = min(len(buffer.linhas), inicio + aleatorio.choice((-1, 0, 0, 0, 1)))
+        buffer.editar(inicio, fim, aleatorio.choice(LINHAS_EDICAO + LINHAS_SEMANTICAS))
+        ast, _ = parser.analisar_incremental(buffer.tokens)
+
+        t0 = time.perf_counter()
+        erros, avisos = semantico.analisar_incremental(ast)
+        tempo_incremental += time.perf_counter() - t0
+        obtido = resultado(semantico, erros, avisos)
+
+        completo = AnalisadorSemantico()
+        t0 = time.perf_counter()
+        erros, avisos = completo.analisar(ast)
+        tempo_completo += time.perf_counter() - t0
+        if obtido != resultado(completo, erros, avisos):
+            divergencias += 1
+
+    print(f"{'incremental':<14}{tempo_incremental / edicoes * 1000:>9.3f} ms/edição")
+    print(f"{'completa':<14}{tempo_completo / edicoes * 1000:>9.3f} ms/edição "
+          f"{tempo_completo / tempo_incremental:>8.1f}x")
+    print(f"\n{'✅ resultados idênticos' if not divergencias else f'❌ {divergencias} edições divergentes'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise sintática incremental Rainbow
+Aplica edições de linhas com LexicoIncremental e reanalisa os tokens com
+AnalisadorSintatico.analisar_incremental, comparando o tempo por edição com a
+análise completa; AST e erros de cada edição são conferidos contra analisar
+
+Uso: python benchmarks/benchmark_sintatico_incremental.py [linhas] [edicoes]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analisador_lexico import AnalisadorLexico, LexicoIncremental
+from analisador_sintatico import AnalisadorSintatico
+from benchmark_incremental import LINHAS_EDICAO, gerar_programa
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    edicoes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    aleatorio = random.Random(42)
+
+    buffer = LexicoIncremental(AnalisadorLexico(estatisticas=False), gerar_programa(linhas))
+    parser = AnalisadorSintatico()
+    parser.analisar_incremental(buffer.tokens)
+
+    print("=" * 60)
+    print("BENCHMARK DA ANÁLISE SINTÁTICA INCREMENTAL RAINBOW 🌈")
+    print("=" * 60)
+    print(f"Linhas: {len(buffer.linhas):,}  Edições: {edicoes}\n")
+
+    tempo_incremental = tempo_completo = 0.0
+    divergencias = 0
+    for _ in range(edicoes):
+        # A primeira linha (RAINBOW.) fica fora das edições
+        inicio = aleatorio.randint(2, len(buffer.linhas))
+        fim = min(len(buffer.linhas), inicio + aleatorio.choice((-1, 0, 0, 0, 1)))
+        buffer.editar(inicio, fim, aleatorio.choice(LINHAS_EDICAO))
+        tokens = buffer.tokens
+
+        t0 = time.perf_counter()
+        ast, erros = parser.analisar_incremental(tokens)
+        tempo_incremental += time.perf_counter() - t0
+        obtido = (ast.to_dict() if ast else None, [str(erro) for erro in erros])
+
+        t0 = time.perf_counter()
+        ast, erros = AnalisadorSintatico().analisar(tokens)
+        tempo_completo += time.perf_counter() - t0
+        if obtido != (ast.to_dict() if ast else None, [str(erro) for erro in erros]):
+            divergencias += 1
+
+    print(f"{'incremental':<14}{tempo_incremental / edicoes * 1000:>9.3f} ms/edição")
+    print(f"{'completa':<14}{tempo_completo / edicoes * 1000:>9.3f} ms/edição "
+          f"{tempo_completo / tempo_incremental:>8.1f}x")
+    print(f"\n{'✅ resultados idênticos' if not divergencias else f'❌ {divergencias} edições divergentes'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark da anotação de tipos Rainbow
+Mede o custo da anotação (AnalisadorSemantico.tipos) e executa o programa
+transpilado com e sem ela; com a anotação, as operações com operandos de tipo
+garantido são geradas sem verificação de texto. Saídas e variáveis finais das
+duas versões são conferidas
+
+Uso: python benchmarks/benchmark_tipos.py [iteracoes_externas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from transpilador_python import TranspiladorPython, ExecutorPython
+import benchmark_motores
+
+
+def gerar_programa_misto(externas: int) -> str:
+    """Aritmética, comparações e concatenação de textos com tipos garantidos"""
+    return f'''RAINBOW.
+
+#total recebe 0.
+#texto recebe "".
+para #i de 1 ate {externas} passo 1 {{
+    para #j de 1 ate 50 passo 1 {{
+        #total recebe #total + (#i * 3 - #j) % 7 / 2.
+        se (#total > 1000 E #j igual 50) {{
+            #total recebe -#total / 3.
+        }}
+    }}
+    #texto recebe "linha " + #i.
+}}
+mostrar(#total).
+mostrar(#texto).
+'''
+
+
+def executar(programa):
+    """Retorna (tempo em segundos, saída, variáveis)"""
+    saida = []
+    executor = ExecutorPython(saida.append, lambda prompt: "")
+    inicio = time.perf_counter()
+    variaveis = executor.executar(programa)
+    return time.perf_counter() - inicio, saida, variaveis
+
+
+def main():
+    externas = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+
+    print("=" * 60)
+    print("BENCHMARK DA ANOTAÇÃO DE TIPOS RAINBOW 🌈")
+    print("=" * 60)
+
+    divergencias = 0
+    casos = [
+        ("laços numéricos", benchmark_motores.gerar_programa(externas)),
+        ("misto", gerar_programa_misto(externas)),
+    ]
+    for nome, codigo in casos:
+        tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+        ast, _ = AnalisadorSintatico().analisar(tokens)
+        analisador = AnalisadorSemantico()
+        analisador.analisar(ast)
+
+        inicio = time.perf_counter()
+        tipos = analisador.tipos
+        tempo_anotacao = time.perf_counter() - inicio
+
+        sem_tipos = TranspiladorPython().compilar(ast)
+        com_tipos = TranspiladorPython(tipos).compilar(ast)
+        tempo_sem, saida_sem, variaveis_sem = min(executar(sem_tipos) for _ in range(3))
+        tempo_com, saida_com, variaveis_com = min(executar(com_tipos) for _ in range(3))
+        if (saida_sem, variaveis_sem) != (saida_com, variaveis_com):
+            divergencias += 1
+
+        print(f"\n{nome}: {len(tipos):,} nós anotados em {tempo_anotacao * 1000:.2f} ms")
+        print(f"  {'sem anotação':<16}{tempo_sem:>8.4f} s")
+        print(f"  {'com anotação':<16}{tempo_com:>8.4f} s {tempo_sem / tempo_com:>8.2f}x")
+
+    print(f"\n{'✅ resultados idênticos' if not divergencias else f'❌ {divergencias} casos divergentes'}")
+
+
+if __name__ == "__main__":
+    main()
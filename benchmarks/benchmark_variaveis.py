@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do acesso a variáveis na máquina virtual Rainbow
+Compara o custo por acesso da busca por nome em dicionário (antes)
+com o índice em slot resolvido pela tabela de símbolos (depois)
+
+Uso: python benchmarks/benchmark_variaveis.py [acessos]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from maquina_virtual import INDEFINIDO
+
+
+# Variáveis típicas de um programa com laços aninhados
+NOMES = ['#soma', '#i', '#j', '#produto', '#limite', '#passo']
+ARGUMENTO = NOMES.index('#produto')
+
+# Antes: CARREGAR / ARMAZENAR buscavam variaveis[nomes[arg]]
+LEITURA_DICIONARIO = '''
+try:
+    valor = variaveis[nomes[arg]]
+except KeyError:
+    raise
+'''
+ESCRITA_DICIONARIO = 'variaveis[nomes[arg]] = valor'
+
+# Depois: CARREGAR / ARMAZENAR acessam valores[arg]
+LEITURA_SLOT = '''
+valor = valores[arg]
+if valor is INDEFINIDO:
+    raise KeyError
+'''
+ESCRITA_SLOT = 'valores[arg] = valor'
+
+
+def medir(instrucao: str, acessos: int) -> float:
+    """Retorna o melhor custo por acesso em nanossegundos"""
+    ambiente = {
+        'nomes': NOMES,
+        'arg': ARGUMENTO,
+        'variaveis': {nome: indice for indice, nome in enumerate(NOMES)},
+        'valores': list(range(len(NOMES))),
+        'valor': 42,
+        'INDEFINIDO': INDEFINIDO
+    }
+    melhor = min(timeit.repeat(instrucao, globals=ambiente, number=acessos, repeat=5))
+    return melhor / acessos * 1e9
+
+
+def main():
+    acessos = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 60)
+    print("MICRO-BENCHMARK DE ACESSO A VARIÁVEIS 🌈")
+    print("=" * 60)
+    print(f"Acessos por medição: {acessos:,}\n")
+
+    print(f"{'Operação':<12}{'Dicionário (ns)':>18}{'Slot (ns)':>12}{'Speedup':>10}")
+    print("-" * 52)
+    for operacao, antes, depois in (('leitura', LEITURA_DICIONARIO, LEITURA_SLOT),
+                                    ('escrita', ESCRITA_DICIONARIO, ESCRITA_SLOT)):
+        custo_antes = medir(antes, acessos)
+        custo_depois = medir(depois, acessos)
+        print(f"{operacao:<12}{custo_antes:>18.1f}{custo_depois:>12.1f}{custo_antes / custo_depois:>9.2f}x")
+
+    print("\nPara o efeito no programa completo: python benchmarks/benchmark_motores.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,18 @@ import os
 import json
 import threading
 import time
+import traceback
 from pathlib import Path
 from PIL import Image, ImageTk
 
+# Módulos do compilador (src/), importados uma vez ao carregar a IDE
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from analisador_lexico import AnalisadorLexico, LexicoIncremental
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from interpretador_rainbow import InterpretadorRainbow
+from limites_execucao import LimitesExecucao
+
 class RainbowSplashScreen:
     def __init__(self, canvas, width, height):
         self.canvas = canvas
@@ -67,7 +76,6 @@ class RainbowSplashScreen:
                 self.create_background_gradient()
         except Exception as e:
             print(f"Erro ao carregar imagem: {e}")
-            import traceback
             traceback.print_exc()
             # Fallback para gradiente
             self.create_background_gradient()
@@ -346,6 +354,9 @@ class RainbowSplashScreen:
             self.callback()
 
 class RainbowIDE:
+    # Tempo máximo de uma execução iniciada pela IDE (interrompe loops infinitos)
+    TEMPO_MAXIMO_EXECUCAO = 60.0
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Rainbow IDE 🌈")
@@ -415,6 +426,11 @@ class RainbowIDE:
         self.current_file = None
         self.modified = False
         self.ui_initialized = False
+        # Verificação sintática enquanto o código é digitado
+        self._verificacao_agendada = None
+        self._lexico_editor = None
+        self._parser_editor = None
+        self._semantico_editor = None
         
         # Configurar estilo macOS/Linux
         self.setup_native_style()
@@ -958,6 +974,65 @@ class RainbowIDE:
         self.update_line_numbers()
         self.apply_syntax_highlighting()
         self.update_cursor_position()
+        self.agendar_verificacao()
+        
+    def agendar_verificacao(self):
+        """Verifica a sintaxe quando a digitação pausa por 300 ms"""
+        if self._verificacao_agendada is not None:
+            self.root.after_cancel(self._verificacao_agendada)
+        self._verificacao_agendada = self.root.after(300, self.verificar_sintaxe)
+        
+    def verificar_sintaxe(self):
+        """
+        Destaca os erros léxicos, sintáticos e semânticos do editor
+        Só as linhas alteradas desde a última verificação são varridas de novo
+        (LexicoIncremental) e só as declarações tocadas, ou que dependem de uma
+        variável que mudou, são reanalisadas (analisar_incremental do parser e do
+        analisador semântico), o que mantém a verificação rápida em arquivos grandes
+        """
+        self._verificacao_agendada = None
+        try:
+            codigo = self.text_editor.get("1.0", "end-1c")
+            if self._lexico_editor is None:
+                self._lexico_editor = LexicoIncremental(AnalisadorLexico(estatisticas=False), codigo)
+                self._parser_editor = AnalisadorSintatico()
+                self._semantico_editor = AnalisadorSemantico()
+            else:
+                self._atualizar_lexico_editor(codigo.split("\n"))
+
+            tokens, erros_lexicos = self._lexico_editor.resultado()
+            ast, erros_sintaticos = self._parser_editor.analisar_incremental(tokens)
+            erros_semanticos = []
+            if ast is not None:
+                erros_semanticos, _ = self._semantico_editor.analisar_incremental(ast)
+        except Exception as e:
+            # Falha interna de um analisador: registrar e recomeçar do zero na próxima verificação
+            print(f"Erro na verificação de sintaxe: {e}")
+            traceback.print_exc()
+            self._lexico_editor = None
+            self.status_bar.config(text=f"Erro interno na verificação de sintaxe: {e}")
+            return
+
+        self.text_editor.tag_remove("error", "1.0", "end")
+        self._destacar_diagnosticos(erros_lexicos + erros_sintaticos + erros_semanticos)
+        
+    def _atualizar_lexico_editor(self, linhas):
+        """Aplica ao buffer léxico o trecho de linhas que difere do texto anterior"""
+        anteriores = self._lexico_editor.linhas
+        limite = min(len(anteriores), len(linhas))
+        inicio = 0
+        while inicio < limite and anteriores[inicio] == linhas[inicio]:
+            inicio += 1
+        fim = 0
+        while fim < limite - inicio and anteriores[-1 - fim] == linhas[-1 - fim]:
+            fim += 1
+        if inicio == len(anteriores) == len(linhas):
+            return
+
+        novas = linhas[inicio:len(linhas) - fim]
+        # A quebra final preserva uma última linha vazia em novas
+        texto = "\n".join(novas) + "\n" if novas else ""
+        self._lexico_editor.editar(inicio + 1, len(anteriores) - fim, texto)
         
     def on_click(self, event=None):
         self.update_line_numbers()
@@ -1207,20 +1282,29 @@ class RainbowIDE:
     def highlight_errors(self):
         # Remover highlights anteriores
         self.text_editor.tag_remove("error", "1.0", "end")
-        
-        # Buscar erros no texto de erros
-        errors_content = self.errors_text.get("1.0", "end-1c")
-        
-        # Procurar por padrões de linha:coluna
-        import re
-        for match in re.finditer(r'Linha (\d+), Coluna (\d+)', errors_content):
-            line = int(match.group(1))
-            col = int(match.group(2))
-            
+
+        # Posições vêm direto dos diagnósticos, sem reler os relatórios de erro
+        self._destacar_diagnosticos(self.diagnosticos_editor())
+
+    def _destacar_diagnosticos(self, diagnosticos):
+        for diagnostico in diagnosticos:
+            if diagnostico.severidade != 'erro' or diagnostico.linha is None:
+                continue
+            line = diagnostico.linha
+            col = diagnostico.coluna or 1
+
             # Destacar posição do erro
             start = f"{line}.{col-1}"
             end = f"{line}.{col}"
             self.text_editor.tag_add("error", start, end)
+
+    def diagnosticos_editor(self):
+        """Diagnósticos das três análises sobre o código do editor, feitas em memória"""
+        try:
+            codigo = self.text_editor.get("1.0", "end-1c")
+            return InterpretadorRainbow().compilar_codigo(codigo).diagnosticos
+        except Exception:
+            return []
             
     def run_lexical(self):
         self.run_analysis("src/analisador_lexico.py", "Análise Léxica")
@@ -1251,6 +1335,13 @@ class RainbowIDE:
         # Limpar saídas anteriores
         self.clear_outputs()
         
+        # Programa já compilado: reaproveitar os relatórios e executar direto
+        if self.programa_em_cache():
+            self.load_output_files()
+            self.status_bar.config(text="Programa em cache. Executando...")
+            self.run_integrated_executor()
+            return
+        
         # Executar compilação em thread separada
         thread = threading.Thread(target=self._run_full_then_execute_thread)
         thread.daemon = True
@@ -1299,6 +1390,15 @@ class RainbowIDE:
             
             self.root.after(0, mostrar_erro)
     
+    def programa_em_cache(self):
+        """Verifica se o arquivo atual já foi validado e compilado pelo interpretador"""
+        try:
+            with open(self.current_file, 'r', encoding='utf-8') as f:
+                codigo = f.read()
+            return InterpretadorRainbow().programa_em_cache(codigo)
+        except Exception:
+            return False
+    
     def run_integrated_executor(self):
         """Executa programa no console integrado da IDE"""
         # Limpar console e mostrar na aba
@@ -1378,12 +1478,10 @@ class RainbowIDE:
     def _run_integrated_thread(self):
         """Thread para executar no console integrado"""
         try:
-            # Importar interpretador
-            sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
-            from interpretador_rainbow import InterpretadorRainbow
-            
-            # Criar interpretador com callback do console
-            interpretador = InterpretadorRainbow(ide_callback=self.solicitar_entrada_console)
+            # Criar interpretador com callback do console e saída em tempo real
+            interpretador = InterpretadorRainbow(ide_callback=self.solicitar_entrada_console,
+                                                 saida=self.escrever_saida_console,
+                                                 limites=LimitesExecucao(tempo_maximo=self.TEMPO_MAXIMO_EXECUCAO))
             
             # Executar
             sucesso, resultado = interpretador.executar_arquivo(self.current_file)
@@ -1391,12 +1489,7 @@ class RainbowIDE:
             # Mostrar resultado na thread principal
             def mostrar_resultado():
                 if sucesso:
-                    # Mostrar saída do programa
-                    linhas = resultado.split('\n')
-                    for linha in linhas:
-                        if linha.strip():
-                            self.console_text.insert("end", f"{linha}\n")
-                    
+                    # A saída do programa já foi escrita durante a execução
                     self.console_text.insert("end", "\n" + "=" * 50 + "\n")
                     self.console_text.insert("end", "✅ Programa executado com sucesso!\n")
                 else:
@@ -1416,6 +1509,17 @@ class RainbowIDE:
             
             self.root.after(0, mostrar_erro)
     
+    def escrever_saida_console(self, texto):
+        """Recebe um lote de saída do interpretador e o escreve no console"""
+        # Chamado pela thread do interpretador; o widget só é alterado na thread principal
+        def escrever():
+            for linha in texto.split('\n'):
+                if linha.strip():
+                    self.console_text.insert("end", f"{linha}\n")
+            self.console_text.see("end")
+        
+        self.root.after(0, escrever)
+    
     def solicitar_entrada_console(self, prompt):
         """Solicita entrada do usuário no console integrado"""
         resultado = [None]
@@ -1470,12 +1574,9 @@ class RainbowIDE:
             self.status_bar.config(text="Executando programa...")
             self.console_text.insert("end", "🌈 Executando programa Rainbow...\n\n")
             
-            # Importar interpretador
-            sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
-            from interpretador_rainbow import InterpretadorRainbow
-            
             # Criar interpretador com callback para entrada
-            interpretador = InterpretadorRainbow(ide_callback=self.solicitar_entrada_usuario)
+            interpretador = InterpretadorRainbow(ide_callback=self.solicitar_entrada_usuario,
+                                                 limites=LimitesExecucao(tempo_maximo=self.TEMPO_MAXIMO_EXECUCAO))
             
             # Executar
             sucesso, resultado = interpretador.executar_arquivo(self.current_file)
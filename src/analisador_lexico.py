@@ -1,10 +1,18 @@
+import gc
 import re
+import threading
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Iterator, Optional
+from itertools import accumulate, chain
 import json
 import os
 from datetime import datetime
+from diagnosticos import Diagnostico, LEXICO, ERRO
 
 # Enum para os tipos de tokens
 class TokenType(Enum):
@@ -91,6 +99,10 @@ class Token:
     def __str__(self):
         return f"Linha: {self.linha:02d} - Coluna: {self.coluna:02d} - Token:<{self.tipo.name}, {self.lexema}>"
     
+    def deslocado(self, delta: int) -> 'Token':
+        """Cópia com delta somado à linha; o original, que pode já ter sido retornado, não muda"""
+        return Token(self.tipo, self.lexema, self.linha + delta, self.coluna)
+    
     def to_dict(self):
         return {
             'tipo': self.tipo.name,
@@ -99,8 +111,128 @@ class Token:
             'coluna': self.coluna
         }
 
+# Tipo de token pelo código guardado em TokensCompactos (valor do enum)
+TIPOS_TOKEN = {tipo.value: tipo for tipo in TokenType}
+
+class TokensCompactos(Sequence):
+    """
+    Sequência de tokens guardada em colunas paralelas de array
+    Cada token ocupa o código do tipo, linha, coluna e início/tamanho do lexema no
+    código-fonte (18 bytes), em vez de um objeto Token com seu dicionário e sua
+    string. O acesso por índice ou iteração cria o Token sob demanda, então a
+    sequência pode ser passada ao AnalisadorSintatico no lugar da lista.
+    """
+
+    def __init__(self, codigo: str):
+        self.codigo = codigo
+        self.tipos = array('H')
+        self.linhas = array('I')
+        self.colunas = array('I')
+        self.inicios = array('I')
+        self.tamanhos = array('I')
+
+    def acrescentar(self, tokens: List[Token], inicios_linha: List[int], primeira_linha: int):
+        """Acrescenta tokens cujas linhas começam nos deslocamentos inicios_linha[linha - primeira_linha]"""
+        for token in tokens:
+            self.tipos.append(token.tipo.value)
+            self.linhas.append(token.linha)
+            self.colunas.append(token.coluna)
+            self.inicios.append(inicios_linha[token.linha - primeira_linha] + token.coluna - 1)
+            self.tamanhos.append(len(token.lexema))
+
+    def estender(self, tipos: array, linhas: array, colunas: array, inicios: array, tamanhos: array):
+        """Acrescenta colunas já montadas (ex.: de outro processo)"""
+        self.tipos.extend(tipos)
+        self.linhas.extend(linhas)
+        self.colunas.extend(colunas)
+        self.inicios.extend(inicios)
+        self.tamanhos.extend(tamanhos)
+
+    def tipo(self, i: int) -> TokenType:
+        return TIPOS_TOKEN[self.tipos[i]]
+
+    def lexema(self, i: int) -> str:
+        inicio = self.inicios[i]
+        return self.codigo[inicio:inicio + self.tamanhos[i]]
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        inicio = self.inicios[i]
+        return Token(TIPOS_TOKEN[self.tipos[i]], self.codigo[inicio:inicio + self.tamanhos[i]],
+                     self.linhas[i], self.colunas[i])
+
+    def __iter__(self):
+        codigo = self.codigo
+        for tipo, linha, coluna, inicio, tamanho in zip(self.tipos, self.linhas, self.colunas,
+                                                        self.inicios, self.tamanhos):
+            yield Token(TIPOS_TOKEN[tipo], codigo[inicio:inicio + tamanho], linha, coluna)
+
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelas colunas (sem contar o código-fonte)"""
+        return sum(coluna.itemsize * len(coluna) for coluna in
+                   (self.tipos, self.linhas, self.colunas, self.inicios, self.tamanhos))
+
+# Padrão da varredura rápida: cada correspondência é (espaços, lexema), com as
+# alternativas na mesma prioridade da varredura por caracteres
+PADRAO_LEXICO = re.compile(r'''
+    ([ \t\r\x0b\x0c\x1c-\x1f]*)
+    (
+          //[^\n]*                                  # Comentário
+        | "(?:\\[^\n]|[^"\\\n])*"                   # String
+        | "[^\n]*                                   # String não fechada
+        | (?:-|\#|-?[0-9]+(?:\.[0-9]*)?|\#?[A-Za-z][A-Za-z0-9_]*)?[^\x00-\x7f]  # Fora do ASCII
+        | -?[0-9]+(?:\.[0-9]+|\.(?=[^ \t\n0-9]))?   # Número (termina em '.' se mal formado)
+        | \#?[A-Za-z][A-Za-z0-9_]*                  # Variável, palavra reservada ou identificador
+        | <=|>=|[<>+\-*/%(){}\[\].,]                # Operadores e delimitadores
+        | \n
+        | \Z
+        | .                                         # '#' isolado ou símbolo não reconhecido
+    )
+''', re.VERBOSE)
+
+PADRAO_TEXTO = re.compile(r'"(?:\\.|[^"\\])*"')
+PADRAO_ESCAPE = re.compile(r'\\(.)')
+
+# O coletor de lixo é global ao processo e a IDE analisa em várias threads: só a
+# primeira varredura em andamento pausa o coletor e só a última restaura o estado anterior
+_trava_coletor = threading.Lock()
+_varreduras_ativas = 0
+_coletor_estava_ativo = False
+
+@contextmanager
+def _coletor_pausado():
+    """Pausa o coletor de lixo enquanto houver alguma varredura em andamento"""
+    global _varreduras_ativas, _coletor_estava_ativo
+    with _trava_coletor:
+        if _varreduras_ativas == 0:
+            _coletor_estava_ativo = gc.isenabled()
+            gc.disable()
+        _varreduras_ativas += 1
+    try:
+        yield
+    finally:
+        with _trava_coletor:
+            _varreduras_ativas -= 1
+            if _varreduras_ativas == 0 and _coletor_estava_ativo:
+                gc.enable()
+
 class AnalisadorLexico:
-    def __init__(self):
+    # 'padrao': uma expressão regular sobre o código inteiro (padrão)
+    # 'caracteres': varredura original, caractere a caractere por linha
+    MODOS = ('padrao', 'caracteres')
+    
+    def __init__(self, modo: str = 'padrao', estatisticas: bool = True):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de análise léxica desconhecido: {modo}")
+        self.modo = modo
+        # Sem estatísticas o analisador não guarda os tokens da última análise e a
+        # leitura em fluxo não as acumula; os relatórios as calculam dos tokens recebidos
+        self.coletar_estatisticas = estatisticas
+        
         # Palavras reservadas da linguagem
         self.palavras_reservadas = {
             'RAINBOW': TokenType.RAINBOW,
@@ -128,19 +260,39 @@ class AnalisadorLexico:
             'passo': TokenType.PASSO
         }
         
+        # Operadores e delimitadores de um caractere
+        self.simbolos = {
+            '<': TokenType.OPER_MENOR,
+            '>': TokenType.OPER_MAIOR,
+            '+': TokenType.OPER_SOMA,
+            '-': TokenType.OPER_SUBTRACAO,
+            '*': TokenType.OPER_MULTIPLICACAO,
+            '/': TokenType.OPER_DIVISAO,
+            '%': TokenType.OPER_MODULO,
+            '(': TokenType.ABRE_PARENTESES,
+            ')': TokenType.FECHA_PARENTESES,
+            '{': TokenType.ABRE_CHAVES,
+            '}': TokenType.FECHA_CHAVES,
+            '[': TokenType.ABRE_COLCHETE,
+            ']': TokenType.FECHA_COLCHETE,
+            '.': TokenType.FIM_LINHA,
+            ',': TokenType.VIRGULA
+        }
+        self.simbolos_compostos = {
+            **self.simbolos,
+            '<=': TokenType.OPER_MENOR_IGUAL,
+            '>=': TokenType.OPER_MAIOR_IGUAL
+        }
+        
         # Limites
         self.MAX_IDENTIFIER_LENGTH = 50
         self.MAX_NUMBER_LENGTH = 20
         self.MAX_STRING_LENGTH = 1000
         
-        # Estatísticas
-        self.stats = {
-            'total_linhas': 0,
-            'total_caracteres': 0,
-            'tokens_por_tipo': {},
-            'palavras_reservadas_usadas': set(),
-            'variaveis_declaradas': set()
-        }
+        # Estatísticas da última análise, calculadas quando pedidas
+        self._totais = {'total_linhas': 0, 'total_caracteres': 0}
+        self._tokens_analise = None
+        self._stats = None
         
         # Caracteres de escape válidos
         self.escape_chars = {
@@ -152,223 +304,507 @@ class AnalisadorLexico:
             '\'': '\''
         }
         
-    def analisar(self, codigo: str) -> Tuple[List[Token], List[str]]:
+    def analisar(self, codigo: str) -> Tuple[List[Token], List[Diagnostico]]:
         tokens = []
         erros = []
-        linhas = codigo.split('\n')
         
         # Contadores para verificar balanceamento
         chaves_abertas = []
         
-        for num_linha, linha in enumerate(linhas, 1):
-            coluna = 1
-            i = 0
+        self._varrer(codigo, 1, tokens, erros, chaves_abertas)
+        
+        total_linhas = codigo.count('\n') + 1
+        tokens.append(self._finalizar(erros, chaves_abertas, total_linhas,
+                                      len(codigo) - (codigo.rfind('\n') + 1)))
+        self._registrar_analise(tokens, total_linhas, len(codigo) - (total_linhas - 1))
+        
+        return tokens, erros
+    
+    def analisar_compacto(self, codigo: str, tamanho_bloco: int = 64 * 1024) -> Tuple[TokensCompactos, List[Diagnostico]]:
+        """
+        Analisa o código e guarda os tokens em um TokensCompactos
+        A varredura é feita em blocos de linhas completas, então só os objetos Token
+        do bloco atual existem ao mesmo tempo; tokens e erros equivalem aos de analisar.
+        """
+        tokens = TokensCompactos(codigo)
+        erros = []
+        chaves_abertas = []
+        num_linha = 1
+        inicio = 0
+        
+        while inicio < len(codigo):
+            fim = codigo.find('\n', inicio + tamanho_bloco)
+            fim = len(codigo) if fim == -1 else fim + 1
+            bloco = codigo[inicio:fim]
             
-            while i < len(linha):
-                # Ignorar espaços em branco
-                if linha[i].isspace():
-                    coluna += 1
-                    i += 1
+            tokens_bloco = []
+            self._varrer(bloco, num_linha, tokens_bloco, erros, chaves_abertas)
+            inicios_linha = list(accumulate((len(linha) + 1 for linha in bloco.split('\n')), initial=inicio))
+            tokens.acrescentar(tokens_bloco, inicios_linha, num_linha)
+            
+            num_linha += bloco.count('\n')
+            inicio = fim
+        
+        eof = self._finalizar(erros, chaves_abertas, num_linha, len(codigo) - (codigo.rfind('\n') + 1))
+        tokens.acrescentar([eof], [len(codigo) - eof.coluna + 1], num_linha)
+        self._registrar_analise(tokens, num_linha, len(codigo) - (num_linha - 1))
+        
+        return tokens, erros
+    
+    def analisar_paralelo(self, codigo: str, processos: Optional[int] = None,
+                          tamanho_trecho: int = 4 * 1024 * 1024) -> Tuple[TokensCompactos, List[Diagnostico]]:
+        """
+        Analisa o código em trechos de linhas completas distribuídos entre processos
+        Cada trecho é varrido de forma independente (nenhum token atravessa linhas) e
+        devolve as colunas de seus tokens; o balanceamento de chaves entre trechos é
+        refeito na junção. Tokens e erros equivalem aos de analisar_compacto.
+        """
+        processos = processos or os.cpu_count() or 1
+        trechos = []
+        num_linha = 1
+        inicio = 0
+        while inicio < len(codigo):
+            fim = codigo.find('\n', inicio + tamanho_trecho)
+            fim = len(codigo) if fim == -1 else fim + 1
+            trechos.append((inicio, fim, num_linha))
+            num_linha += codigo.count('\n', inicio, fim)
+            inicio = fim
+        
+        if processos == 1 or len(trechos) < 2:
+            return self.analisar_compacto(codigo)
+        
+        tokens = TokensCompactos(codigo)
+        erros = []
+        chaves_abertas = []
+        with ProcessPoolExecutor(max_workers=min(processos, len(trechos))) as executor:
+            resultados = executor.map(_analisar_trecho,
+                                      [(self.modo, codigo[inicio:fim], linha, inicio)
+                                       for inicio, fim, linha in trechos])
+            for colunas, erros_trecho, fechamentos, abertas_trecho in resultados:
+                tokens.estender(*colunas)
+                
+                # Fechamentos sem par no trecho casam primeiro com as chaves ainda
+                # abertas dos trechos anteriores; só os restantes são erros
+                casados = min(len(fechamentos), len(chaves_abertas))
+                if casados:
+                    del chaves_abertas[len(chaves_abertas) - casados:]
+                    descartados = set(fechamentos[:casados])
+                    erros.extend(erro for i, erro in enumerate(erros_trecho) if i not in descartados)
+                else:
+                    erros.extend(erros_trecho)
+                chaves_abertas.extend(abertas_trecho)
+        
+        eof = self._finalizar(erros, chaves_abertas, num_linha, len(codigo) - (codigo.rfind('\n') + 1))
+        tokens.acrescentar([eof], [len(codigo) - eof.coluna + 1], num_linha)
+        self._registrar_analise(tokens, num_linha, len(codigo) - (num_linha - 1))
+        
+        return tokens, erros
+    
+    def analisar_fluxo(self, fonte, erros: Optional[List[Diagnostico]] = None,
+                       tamanho_bloco: int = 64 * 1024) -> Iterator[Token]:
+        """
+        Gera os tokens de um arquivo aberto ou de um buffer (mmap, bytes) sob demanda
+        O código é lido em blocos de linhas completas, então só o bloco atual fica em
+        memória; o gerador pode ser passado direto ao AnalisadorSintatico. Os erros
+        são acrescentados a 'erros' à medida que aparecem. Como os tokens não ficam
+        guardados, as estatísticas são acumuladas bloco a bloco se estiverem ativas.
+        """
+        if erros is None:
+            erros = []
+        stats = self._estatisticas_vazias() if self.coletar_estatisticas else None
+        chaves_abertas = []
+        num_linha = 1
+        total_caracteres = 0
+        tamanho_ultima_linha = 0
+        
+        for bloco in self._ler_blocos(fonte, tamanho_bloco):
+            tokens = []
+            self._varrer(bloco, num_linha, tokens, erros, chaves_abertas)
+            if stats is not None:
+                self._acumular_estatisticas(stats, tokens)
+            
+            quebras = bloco.count('\n')
+            num_linha += quebras
+            total_caracteres += len(bloco) - quebras
+            if quebras:
+                tamanho_ultima_linha = len(bloco) - (bloco.rfind('\n') + 1)
+            else:
+                tamanho_ultima_linha += len(bloco)
+            
+            yield from tokens
+        
+        eof = self._finalizar(erros, chaves_abertas, num_linha, tamanho_ultima_linha)
+        if stats is not None:
+            self._acumular_estatisticas(stats, [eof])
+        self._registrar_analise(None, num_linha, total_caracteres, stats)
+        yield eof
+    
+    def _ler_blocos(self, fonte, tamanho_bloco: int) -> Iterator[str]:
+        """Lê a fonte em blocos de aproximadamente tamanho_bloco que terminam em quebra de linha"""
+        if hasattr(fonte, 'readlines'):
+            # Arquivo aberto em modo texto ou binário
+            while True:
+                linhas = fonte.readlines(tamanho_bloco)
+                if not linhas:
+                    return
+                if isinstance(linhas[0], bytes):
+                    yield b''.join(linhas).decode('utf-8')
+                else:
+                    yield ''.join(linhas)
+        else:
+            # mmap, bytes ou bytearray: a quebra de linha nunca divide um caractere UTF-8
+            inicio = 0
+            tamanho = len(fonte)
+            while inicio < tamanho:
+                fim = fonte.find(b'\n', inicio + tamanho_bloco)
+                fim = tamanho if fim == -1 else fim + 1
+                yield fonte[inicio:fim].decode('utf-8')
+                inicio = fim
+    
+    def _varrer(self, codigo: str, num_linha: int, tokens: List[Token], erros: List[Diagnostico],
+                chaves_abertas: List[Tuple[int, int]]):
+        """Varre um trecho de linhas completas que começa na linha num_linha"""
+        # Os tokens não formam ciclos: o coletor de lixo fica pausado durante a
+        # varredura em vez de percorrer a lista crescente a cada alocação
+        with _coletor_pausado():
+            if self.modo == 'caracteres':
+                for deslocamento, linha in enumerate(codigo.split('\n')):
+                    self._analisar_linha(linha, num_linha + deslocamento, 0, tokens, erros, chaves_abertas)
+            else:
+                self._analisar_padrao(codigo, num_linha, tokens, erros, chaves_abertas)
+    
+    def _finalizar(self, erros: List[Diagnostico], chaves_abertas: List[Tuple[int, int]], total_linhas: int,
+                   tamanho_ultima_linha: int) -> Token:
+        """Registra as chaves não fechadas; retorna o token EOF"""
+        # Verificar chaves não fechadas
+        for linha, coluna in chaves_abertas:
+            erros.append(Diagnostico(LEXICO, ERRO, linha, coluna, 'chave_nao_fechada'))
+        
+        return Token(TokenType.EOF, '', total_linhas, tamanho_ultima_linha + 1)
+    
+    def _registrar_analise(self, tokens: Optional[Sequence], total_linhas: int, total_caracteres: int,
+                           stats: Optional[Dict] = None):
+        """Começa as estatísticas de uma nova análise; as contagens ficam para quando forem pedidas"""
+        self._totais = {'total_linhas': total_linhas, 'total_caracteres': total_caracteres}
+        self._tokens_analise = tokens if self.coletar_estatisticas else None
+        self._stats = stats
+    
+    @property
+    def stats(self) -> Dict:
+        """Estatísticas da última análise, calculadas no primeiro acesso"""
+        if self._stats is None:
+            self._stats = self._estatisticas_vazias()
+            if self._tokens_analise is not None:
+                self._acumular_estatisticas(self._stats, self._tokens_analise)
+        return {**self._stats, **self._totais}
+    
+    def estatisticas(self, tokens: Sequence) -> Dict:
+        """Estatísticas dos tokens dados; reaproveita as da última análise se forem os mesmos tokens"""
+        if tokens is self._tokens_analise:
+            return self.stats
+        stats = self._estatisticas_vazias()
+        self._acumular_estatisticas(stats, tokens)
+        return {**stats, **self._totais}
+    
+    @staticmethod
+    def _estatisticas_vazias() -> Dict:
+        return {
+            'tokens_por_tipo': {},
+            'palavras_reservadas_usadas': set(),
+            'variaveis_declaradas': set()
+        }
+    
+    def _acumular_estatisticas(self, stats: Dict, tokens):
+        """Conta tokens por tipo e registra palavras reservadas e variáveis"""
+        tokens_por_tipo = stats['tokens_por_tipo']
+        reservadas_usadas = stats['palavras_reservadas_usadas']
+        variaveis_declaradas = stats['variaveis_declaradas']
+        palavras_reservadas = self.palavras_reservadas
+        variavel = TokenType.VARIAVEL
+        for token in tokens:
+            tipo = token.tipo
+            tokens_por_tipo[tipo.name] = tokens_por_tipo.get(tipo.name, 0) + 1
+            if tipo is variavel:
+                variaveis_declaradas.add(token.lexema)
+            elif token.lexema in palavras_reservadas:
+                reservadas_usadas.add(token.lexema)
+    
+    def _analisar_padrao(self, codigo: str, num_linha: int, tokens: List[Token], erros: List[Diagnostico],
+                         chaves_abertas: List[Tuple[int, int]]):
+        """
+        Varre o trecho com PADRAO_LEXICO, uma correspondência por lexema
+        Produz os mesmos tokens e erros da varredura por caracteres; a partir de um
+        caractere fora do ASCII, o resto da linha é entregue a _analisar_linha
+        """
+        simbolos = self.simbolos_compostos
+        palavras_reservadas = self.palavras_reservadas
+        abre_chaves, fecha_chaves = TokenType.ABRE_CHAVES, TokenType.FECHA_CHAVES
+        linhas = None  # Separadas só se alguma linha precisar da varredura por caracteres
+        primeira_linha = num_linha
+        coluna = 1
+        
+        itens = iter(PADRAO_LEXICO.findall(codigo))
+        for espaco, lexema in itens:
+            coluna += len(espaco)
+            
+            # Caminho rápido: operadores, delimitadores e palavras reservadas
+            tipo_token = simbolos.get(lexema)
+            if tipo_token is not None:
+                tokens.append(Token(tipo_token, lexema, num_linha, coluna))
+                
+                # Rastrear chaves
+                if tipo_token is abre_chaves:
+                    chaves_abertas.append((num_linha, coluna))
+                elif tipo_token is fecha_chaves:
+                    if not chaves_abertas:
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'chave_sem_par'))
+                    else:
+                        chaves_abertas.pop()
+                
+                coluna += len(lexema)
+                continue
+            
+            tipo_token = palavras_reservadas.get(lexema)
+            if tipo_token is not None:
+                tokens.append(Token(tipo_token, lexema, num_linha, coluna))
+                coluna += len(lexema)
+                continue
+            
+            if lexema == '\n':
+                num_linha += 1
+                coluna = 1
+                continue
+            
+            if not lexema:
+                break  # Fim do código
+            
+            inicial = lexema[0]
+            
+            if inicial == '"':
+                if '\\' in lexema:
+                    self._verificar_escapes(lexema, num_linha, coluna, erros)
+                if PADRAO_TEXTO.fullmatch(lexema):
+                    if len(lexema) > self.MAX_STRING_LENGTH:
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'string_muito_longa', (self.MAX_STRING_LENGTH,)))
+                    tokens.append(Token(TokenType.TEXTO, lexema, num_linha, coluna))
+                else:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'string_nao_fechada'))
+            
+            elif inicial == '/':
+                pass  # Comentário até o fim da linha
+            
+            elif not lexema.isascii():
+                # Caractere fora do ASCII: o resto da linha segue a varredura por caracteres
+                if linhas is None:
+                    linhas = codigo.split('\n')
+                self._analisar_linha(linhas[num_linha - primeira_linha], num_linha, coluna - 1,
+                                     tokens, erros, chaves_abertas)
+                for espaco, lexema in itens:
+                    if lexema == '\n':
+                        break
+                num_linha += 1
+                coluna = 1
+                continue
+            
+            elif inicial == '#':
+                if len(lexema) == 1:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'variavel_mal_formada'))
+                else:
+                    if len(lexema) > self.MAX_IDENTIFIER_LENGTH:
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'variavel_muito_longa', (lexema[:20],)))
+                    tokens.append(Token(TokenType.VARIAVEL, lexema, num_linha, coluna))
+            
+            elif inicial.isdigit() or inicial == '-':
+                if lexema[-1] == '.':
+                    # Ponto seguido de algo que não é dígito: consumido junto com o erro
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'numero_mal_formado'))
+                else:
+                    if len(lexema) > self.MAX_NUMBER_LENGTH:
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'numero_muito_grande', (lexema,)))
+                    tokens.append(Token(TokenType.NUMERO, lexema, num_linha, coluna))
+            
+            elif inicial.isalpha():
+                erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'identificador_invalido', (lexema,)))
+            
+            else:
+                erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'simbolo_nao_reconhecido', (lexema,)))
+            
+            coluna += len(lexema)
+
+    def _verificar_escapes(self, lexema: str, num_linha: int, coluna: int, erros: List[Diagnostico]):
+        """Registra os escapes inválidos de uma string que começa na coluna indicada"""
+        for escape in PADRAO_ESCAPE.finditer(lexema, 1):
+            if escape.group(1) not in self.escape_chars:
+                erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna + escape.start() + 1, 'escape_invalido', (escape.group(1),)))
+    
+    def _analisar_linha(self, linha: str, num_linha: int, i: int, tokens: List[Token],
+                        erros: List[Diagnostico], chaves_abertas: List[Tuple[int, int]]):
+        """Varre uma linha caractere a caractere a partir da posição i"""
+        coluna = i + 1
+        while i < len(linha):
+            # Ignorar espaços em branco
+            if linha[i].isspace():
+                coluna += 1
+                i += 1
+                continue
+            
+            # Comentários
+            if i < len(linha) - 1 and linha[i:i+2] == '//':
+                # Ignorar o resto da linha
+                break
+            
+            # Strings
+            if linha[i] == '"':
+                inicio = i
+                i += 1
+                coluna_inicio = coluna
+                coluna += 1
+                string_content = []
+                
+                while i < len(linha) and linha[i] != '"':
+                    if linha[i] == '\\' and i + 1 < len(linha):
+                        escape_char = linha[i + 1]
+                        if escape_char in self.escape_chars:
+                            string_content.append(self.escape_chars[escape_char])
+                        else:
+                            erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna + 1, 'escape_invalido', (escape_char,)))
+                            string_content.append(linha[i:i+2])
+                        i += 2
+                        coluna += 2
+                    else:
+                        string_content.append(linha[i])
+                        i += 1
+                        coluna += 1
+                
+                if i >= len(linha):
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'string_nao_fechada'))
                     continue
                 
-                # Comentários
-                if i < len(linha) - 1 and linha[i:i+2] == '//':
-                    # Ignorar o resto da linha
-                    break
+                i += 1  # Pular a aspa de fechamento
+                coluna += 1
+                lexema = linha[inicio:i]
+                
+                if len(lexema) > self.MAX_STRING_LENGTH:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'string_muito_longa', (self.MAX_STRING_LENGTH,)))
                 
-                # Strings
-                if linha[i] == '"':
-                    inicio = i
+                tokens.append(Token(TokenType.TEXTO, lexema, num_linha, coluna_inicio))
+                continue
+            
+            # Números
+            if linha[i].isdigit() or (linha[i] == '-' and i + 1 < len(linha) and linha[i + 1].isdigit()):
+                inicio = i
+                coluna_inicio = coluna
+                
+                if linha[i] == '-':
                     i += 1
-                    coluna_inicio = coluna
                     coluna += 1
-                    string_content = []
-                    
-                    while i < len(linha) and linha[i] != '"':
-                        if linha[i] == '\\' and i + 1 < len(linha):
-                            escape_char = linha[i + 1]
-                            if escape_char in self.escape_chars:
-                                string_content.append(self.escape_chars[escape_char])
-                            else:
-                                erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna + 1:02d} - Erro: Caractere de escape inválido '\\{escape_char}'")
-                                string_content.append(linha[i:i+2])
-                            i += 2
-                            coluna += 2
-                        else:
-                            string_content.append(linha[i])
-                            i += 1
-                            coluna += 1
-                    
-                    if i >= len(linha):
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: String não fechada")
-                        continue
-                    
-                    i += 1  # Pular a aspa de fechamento
+                
+                while i < len(linha) and linha[i].isdigit():
+                    i += 1
                     coluna += 1
-                    lexema = linha[inicio:i]
-                    
-                    if len(lexema) > self.MAX_STRING_LENGTH:
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: String muito longa (máximo {self.MAX_STRING_LENGTH} caracteres)")
-                    
-                    tokens.append(Token(TokenType.TEXTO, lexema, num_linha, coluna_inicio))
-                    continue
                 
-                # Números
-                if linha[i].isdigit() or (linha[i] == '-' and i + 1 < len(linha) and linha[i + 1].isdigit()):
-                    inicio = i
-                    coluna_inicio = coluna
-                    
-                    if linha[i] == '-':
+                # Verificar decimal (mas só se não for seguido por outro ponto - fim de linha)
+                if i < len(linha) and linha[i] == '.' and i + 1 < len(linha) and linha[i + 1] != ' ' and linha[i + 1] != '\t' and linha[i + 1] != '\n':
+                    # Verificar se próximo caractere é dígito
+                    if i + 1 < len(linha) and linha[i + 1].isdigit():
                         i += 1
                         coluna += 1
-                    
-                    while i < len(linha) and linha[i].isdigit():
-                        i += 1
-                        coluna += 1
-                    
-                    # Verificar decimal (mas só se não for seguido por outro ponto - fim de linha)
-                    if i < len(linha) and linha[i] == '.' and i + 1 < len(linha) and linha[i + 1] != ' ' and linha[i + 1] != '\t' and linha[i + 1] != '\n':
-                        # Verificar se próximo caractere é dígito
-                        if i + 1 < len(linha) and linha[i + 1].isdigit():
+                        
+                        while i < len(linha) and linha[i].isdigit():
                             i += 1
                             coluna += 1
-                            
-                            while i < len(linha) and linha[i].isdigit():
-                                i += 1
-                                coluna += 1
-                        else:
-                            # É um ponto mas não seguido de dígito - provavelmente erro
-                            erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: Número mal formado")
-                            i += 1
-                            coluna += 1
-                            continue
-                    
-                    lexema = linha[inicio:i]
-                    
-                    if len(lexema) > self.MAX_NUMBER_LENGTH:
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: Número muito grande: {lexema}")
-                    
-                    tokens.append(Token(TokenType.NUMERO, lexema, num_linha, coluna_inicio))
-                    continue
-                
-                # Variáveis
-                if linha[i] == '#':
-                    inicio = i
-                    coluna_inicio = coluna
-                    i += 1
-                    coluna += 1
-                    
-                    if i >= len(linha) or not linha[i].isalpha():
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: Variável mal formada")
-                        continue
-                    
-                    while i < len(linha) and (linha[i].isalnum() or linha[i] == '_'):
+                    else:
+                        # É um ponto mas não seguido de dígito - provavelmente erro
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'numero_mal_formado'))
                         i += 1
                         coluna += 1
-                    
-                    lexema = linha[inicio:i]
-                    
-                    if len(lexema) > self.MAX_IDENTIFIER_LENGTH:
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: Nome de variável muito longo: {lexema[:20]}...")
-                    
-                    # Adicionar variável às estatísticas
-                    self.stats['variaveis_declaradas'].add(lexema)
-                    
-                    tokens.append(Token(TokenType.VARIAVEL, lexema, num_linha, coluna_inicio))
-                    continue
-                
-                # Operadores de dois caracteres
-                if i < len(linha) - 1:
-                    dois_chars = linha[i:i+2]
-                    if dois_chars == '<=':
-                        tokens.append(Token(TokenType.OPER_MENOR_IGUAL, '<=', num_linha, coluna))
-                        i += 2
-                        coluna += 2
-                        continue
-                    elif dois_chars == '>=':
-                        tokens.append(Token(TokenType.OPER_MAIOR_IGUAL, '>=', num_linha, coluna))
-                        i += 2
-                        coluna += 2
                         continue
                 
-                # Operadores e delimitadores de um caractere
-                char = linha[i]
-                token_map = {
-                    '<': TokenType.OPER_MENOR,
-                    '>': TokenType.OPER_MAIOR,
-                    '+': TokenType.OPER_SOMA,
-                    '-': TokenType.OPER_SUBTRACAO,
-                    '*': TokenType.OPER_MULTIPLICACAO,
-                    '/': TokenType.OPER_DIVISAO,
-                    '%': TokenType.OPER_MODULO,
-                    '(': TokenType.ABRE_PARENTESES,
-                    ')': TokenType.FECHA_PARENTESES,
-                    '{': TokenType.ABRE_CHAVES,
-                    '}': TokenType.FECHA_CHAVES,
-                    '[': TokenType.ABRE_COLCHETE,
-                    ']': TokenType.FECHA_COLCHETE,
-                    '.': TokenType.FIM_LINHA,
-                    ',': TokenType.VIRGULA
-                }
+                lexema = linha[inicio:i]
                 
-                if char in token_map:
-                    tokens.append(Token(token_map[char], char, num_linha, coluna))
-                    
-                    # Rastrear chaves
-                    if char == '{':
-                        chaves_abertas.append((num_linha, coluna))
-                    elif char == '}':
-                        if not chaves_abertas:
-                            erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna:02d} - Erro: Chave de fechamento sem correspondente")
-                        else:
-                            chaves_abertas.pop()
-                    
+                if len(lexema) > self.MAX_NUMBER_LENGTH:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'numero_muito_grande', (lexema,)))
+                
+                tokens.append(Token(TokenType.NUMERO, lexema, num_linha, coluna_inicio))
+                continue
+            
+            # Variáveis
+            if linha[i] == '#':
+                inicio = i
+                coluna_inicio = coluna
+                i += 1
+                coluna += 1
+                
+                if i >= len(linha) or not linha[i].isalpha():
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'variavel_mal_formada'))
+                    continue
+                
+                while i < len(linha) and (linha[i].isalnum() or linha[i] == '_'):
                     i += 1
                     coluna += 1
+                
+                lexema = linha[inicio:i]
+                
+                if len(lexema) > self.MAX_IDENTIFIER_LENGTH:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'variavel_muito_longa', (lexema[:20],)))
+                
+                tokens.append(Token(TokenType.VARIAVEL, lexema, num_linha, coluna_inicio))
+                continue
+            
+            # Operadores de dois caracteres
+            if i < len(linha) - 1:
+                dois_chars = linha[i:i+2]
+                if dois_chars == '<=':
+                    tokens.append(Token(TokenType.OPER_MENOR_IGUAL, '<=', num_linha, coluna))
+                    i += 2
+                    coluna += 2
                     continue
+                elif dois_chars == '>=':
+                    tokens.append(Token(TokenType.OPER_MAIOR_IGUAL, '>=', num_linha, coluna))
+                    i += 2
+                    coluna += 2
+                    continue
+            
+            # Operadores e delimitadores de um caractere
+            char = linha[i]
+            if char in self.simbolos:
+                tokens.append(Token(self.simbolos[char], char, num_linha, coluna))
                 
-                # Identificadores e palavras reservadas
-                if linha[i].isalpha():
-                    inicio = i
-                    coluna_inicio = coluna
-                    
-                    while i < len(linha) and (linha[i].isalnum() or linha[i] == '_'):
-                        i += 1
-                        coluna += 1
-                    
-                    lexema = linha[inicio:i]
-                    
-                    if lexema in self.palavras_reservadas:
-                        tipo_token = self.palavras_reservadas[lexema]
-                        tokens.append(Token(tipo_token, lexema, num_linha, coluna_inicio))
-                        # Adicionar às estatísticas
-                        self.stats['palavras_reservadas_usadas'].add(lexema)
+                # Rastrear chaves
+                if char == '{':
+                    chaves_abertas.append((num_linha, coluna))
+                elif char == '}':
+                    if not chaves_abertas:
+                        erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'chave_sem_par'))
                     else:
-                        erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna_inicio:02d} - Erro: Identificador inválido: {lexema}")
-                    continue
+                        chaves_abertas.pop()
                 
-                # Caractere não reconhecido
-                erros.append(f"Linha: {num_linha:02d} - Coluna: {coluna:02d} - Erro: Símbolo não reconhecido: '{linha[i]}'")
                 i += 1
                 coluna += 1
-        
-        # Verificar chaves não fechadas
-        for linha, coluna in chaves_abertas:
-            erros.append(f"Linha: {linha:02d} - Coluna: {coluna:02d} - Erro: Chave aberta não foi fechada")
-        
-        # Adicionar token EOF
-        tokens.append(Token(TokenType.EOF, '', len(linhas), len(linhas[-1]) + 1 if linhas else 1))
-        
-        # Atualizar estatísticas
-        self.stats['total_linhas'] = len(linhas)
-        self.stats['total_caracteres'] = sum(len(linha) for linha in linhas)
-        
-        # Contar tokens por tipo
-        for token in tokens:
-            tipo = token.tipo.name
-            self.stats['tokens_por_tipo'][tipo] = self.stats['tokens_por_tipo'].get(tipo, 0) + 1
-        
-        return tokens, erros
+                continue
+            
+            # Identificadores e palavras reservadas
+            if linha[i].isalpha():
+                inicio = i
+                coluna_inicio = coluna
+                
+                while i < len(linha) and (linha[i].isalnum() or linha[i] == '_'):
+                    i += 1
+                    coluna += 1
+                
+                lexema = linha[inicio:i]
+                
+                if lexema in self.palavras_reservadas:
+                    tipo_token = self.palavras_reservadas[lexema]
+                    tokens.append(Token(tipo_token, lexema, num_linha, coluna_inicio))
+                else:
+                    erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna_inicio, 'identificador_invalido', (lexema,)))
+                continue
+            
+            # Caractere não reconhecido
+            erros.append(Diagnostico(LEXICO, ERRO, num_linha, coluna, 'simbolo_nao_reconhecido', (linha[i],)))
+            i += 1
+            coluna += 1
     
     def gerar_relatorio_tokens(self, tokens: List[Token], arquivo_saida: str):
         """Gera arquivo .tokens com a listagem de tokens"""
@@ -382,10 +818,10 @@ class AnalisadorLexico:
             
             f.write(f"\n=== RESUMO ===\n")
             f.write(f"Total de tokens: {len(tokens) - 1}\n")  # -1 para excluir EOF
-            f.write(f"Total de linhas: {self.stats['total_linhas']}\n")
-            f.write(f"Total de caracteres: {self.stats['total_caracteres']}\n")
+            f.write(f"Total de linhas: {self._totais['total_linhas']}\n")
+            f.write(f"Total de caracteres: {self._totais['total_caracteres']}\n")
     
-    def gerar_relatorio_erros(self, erros: List[str], arquivo_saida: str):
+    def gerar_relatorio_erros(self, erros: List[Diagnostico], arquivo_saida: str):
         """Gera arquivo .errors com os erros encontrados"""
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
             f.write("=== RELATÓRIO DE ERROS ===\n")
@@ -400,38 +836,39 @@ class AnalisadorLexico:
             f.write(f"\n=== RESUMO ===\n")
             f.write(f"Total de erros: {len(erros)}\n")
     
-    def gerar_relatorio_estatisticas(self, tokens: List[Token], erros: List[str], arquivo_saida: str):
+    def gerar_relatorio_estatisticas(self, tokens: List[Token], erros: List[Diagnostico], arquivo_saida: str):
         """Gera relatório detalhado de estatísticas"""
+        stats = self.estatisticas(tokens)
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
             f.write("=== ESTATÍSTICAS DA ANÁLISE LÉXICA ===\n")
             f.write(f"Gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
             f.write("=== MÉTRICAS GERAIS ===\n")
-            f.write(f"Total de linhas: {self.stats['total_linhas']}\n")
-            f.write(f"Total de caracteres: {self.stats['total_caracteres']}\n")
+            f.write(f"Total de linhas: {stats['total_linhas']}\n")
+            f.write(f"Total de caracteres: {stats['total_caracteres']}\n")
             f.write(f"Total de tokens: {len(tokens) - 1}\n")
             f.write(f"Total de erros: {len(erros)}\n")
             f.write(f"Taxa de erro: {len(erros) / max(1, len(tokens) - 1) * 100:.2f}%\n\n")
             
             f.write("=== DISTRIBUIÇÃO DE TOKENS ===\n")
-            for tipo, count in sorted(self.stats['tokens_por_tipo'].items()):
+            for tipo, count in sorted(stats['tokens_por_tipo'].items()):
                 if tipo != 'EOF':
                     f.write(f"{tipo}: {count}\n")
             
             f.write(f"\n=== PALAVRAS RESERVADAS UTILIZADAS ===\n")
-            for palavra in sorted(self.stats['palavras_reservadas_usadas']):
+            for palavra in sorted(stats['palavras_reservadas_usadas']):
                 f.write(f"- {palavra}\n")
             
             f.write(f"\n=== VARIÁVEIS DECLARADAS ===\n")
-            for var in sorted(self.stats['variaveis_declaradas']):
+            for var in sorted(stats['variaveis_declaradas']):
                 f.write(f"- {var}\n")
     
-    def exportar_json(self, tokens: List[Token], erros: List[str], arquivo_saida: str):
+    def exportar_json(self, tokens: List[Token], erros: List[Diagnostico], arquivo_saida: str):
         """Exporta análise em formato JSON"""
         # Converter sets para listas para serialização JSON
-        stats_serializavel = self.stats.copy()
-        stats_serializavel['palavras_reservadas_usadas'] = list(self.stats['palavras_reservadas_usadas'])
-        stats_serializavel['variaveis_declaradas'] = list(self.stats['variaveis_declaradas'])
+        stats_serializavel = self.estatisticas(tokens)
+        stats_serializavel['palavras_reservadas_usadas'] = list(stats_serializavel['palavras_reservadas_usadas'])
+        stats_serializavel['variaveis_declaradas'] = list(stats_serializavel['variaveis_declaradas'])
         
         resultado = {
             'metadata': {
@@ -441,12 +878,193 @@ class AnalisadorLexico:
                 'estatisticas': stats_serializavel
             },
             'tokens': [token.to_dict() for token in tokens if token.tipo != TokenType.EOF],
-            'erros': erros
+            'erros': [str(erro) for erro in erros]
         }
         
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
             json.dump(resultado, f, ensure_ascii=False, indent=2)
 
+def _analisar_trecho(argumentos):
+    """
+    Varre um trecho de AnalisadorLexico.analisar_paralelo em um processo separado
+    Retorna as colunas dos tokens, os erros, os índices dos erros de fechamento sem
+    par (que podem casar com chaves de trechos anteriores) e as chaves deixadas abertas
+    """
+    modo, trecho, num_linha, inicio = argumentos
+    analisador = AnalisadorLexico(modo, estatisticas=False)
+    tokens, erros, chaves_abertas = [], [], []
+    analisador._varrer(trecho, num_linha, tokens, erros, chaves_abertas)
+    
+    compactos = TokensCompactos(trecho)
+    compactos.acrescentar(tokens, list(accumulate((len(linha) + 1 for linha in trecho.split('\n')),
+                                                  initial=inicio)), num_linha)
+    fechamentos = [i for i, erro in enumerate(erros) if erro.codigo == 'chave_sem_par']
+    colunas = (compactos.tipos, compactos.linhas, compactos.colunas, compactos.inicios, compactos.tamanhos)
+    return colunas, erros, fechamentos, chaves_abertas
+
+class LexicoIncremental:
+    """
+    Resultado da análise léxica de um buffer, atualizado por edições de linhas
+    Os tokens nunca atravessam linhas, então cada linha guarda seus tokens e erros e o
+    único estado entre linhas é a profundidade de chaves no início de cada uma. Uma
+    edição varre só as linhas substituídas, desloca a numeração das seguintes e
+    ressincroniza as chaves até a profundidade voltar a coincidir com a anterior.
+    """
+
+    def __init__(self, analisador: AnalisadorLexico, codigo: str = ''):
+        self.analisador = analisador
+        self.linhas: List[str] = []
+        self.tokens_linha: List[List[Token]] = []
+        self.erros_linha: List[List[Diagnostico]] = []
+        # Por linha: profundidade de chaves no início, saldo de chaves e menor saldo parcial
+        self.profundidade: List[int] = []
+        self.saldo: List[int] = []
+        self.minimo: List[int] = []
+        self._resultado = None
+        self._substituir(0, 0, codigo.split('\n'))
+
+    @property
+    def tokens(self) -> List[Token]:
+        return self.resultado()[0]
+
+    @property
+    def erros(self) -> List[Diagnostico]:
+        return self.resultado()[1]
+
+    def resultado(self) -> Tuple[List[Token], List[Diagnostico]]:
+        """Tokens e erros do buffer inteiro, idênticos aos de analisador.analisar(codigo)"""
+        if self._resultado is None:
+            tokens = list(chain.from_iterable(self.tokens_linha))
+            erros = list(chain.from_iterable(self.erros_linha))
+
+            ultima = len(self.linhas) - 1
+            chaves_abertas = self._chaves_nao_fechadas(self._profundidade_saida(ultima))
+            tokens.append(self.analisador._finalizar(erros, chaves_abertas, len(self.linhas),
+                                                     len(self.linhas[ultima])))
+            self.analisador._registrar_analise(tokens, len(self.linhas), sum(map(len, self.linhas)))
+            self._resultado = (tokens, erros)
+        return self._resultado
+
+    def codigo(self) -> str:
+        return '\n'.join(self.linhas)
+
+    def editar(self, linha_inicio: int, linha_fim: int, texto: str):
+        """
+        Substitui as linhas linha_inicio..linha_fim (inclusive, a partir de 1) pelas linhas de texto
+        Com linha_fim = linha_inicio - 1 as linhas são inseridas antes de linha_inicio. Uma quebra
+        de linha no fim de texto não cria linha vazia, e texto vazio apenas remove o intervalo.
+        """
+        if not 1 <= linha_inicio <= len(self.linhas) + 1 or not linha_inicio - 1 <= linha_fim <= len(self.linhas):
+            raise ValueError(f"Intervalo de linhas inválido: {linha_inicio}-{linha_fim}")
+
+        novas = texto.split('\n')
+        if novas[-1] == '':
+            novas.pop()
+        self._substituir(linha_inicio - 1, linha_fim, novas)
+        if not self.linhas:
+            # Um buffer vazio ainda tem uma linha
+            self._substituir(0, 0, [''])
+
+    def _substituir(self, i: int, fim: int, novas: List[str]):
+        """Troca as linhas de índice i..fim-1 por novas, varrendo só elas"""
+        delta = len(novas) - (fim - i)
+        # Profundidade anterior da primeira linha depois do trecho, para saber onde parar
+        profundidade_seguinte = self.profundidade[fim] if fim < len(self.linhas) else None
+
+        tokens_novos, erros_novos = [], []
+        saldos, minimos, profundidades = [], [], []
+        profundidade = self._profundidade_saida(i - 1) if i > 0 else 0
+        for deslocamento, linha in enumerate(novas):
+            profundidades.append(profundidade)
+            tokens, erros, saldo, minimo = self._varrer_linha(linha, i + deslocamento + 1, profundidade)
+            tokens_novos.append(tokens)
+            erros_novos.append(erros)
+            saldos.append(saldo)
+            minimos.append(minimo)
+            profundidade = self._aplicar_chaves(profundidade, saldo, minimo)
+
+        self.linhas[i:fim] = novas
+        self.tokens_linha[i:fim] = tokens_novos
+        self.erros_linha[i:fim] = erros_novos
+        self.profundidade[i:fim] = profundidades
+        self.saldo[i:fim] = saldos
+        self.minimo[i:fim] = minimos
+        self._resultado = None
+
+        seguinte = i + len(novas)
+        if delta:
+            self._deslocar(seguinte, delta)
+        if profundidade_seguinte is not None and profundidade != profundidade_seguinte:
+            self._ressincronizar(seguinte, profundidade)
+
+    def _varrer_linha(self, linha: str, num_linha: int, profundidade: int):
+        """Varre uma linha com a profundidade de chaves recebida; retorna tokens, erros, saldo e mínimo"""
+        tokens, erros = [], []
+        # Só a altura da pilha importa para os erros desta linha
+        self.analisador._varrer(linha, num_linha, tokens, erros, [None] * profundidade)
+
+        saldo = minimo = 0
+        for token in tokens:
+            if token.tipo is TokenType.ABRE_CHAVES:
+                saldo += 1
+            elif token.tipo is TokenType.FECHA_CHAVES:
+                saldo -= 1
+                minimo = min(minimo, saldo)
+        return tokens, erros, saldo, minimo
+
+    @staticmethod
+    def _aplicar_chaves(profundidade: int, saldo: int, minimo: int) -> int:
+        """Profundidade no fim da linha; fechamentos sem correspondente não a tornam negativa"""
+        return profundidade + saldo + max(0, -(profundidade + minimo))
+
+    def _profundidade_saida(self, i: int) -> int:
+        return self._aplicar_chaves(self.profundidade[i], self.saldo[i], self.minimo[i])
+
+    def _deslocar(self, inicio: int, delta: int):
+        """
+        Troca os tokens e erros a partir do índice inicio por cópias com delta somado
+        à linha, pois os originais podem estar em resultados já retornados
+        """
+        for i in range(inicio, len(self.linhas)):
+            self.tokens_linha[i] = [token.deslocado(delta) for token in self.tokens_linha[i]]
+            if self.erros_linha[i]:
+                self.erros_linha[i] = [erro.deslocado(delta) for erro in self.erros_linha[i]]
+
+    def _ressincronizar(self, inicio: int, profundidade: int):
+        """Propaga a nova profundidade de chaves até coincidir com a anterior"""
+        for i in range(inicio, len(self.linhas)):
+            anterior = self.profundidade[i]
+            if profundidade == anterior:
+                return
+            minimo = self.minimo[i]
+            if anterior + minimo < 0 or profundidade + minimo < 0:
+                # Os erros de chave sem correspondente desta linha mudam
+                tokens, erros, _, _ = self._varrer_linha(self.linhas[i], i + 1, profundidade)
+                self.tokens_linha[i] = tokens
+                self.erros_linha[i] = erros
+            self.profundidade[i] = profundidade
+            profundidade = self._aplicar_chaves(profundidade, self.saldo[i], minimo)
+
+    def _chaves_nao_fechadas(self, profundidade: int) -> List[Tuple[int, int]]:
+        """Posições das chaves que ficaram abertas, da mais externa para a mais interna"""
+        chaves_abertas = []
+        pendentes = 0
+        i = len(self.linhas) - 1
+        while len(chaves_abertas) < profundidade:
+            for token in reversed(self.tokens_linha[i]):
+                if token.tipo is TokenType.FECHA_CHAVES:
+                    pendentes += 1
+                elif token.tipo is TokenType.ABRE_CHAVES:
+                    if pendentes:
+                        pendentes -= 1
+                    else:
+                        chaves_abertas.append((token.linha, token.coluna))
+                        if len(chaves_abertas) == profundidade:
+                            break
+            i -= 1
+        chaves_abertas.reverse()
+        return chaves_abertas
+
 # Função principal para testar
 def main():
     import sys
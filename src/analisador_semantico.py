@@ -4,9 +4,11 @@ Implementa verificação de tipos, escopo e tabela de símbolos
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any, Set
+from typing import List, Dict, Optional, Any, Set, Callable, Tuple
 from enum import Enum, auto
 from analisador_sintatico import NoAST, TipoNo
+from percurso_ast import percorrer_ast, reduzir_ast
+from diagnosticos import Diagnostico, SEMANTICO, ERRO, AVISO
 import json
 import os
 from datetime import datetime
@@ -54,71 +56,98 @@ class Simbolo:
 
 
 class TabelaSimbolos:
-    """Tabela de símbolos com suporte a escopo hierárquico"""
+    """
+    Tabela de símbolos com suporte a escopo hierárquico
+    Cada nome aponta para a pilha das suas ligações, com a do escopo mais interno
+    no topo: buscar e declarar não percorrem a cadeia de escopos, e sair de um
+    escopo só desfaz os nomes que ele declarou
+    """
     
     def __init__(self):
-        self.escopos: List[Dict[str, Simbolo]] = [{}]  # Escopo global
+        # Símbolos declarados em cada escopo aberto, o global primeiro (registro
+        # do que desfazer ao sair do escopo)
+        self.escopos: List[Dict[str, Simbolo]] = [{}]
         self.tipos_escopo: List[TipoEscopo] = [TipoEscopo.GLOBAL]
         self.historico_simbolos: List[Simbolo] = []
+        # Posição fixa de cada nome no vetor de variáveis da execução (escopo plano)
+        self.slots: Dict[str, int] = {}
+        # Nome -> pilha de (símbolo, não usados do escopo que o declarou)
+        self._ligacoes: Dict[str, List[Tuple[Simbolo, Dict[str, Simbolo]]]] = {}
+        # Símbolos ainda não usados de cada escopo aberto; os de escopos fechados
+        # não podem mais ser usados e ficam em _nao_usados_fechados
+        self._nao_usados: List[Dict[str, Simbolo]] = [{}]
+        self._nao_usados_fechados: List[Simbolo] = []
     
     def entrar_escopo(self, tipo_escopo: TipoEscopo = TipoEscopo.BLOCO):
         """Entra em um novo escopo"""
         self.escopos.append({})
         self.tipos_escopo.append(tipo_escopo)
+        self._nao_usados.append({})
     
     def sair_escopo(self):
         """Sai do escopo atual"""
         if len(self.escopos) > 1:
             escopo_removido = self.escopos.pop()
             self.tipos_escopo.pop()
+            ligacoes = self._ligacoes
+            for nome in escopo_removido:
+                pilha = ligacoes[nome]
+                pilha.pop()
+                if not pilha:
+                    del ligacoes[nome]
             # Adicionar símbolos removidos ao histórico
-            for simbolo in escopo_removido.values():
-                self.historico_simbolos.append(simbolo)
+            self.historico_simbolos.extend(escopo_removido.values())
+            self._nao_usados_fechados.extend(self._nao_usados.pop().values())
     
     def declarar_simbolo(self, nome: str, tipo: TipoSimbolo, linha: int, coluna: int) -> bool:
         """Declara um novo símbolo no escopo atual"""
         escopo_atual = self.escopos[-1]
-        tipo_escopo_atual = self.tipos_escopo[-1]
         
         if nome in escopo_atual:
             return False  # Já declarado no escopo atual
         
-        simbolo = Simbolo(nome, tipo, tipo_escopo_atual, linha, coluna, True)
+        simbolo = Simbolo(nome, tipo, self.tipos_escopo[-1], linha, coluna, True)
         escopo_atual[nome] = simbolo
+        nao_usados = self._nao_usados[-1]
+        nao_usados[nome] = simbolo
+        pilha = self._ligacoes.get(nome)
+        if pilha is None:
+            self._ligacoes[nome] = [(simbolo, nao_usados)]
+        else:
+            pilha.append((simbolo, nao_usados))
+        if nome not in self.slots:
+            self.slots[nome] = len(self.slots)
         return True
     
     def buscar_simbolo(self, nome: str) -> Optional[Simbolo]:
-        """Busca um símbolo em todos os escopos (do mais interno ao mais externo)"""
-        for escopo in reversed(self.escopos):
-            if nome in escopo:
-                return escopo[nome]
+        """Busca um símbolo visível no escopo atual (o do escopo mais interno)"""
+        pilha = self._ligacoes.get(nome)
+        if pilha:
+            return pilha[-1][0]
         return None
     
     def marcar_usado(self, nome: str) -> bool:
         """Marca um símbolo como usado"""
-        simbolo = self.buscar_simbolo(nome)
-        if simbolo:
+        pilha = self._ligacoes.get(nome)
+        if not pilha:
+            return False
+        simbolo, nao_usados = pilha[-1]
+        if not simbolo.usado:
             simbolo.usado = True
-            return True
-        return False
+            del nao_usados[nome]
+        return True
     
     def obter_simbolos_nao_usados(self) -> List[Simbolo]:
-        """Retorna símbolos declarados mas não usados"""
-        simbolos_nao_usados = []
-        
-        # Verificar escopos atuais
-        for escopo in self.escopos:
-            for simbolo in escopo.values():
-                if simbolo.declarado and not simbolo.usado:
-                    simbolos_nao_usados.append(simbolo)
-        
-        # Verificar histórico
-        for simbolo in self.historico_simbolos:
-            if simbolo.declarado and not simbolo.usado:
-                simbolos_nao_usados.append(simbolo)
-        
+        """Retorna símbolos declarados mas não usados (escopos atuais, depois os fechados)"""
+        simbolos_nao_usados = [simbolo for nao_usados in self._nao_usados
+                               for simbolo in nao_usados.values()]
+        simbolos_nao_usados.extend(self._nao_usados_fechados)
         return simbolos_nao_usados
     
+    def obter_slots(self) -> Dict[str, int]:
+        """Retorna o índice de armazenamento de cada variável, na ordem de declaração"""
+        return dict(self.slots)
+    
     def obter_todos_simbolos(self) -> List[Simbolo]:
         """Retorna todos os símbolos (atuais + histórico)"""
         todos_simbolos = []
@@ -130,13 +159,172 @@ class TabelaSimbolos:
         return todos_simbolos
 
 
+@dataclass
+class RegistroTabela:
+    """
+    O que uma declaração de nível superior leu e deixou na tabela de símbolos
+    consultas: tipo do símbolo global de cada nome que a declaração tocou, no
+    momento do primeiro acesso (None se não havia símbolo global)
+    declaracoes: cada declaração bem-sucedida em ordem, com o símbolo quando
+    foi no escopo global (None nos escopos internos, que a declaração fecha)
+    """
+    consultas: Dict[str, Optional[TipoSimbolo]]
+    declaracoes: List[Tuple[str, Optional[Simbolo]]]
+    usados: List[str]
+    fechados: List[Simbolo]
+    nao_usados_fechados: List[Simbolo]
+
+
+class TabelaSimbolosIncremental(TabelaSimbolos):
+    """
+    Tabela de símbolos que registra, por declaração de nível superior, os acessos
+    ao escopo global (usada por analisar_incremental)
+    Entre iniciar_registro e encerrar_registro só o escopo global está aberto no
+    início, então todo nome tocado antes de ser declarado pela própria declaração
+    se refere ao escopo global; reaplicar refaz os efeitos sem reanalisar a subárvore
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._consultas: Optional[Dict[str, Optional[TipoSimbolo]]] = None
+        self._declaracoes: List[Tuple[str, Optional[Simbolo]]] = []
+        self._usados: Dict[str, None] = {}
+        self._inicio_fechados = 0
+        self._inicio_nao_usados_fechados = 0
+    
+    def iniciar_registro(self):
+        """Começa a registrar os acessos de uma declaração de nível superior"""
+        self._consultas = {}
+        self._declaracoes = []
+        self._usados = {}
+        self._inicio_fechados = len(self.historico_simbolos)
+        self._inicio_nao_usados_fechados = len(self._nao_usados_fechados)
+    
+    def encerrar_registro(self) -> RegistroTabela:
+        """Termina o registro iniciado por iniciar_registro e o retorna"""
+        registro = RegistroTabela(self._consultas, self._declaracoes, list(self._usados),
+                                  self.historico_simbolos[self._inicio_fechados:],
+                                  self._nao_usados_fechados[self._inicio_nao_usados_fechados:])
+        self._consultas = None
+        return registro
+    
+    def registro_valido(self, registro: RegistroTabela) -> bool:
+        """Verifica se o escopo global ainda é o que a declaração encontrou"""
+        globais = self.escopos[0]
+        for nome, tipo in registro.consultas.items():
+            simbolo = globais.get(nome)
+            if (simbolo.tipo if simbolo else None) != tipo:
+                return False
+        return True
+    
+    def reaplicar(self, registro: RegistroTabela):
+        """Refaz na tabela os efeitos registrados de uma declaração"""
+        slots = self.slots
+        for nome, simbolo in registro.declaracoes:
+            if simbolo is not None:
+                self.declarar_simbolo(nome, simbolo.tipo, simbolo.linha, simbolo.coluna)
+            elif nome not in slots:
+                slots[nome] = len(slots)
+        for nome in registro.usados:
+            self.marcar_usado(nome)
+        self.historico_simbolos.extend(registro.fechados)
+        self._nao_usados_fechados.extend(registro.nao_usados_fechados)
+    
+    def _consultar(self, nome: str):
+        """Guarda o estado global do nome no primeiro acesso da declaração"""
+        if nome not in self._consultas:
+            simbolo = self.escopos[0].get(nome)
+            self._consultas[nome] = simbolo.tipo if simbolo else None
+    
+    def declarar_simbolo(self, nome: str, tipo: TipoSimbolo, linha: int, coluna: int) -> bool:
+        if self._consultas is None:
+            return super().declarar_simbolo(nome, tipo, linha, coluna)
+        self._consultar(nome)
+        if not super().declarar_simbolo(nome, tipo, linha, coluna):
+            return False
+        self._declaracoes.append((nome, self.escopos[0][nome] if len(self.escopos) == 1 else None))
+        return True
+    
+    def buscar_simbolo(self, nome: str) -> Optional[Simbolo]:
+        if self._consultas is not None:
+            self._consultar(nome)
+        return super().buscar_simbolo(nome)
+    
+    def marcar_usado(self, nome: str) -> bool:
+        if self._consultas is not None:
+            self._consultar(nome)
+            pilha = self._ligacoes.get(nome)
+            if pilha and pilha[-1][1] is self._nao_usados[0]:
+                self._usados[nome] = None
+        return super().marcar_usado(nome)
+
+
+@dataclass
+class TrechoSemantico:
+    """
+    Declaração de nível superior guardada por analisar_incremental
+    no é a própria subárvore (a chave é a identidade dela, que analisar_incremental
+    do parser preserva nas declarações não editadas); linha é a do nó quando foi
+    analisado
+    """
+    no: NoAST
+    linha: int
+    registro: RegistroTabela
+    erros: List[Diagnostico]
+    avisos: List[Diagnostico]
+    raizes: List[NoAST]
+    escritas: List[Tuple[str, List[NoAST]]]
+
+
+def _deslocar_trecho(trecho: TrechoSemantico, delta: int):
+    """
+    Soma delta à linha dos símbolos do trecho; os diagnósticos são trocados por
+    cópias deslocadas, pois os originais podem estar em resultados já retornados
+    """
+    registro = trecho.registro
+    simbolos = [simbolo for _, simbolo in registro.declaracoes if simbolo is not None]
+    for simbolo in simbolos + registro.fechados:
+        simbolo.linha += delta
+    trecho.erros = [erro.deslocado(delta) for erro in trecho.erros]
+    trecho.avisos = [aviso.deslocado(delta) for aviso in trecho.avisos]
+    trecho.linha += delta
+
+
+class AnotacaoTipos:
+    """
+    Tipo garantido de cada nó de expressão, consultado pelo próprio nó
+    NoAST não é hashable (dataclass com __eq__), então cada entrada fica sob id(no)
+    junto com o nó: a referência impede que um nó criado depois (o otimizador
+    descarta e cria nós) reaproveite o id de um nó anotado
+    """
+    __slots__ = ('_entradas',)
+
+    def __init__(self):
+        self._entradas: Dict[int, Tuple[NoAST, TipoSimbolo]] = {}
+
+    def get(self, no: NoAST, padrao: Optional[TipoSimbolo] = None) -> Optional[TipoSimbolo]:
+        entrada = self._entradas.get(id(no))
+        if entrada is None or entrada[0] is not no:
+            return padrao
+        return entrada[1]
+
+    def __setitem__(self, no: NoAST, tipo: TipoSimbolo):
+        self._entradas[id(no)] = (no, tipo)
+
+    def __contains__(self, no: NoAST) -> bool:
+        return self.get(no) is not None
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
 class AnalisadorSemantico:
     """Analisador semântico da linguagem Rainbow"""
     
     def __init__(self):
         self.tabela_simbolos = TabelaSimbolos()
-        self.erros: List[str] = []
-        self.avisos: List[str] = []
+        self.erros: List[Diagnostico] = []
+        self.avisos: List[Diagnostico] = []
         
         # Mapeamento de tipos de tokens para tipos semânticos
         self.mapeamento_tipos = {
@@ -145,90 +333,314 @@ class AnalisadorSemantico:
             'logico': TipoSimbolo.LOGICO,
             'lista': TipoSimbolo.LISTA
         }
+        
+        # Tabelas de despacho por tipo de nó; um tipo sem entrada própria é
+        # analisado como expressão em posição de comando e tem tipo indefinido
+        # em posição de expressão
+        self._comandos: Dict[TipoNo, Callable] = dict.fromkeys(TipoNo, self._analisar_expressao)
+        self._comandos.update({
+            TipoNo.PROGRAMA: self._analisar_programa,
+            TipoNo.DECLARACAO_VARIAVEL: self._analisar_declaracao_variavel,
+            TipoNo.ATRIBUICAO: self._analisar_atribuicao,
+            TipoNo.CONDICIONAL: self._analisar_condicional,
+            TipoNo.LACO_PARA: self._analisar_laco_para,
+            TipoNo.LACO_ENQUANTO: self._analisar_laco_enquanto,
+            TipoNo.BLOCO: self._analisar_bloco
+        })
+        self._expressoes: Dict[TipoNo, Callable] = dict.fromkeys(TipoNo, self._tipo_indefinido)
+        self._expressoes.update({
+            TipoNo.LITERAL: self._analisar_literal,
+            TipoNo.VARIAVEL: self._analisar_variavel,
+            TipoNo.EXPRESSAO_BINARIA: self._analisar_expressao_binaria,
+            TipoNo.EXPRESSAO_UNARIA: self._analisar_expressao_unaria,
+            TipoNo.CHAMADA_FUNCAO: self._analisar_chamada_funcao
+        })
+        # Passos extras registrados por tipo de nó (registrar_passo)
+        self._passos: Dict[TipoNo, List[Callable[['AnalisadorSemantico', NoAST], None]]] = {}
+        # Declarações de nível superior da última analisar_incremental, por id do nó
+        self._trechos: Dict[int, TrechoSemantico] = {}
+        # Entrada da anotação de tipos: raiz de cada expressão analisada e
+        # expressões escritas em cada variável, na ordem da análise
+        self._raizes: List[NoAST] = []
+        self._escritas: List[Tuple[str, List[NoAST]]] = []
+        self._tipos: Optional[AnotacaoTipos] = None
+        # Tipo garantido de cada nome durante a anotação (None: não garantido)
+        self._tipos_nomes: Dict[str, Optional[TipoSimbolo]] = {}
     
-    def analisar(self, ast: NoAST) -> tuple[List[str], List[str]]:
+    def registrar_passo(self, tipo: TipoNo, passo: Callable[['AnalisadorSemantico', NoAST], None]):
+        """
+        Registra uma verificação extra para os nós de um tipo
+        passo(analisador, no) é chamado a cada nó desse tipo analisado: comandos
+        antes da análise padrão, expressões depois dos filhos. Os diagnósticos do
+        passo vão para analisador.erros / analisador.avisos
+        """
+        passos = self._passos.get(tipo)
+        if passos is not None:
+            passos.append(passo)
+            return
+        
+        passos = self._passos[tipo] = [passo]
+        if self._expressoes[tipo] != self._tipo_indefinido:
+            analisar_tipo = self._expressoes[tipo]
+            
+            def analisar_com_passos(no, tipos_filhos):
+                for passo_extra in passos:
+                    passo_extra(self, no)
+                return analisar_tipo(no, tipos_filhos)
+            
+            self._expressoes[tipo] = analisar_com_passos
+        else:
+            analisar_comando = self._comandos[tipo]
+            
+            def analisar_com_passos(no):
+                for passo_extra in passos:
+                    passo_extra(self, no)
+                return analisar_comando(no)
+            
+            self._comandos[tipo] = analisar_com_passos
+    
+    def analisar(self, ast: NoAST) -> tuple[List[Diagnostico], List[Diagnostico]]:
         """
         Realiza análise semântica da AST
         Retorna (erros, avisos)
         """
-        self.erros = []
-        self.avisos = []
+        self._reiniciar()
+        # Cada análise parte de uma tabela vazia
+        self.tabela_simbolos = TabelaSimbolos()
         
         if not ast:
-            self.erros.append("AST não fornecida para análise semântica")
+            self.erros.append(Diagnostico(SEMANTICO, ERRO, None, None, 'ast_ausente'))
             return self.erros, self.avisos
         
         try:
-            self._analisar_no(ast)
-            
-            # Verificar símbolos não usados
-            simbolos_nao_usados = self.tabela_simbolos.obter_simbolos_nao_usados()
-            for simbolo in simbolos_nao_usados:
-                self.avisos.append(
-                    f"Linha: {simbolo.linha:02d} - Coluna: {simbolo.coluna:02d} - "
-                    f"Aviso: Variável '{simbolo.nome}' declarada mas não utilizada"
-                )
-            
+            percorrer_ast(ast, self._analisar_no)
+            self._avisar_nao_usados()
         except Exception as e:
-            self.erros.append(f"Erro interno na análise semântica: {str(e)}")
+            self.erros.append(Diagnostico(SEMANTICO, ERRO, None, None, 'erro_interno_semantico', (str(e),)))
         
         return self.erros, self.avisos
     
+    def analisar_incremental(self, ast: NoAST) -> tuple[List[Diagnostico], List[Diagnostico]]:
+        """
+        Como analisar, mas reaproveita o resultado das declarações de nível
+        superior da chamada anterior: uma declaração que é o mesmo nó (como as que
+        AnalisadorSintatico.analisar_incremental preserva) e cujos nomes ainda têm
+        no escopo global o tipo que tinham é reaplicada na tabela sem ser
+        percorrida, com linhas atualizadas se o nó mudou de linha. Erros e avisos
+        são os mesmos de analisar, na mesma ordem; os passos de registrar_passo só
+        rodam nas declarações reanalisadas
+        """
+        if not ast or ast.tipo != TipoNo.PROGRAMA:
+            self._trechos = {}
+            return self.analisar(ast)
+        
+        self._reiniciar()
+        tabela = self.tabela_simbolos = TabelaSimbolosIncremental()
+        anteriores = self._trechos
+        trechos = {}
+        try:
+            # Os passos do nó programa rodam como em analisar; o gerador dá as declarações
+            for no in self._comandos[TipoNo.PROGRAMA](ast):
+                trecho = anteriores.get(id(no))
+                if trecho is not None and trecho.no is no and tabela.registro_valido(trecho.registro):
+                    if no.linha != trecho.linha:
+                        _deslocar_trecho(trecho, no.linha - trecho.linha)
+                    tabela.reaplicar(trecho.registro)
+                    self.erros.extend(trecho.erros)
+                    self.avisos.extend(trecho.avisos)
+                    self._raizes.extend(trecho.raizes)
+                    self._escritas.extend(trecho.escritas)
+                else:
+                    trecho = self._analisar_trecho(no)
+                trechos[id(no)] = trecho
+            self._avisar_nao_usados()
+        except Exception as e:
+            trechos = {}
+            self.erros.append(Diagnostico(SEMANTICO, ERRO, None, None, 'erro_interno_semantico', (str(e),)))
+        
+        self._trechos = trechos
+        return self.erros, self.avisos
+    
+    def _analisar_trecho(self, no: NoAST) -> TrechoSemantico:
+        """Analisa uma declaração de nível superior registrando seus efeitos"""
+        inicio_erros = len(self.erros)
+        inicio_avisos = len(self.avisos)
+        inicio_raizes = len(self._raizes)
+        inicio_escritas = len(self._escritas)
+        self.tabela_simbolos.iniciar_registro()
+        try:
+            percorrer_ast(no, self._analisar_no)
+        finally:
+            registro = self.tabela_simbolos.encerrar_registro()
+        return TrechoSemantico(no, no.linha, registro,
+                               self.erros[inicio_erros:], self.avisos[inicio_avisos:],
+                               self._raizes[inicio_raizes:], self._escritas[inicio_escritas:])
+    
+    def _reiniciar(self):
+        """Descarta os resultados da análise anterior"""
+        self.erros = []
+        self.avisos = []
+        self._raizes = []
+        self._escritas = []
+        self._tipos = None
+    
+    @property
+    def tipos(self) -> AnotacaoTipos:
+        """
+        Anotação de tipos da última análise: nó de expressão -> tipo
+        que o valor do nó tem garantidamente na execução (os nós sem tipo garantido
+        ficam de fora). Calculada na primeira consulta, em um único passo sobre as
+        expressões, e válida enquanto a AST analisada existir
+        """
+        if self._tipos is None:
+            self._tipos = self._anotar_tipos()
+        return self._tipos
+    
+    def escritas_por_nome(self) -> Dict[str, int]:
+        """Quantas escritas (atribuições e laços 'para') cada variável tem no programa"""
+        contagem = {}
+        for nome, _ in self._escritas:
+            contagem[nome] = contagem.get(nome, 0) + 1
+        return contagem
+    
+    def tipo_de(self, no: NoAST) -> TipoSimbolo:
+        """Tipo anotado de um nó de expressão (INDEFINIDO se não é garantido)"""
+        return self.tipos.get(no, TipoSimbolo.INDEFINIDO)
+    
+    def _anotar_tipos(self) -> AnotacaoTipos:
+        """
+        Calcula a anotação de tipos
+        Na execução as variáveis não têm escopo (um valor por nome), então o tipo
+        de uma variável só é garantido se todos os símbolos com o nome têm o mesmo
+        tipo e toda escrita no nome produz garantidamente esse tipo. Parte de todos
+        os nomes garantidos e retira os que têm alguma escrita de outro tipo até não
+        mudar mais (uma escrita como #x + 1 mantém #x garantido)
+        """
+        tipos_nomes = self._tipos_nomes = {}
+        for simbolo in self.tabela_simbolos.obter_todos_simbolos():
+            tipo = simbolo.tipo if simbolo.tipo != TipoSimbolo.INDEFINIDO else None
+            if tipos_nomes.setdefault(simbolo.nome, tipo) != tipo:
+                tipos_nomes[simbolo.nome] = None
+        
+        tipos = self._anotar_raizes()
+        # Caso comum: todas as escritas confirmam os tipos supostos e basta um passo
+        if not self._retirar_nomes(lambda expressao: tipos.get(expressao, TipoSimbolo.INDEFINIDO)):
+            return tipos
+        
+        # Propagar pelas escritas até não mudar mais e anotar de novo
+        while self._retirar_nomes(lambda expressao: reduzir_ast(expressao, self._tipo_execucao)):
+            pass
+        return self._anotar_raizes()
+    
+    def _retirar_nomes(self, tipo_escrita: Callable[[NoAST], TipoSimbolo]) -> bool:
+        """Retira os nomes garantidos com alguma escrita de outro tipo; indica se retirou"""
+        tipos_nomes = self._tipos_nomes
+        retirou = False
+        for nome, expressoes in self._escritas:
+            tipo = tipos_nomes.get(nome)
+            if tipo is None:
+                continue
+            for expressao in expressoes:
+                if tipo_escrita(expressao) != tipo:
+                    tipos_nomes[nome] = None
+                    retirou = True
+                    break
+        return retirou
+    
+    def _anotar_raizes(self) -> AnotacaoTipos:
+        """Anota todas as expressões analisadas com os tipos garantidos dos nomes atuais"""
+        tipos = AnotacaoTipos()
+        tipo_execucao = self._tipo_execucao
+        indefinido = TipoSimbolo.INDEFINIDO
+        
+        def anotar(no, tipos_filhos):
+            tipo = tipo_execucao(no, tipos_filhos)
+            if tipo is not indefinido:
+                tipos[no] = tipo
+            return tipo
+        
+        for raiz in self._raizes:
+            reduzir_ast(raiz, anotar)
+        return tipos
+    
+    def _tipo_execucao(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
+        """
+        Tipo que o valor do nó tem garantidamente na execução, a partir do dos filhos
+        Segue operacoes_rainbow: aritmética (fora o +) converte os operandos e sempre
+        dá número, comparações e NAO dão lógico, + só é número entre números e é texto
+        com qualquer operando texto, E/OU devolvem um dos operandos
+        """
+        tipo_no = no.tipo
+        if tipo_no is TipoNo.LITERAL:
+            return self._analisar_literal(no, tipos_filhos)
+        if tipo_no is TipoNo.VARIAVEL:
+            return self._tipos_nomes.get(no.valor) or TipoSimbolo.INDEFINIDO
+        
+        operador = no.valor
+        if tipo_no is TipoNo.EXPRESSAO_BINARIA and len(tipos_filhos) >= 2:
+            tipo_esq, tipo_dir = tipos_filhos[0], tipos_filhos[1]
+            if operador == '+':
+                if tipo_esq == TipoSimbolo.TEXTO or tipo_dir == TipoSimbolo.TEXTO:
+                    return TipoSimbolo.TEXTO
+                if tipo_esq == TipoSimbolo.NUMERO and tipo_dir == TipoSimbolo.NUMERO:
+                    return TipoSimbolo.NUMERO
+            elif operador in ('-', '*', '/', '%'):
+                return TipoSimbolo.NUMERO
+            elif operador in ('>', '<', '>=', '<=', 'igual', 'diferente'):
+                return TipoSimbolo.LOGICO
+            elif operador in ('E', 'OU') and tipo_esq == tipo_dir:
+                return tipo_esq
+        elif tipo_no is TipoNo.EXPRESSAO_UNARIA and tipos_filhos:
+            if operador == '-':
+                return TipoSimbolo.NUMERO
+            if operador == 'NAO':
+                return TipoSimbolo.LOGICO
+        return TipoSimbolo.INDEFINIDO
+    
+    def _avisar_nao_usados(self):
+        """Avisa os símbolos declarados e nunca usados"""
+        for simbolo in self.tabela_simbolos.obter_simbolos_nao_usados():
+            self.avisos.append(Diagnostico(SEMANTICO, AVISO, simbolo.linha, simbolo.coluna,
+                                           'variavel_nao_utilizada', (simbolo.nome,)))
+    
+    def _erro(self, no: NoAST, codigo: str, *argumentos):
+        """Registra um erro na posição do nó (mensagem em diagnosticos.MENSAGENS)"""
+        self.erros.append(Diagnostico(SEMANTICO, ERRO, no.linha, no.coluna, codigo, argumentos))
+    
+    def _aviso(self, no: NoAST, codigo: str, *argumentos):
+        """Registra um aviso na posição do nó"""
+        self.avisos.append(Diagnostico(SEMANTICO, AVISO, no.linha, no.coluna, codigo, argumentos))
+    
     def _analisar_no(self, no: NoAST):
-        """Analisa um nó da AST recursivamente"""
-        if no.tipo == TipoNo.PROGRAMA:
-            self._analisar_programa(no)
-        elif no.tipo == TipoNo.DECLARACAO_VARIAVEL:
-            self._analisar_declaracao_variavel(no)
-        elif no.tipo == TipoNo.ATRIBUICAO:
-            self._analisar_atribuicao(no)
-        elif no.tipo == TipoNo.CONDICIONAL:
-            self._analisar_condicional(no)
-        elif no.tipo == TipoNo.LACO_PARA:
-            self._analisar_laco_para(no)
-        elif no.tipo == TipoNo.LACO_ENQUANTO:
-            self._analisar_laco_enquanto(no)
-        elif no.tipo == TipoNo.CHAMADA_FUNCAO:
-            self._analisar_chamada_funcao(no)
-        elif no.tipo == TipoNo.BLOCO:
-            self._analisar_bloco(no)
-        elif no.tipo == TipoNo.EXPRESSAO_BINARIA:
-            self._analisar_expressao_binaria(no)
-        elif no.tipo == TipoNo.EXPRESSAO_UNARIA:
-            self._analisar_expressao_unaria(no)
-        elif no.tipo == TipoNo.VARIAVEL:
-            self._analisar_variavel(no)
-        elif no.tipo == TipoNo.LITERAL:
-            self._analisar_literal(no)
+        """
+        Analisa um nó da AST (visitante de percorrer_ast)
+        Os comandos que contêm blocos são geradores que fazem yield de cada nó a
+        analisar, sem recursão; expressões são analisadas por _analisar_expressao
+        """
+        return self._comandos[no.tipo](no)
     
     def _analisar_programa(self, no: NoAST):
         """Analisa o nó programa"""
         for filho in no.filhos:
-            self._analisar_no(filho)
+            yield filho
     
     def _analisar_declaracao_variavel(self, no: NoAST):
         """Analisa declaração de variável"""
         if not isinstance(no.valor, dict) or 'tipo' not in no.valor or 'nome' not in no.valor:
-            self.erros.append(f"Linha: {no.linha:02d} - Erro: Declaração de variável mal formada")
+            self.erros.append(Diagnostico(SEMANTICO, ERRO, no.linha, None, 'declaracao_mal_formada'))
             return
         
         tipo_str = no.valor['tipo']
         nome_var = no.valor['nome']
         
         if tipo_str not in self.mapeamento_tipos:
-            self.erros.append(
-                f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                f"Erro: Tipo '{tipo_str}' não reconhecido"
-            )
+            self._erro(no, 'tipo_desconhecido', tipo_str)
             return
         
         tipo_simbolo = self.mapeamento_tipos[tipo_str]
         
         if not self.tabela_simbolos.declarar_simbolo(nome_var, tipo_simbolo, no.linha, no.coluna):
-            self.erros.append(
-                f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                f"Erro: Variável '{nome_var}' já foi declarada neste escopo"
-            )
+            self._erro(no, 'variavel_redeclarada', nome_var)
     
     def _analisar_atribuicao(self, no: NoAST):
         """Analisa atribuição de variável"""
@@ -241,6 +653,7 @@ class AnalisadorSemantico:
         tipo_expressao = TipoSimbolo.INDEFINIDO
         if no.filhos:
             tipo_expressao = self._analisar_expressao(no.filhos[0])
+            self._escritas.append((nome_var, no.filhos[:1]))
         
         if not simbolo:
             # Declaração implícita: inferir tipo da expressão
@@ -262,11 +675,7 @@ class AnalisadorSemantico:
                 simbolo.tipo != tipo_expressao):
                 # Permitir algumas conversões implícitas
                 if not self._conversao_permitida(simbolo.tipo, tipo_expressao):
-                    self.avisos.append(
-                        f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                        f"Aviso: Possível incompatibilidade de tipos - esperado '{simbolo.tipo.name}', "
-                        f"encontrado '{tipo_expressao.name}'"
-                    )
+                    self._aviso(no, 'tipos_incompativeis', simbolo.tipo.name, tipo_expressao.name)
     
     def _analisar_condicional(self, no: NoAST):
         """Analisa estrutura condicional"""
@@ -275,14 +684,11 @@ class AnalisadorSemantico:
             tipo_condicao = self._analisar_expressao(no.filhos[0])
             
             if tipo_condicao != TipoSimbolo.LOGICO and tipo_condicao != TipoSimbolo.INDEFINIDO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Condição deve ser do tipo 'logico', encontrado '{tipo_condicao.name}'"
-                )
+                self._erro(no, 'condicao_nao_logica', tipo_condicao.name)
             
             # Analisar blocos
             for i in range(1, len(no.filhos)):
-                self._analisar_no(no.filhos[i])
+                yield no.filhos[i]
     
     def _analisar_laco_para(self, no: NoAST):
         """Analisa laço para"""
@@ -295,10 +701,7 @@ class AnalisadorSemantico:
             # Se já existe, verificar se é do tipo correto
             simbolo = self.tabela_simbolos.buscar_simbolo(nome_var_controle)
             if simbolo and simbolo.tipo != TipoSimbolo.NUMERO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Variável de controle '{nome_var_controle}' deve ser do tipo 'numero'"
-                )
+                self._erro(no, 'controle_nao_numerico', nome_var_controle)
         
         # Marcar variável de controle como usada
         self.tabela_simbolos.marcar_usado(nome_var_controle)
@@ -308,13 +711,12 @@ class AnalisadorSemantico:
             for i in range(3):
                 tipo_expr = self._analisar_expressao(no.filhos[i])
                 if tipo_expr != TipoSimbolo.NUMERO and tipo_expr != TipoSimbolo.INDEFINIDO:
-                    self.erros.append(
-                        f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                        f"Erro: Expressões do laço 'para' devem ser do tipo 'numero'"
-                    )
+                    self._erro(no, 'limites_para_nao_numericos')
+            # A variável de controle recebe números se início, fim e passo forem números
+            self._escritas.append((nome_var_controle, no.filhos[:3]))
             
             # Analisar corpo do laço
-            self._analisar_no(no.filhos[3])
+            yield no.filhos[3]
         
         self.tabela_simbolos.sair_escopo()
     
@@ -327,73 +729,62 @@ class AnalisadorSemantico:
             tipo_condicao = self._analisar_expressao(no.filhos[0])
             
             if tipo_condicao != TipoSimbolo.LOGICO and tipo_condicao != TipoSimbolo.INDEFINIDO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Condição do 'enquanto' deve ser do tipo 'logico'"
-                )
+                self._erro(no, 'condicao_enquanto_nao_logica')
             
             # Analisar corpo
             if len(no.filhos) > 1:
-                self._analisar_no(no.filhos[1])
+                yield no.filhos[1]
         
         self.tabela_simbolos.sair_escopo()
     
-    def _analisar_chamada_funcao(self, no: NoAST):
-        """Analisa chamada de função"""
+    def _analisar_chamada_funcao(self, no: NoAST, tipos_argumentos: List[TipoSimbolo]) -> TipoSimbolo:
+        """Analisa chamada de função e retorna o tipo do resultado"""
         nome_funcao = no.valor
         
         # Verificar funções built-in
         if nome_funcao == "mostrar":
-            if no.filhos:
-                self._analisar_expressao(no.filhos[0])
+            pass
         elif nome_funcao == "ler":
-            if no.filhos:
-                tipo_arg = self._analisar_expressao(no.filhos[0])
+            if tipos_argumentos:
+                tipo_arg = tipos_argumentos[0]
                 if tipo_arg != TipoSimbolo.TEXTO and tipo_arg != TipoSimbolo.INDEFINIDO:
-                    self.avisos.append(
-                        f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                        f"Aviso: Argumento de 'ler' deve ser do tipo 'texto'"
-                    )
+                    self._aviso(no, 'argumento_ler')
+            return TipoSimbolo.TEXTO  # ler retorna texto
         else:
-            self.erros.append(
-                f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                f"Erro: Função '{nome_funcao}' não reconhecida"
-            )
+            self._erro(no, 'funcao_desconhecida', nome_funcao)
+        return TipoSimbolo.INDEFINIDO
     
     def _analisar_bloco(self, no: NoAST):
         """Analisa bloco de código"""
         self.tabela_simbolos.entrar_escopo(TipoEscopo.BLOCO)
         
         for filho in no.filhos:
-            self._analisar_no(filho)
+            yield filho
         
         self.tabela_simbolos.sair_escopo()
     
     def _analisar_expressao(self, no: NoAST) -> TipoSimbolo:
-        """Analisa expressão e retorna seu tipo"""
-        if no.tipo == TipoNo.LITERAL:
-            return self._analisar_literal(no)
-        elif no.tipo == TipoNo.VARIAVEL:
-            return self._analisar_variavel(no)
-        elif no.tipo == TipoNo.EXPRESSAO_BINARIA:
-            return self._analisar_expressao_binaria(no)
-        elif no.tipo == TipoNo.EXPRESSAO_UNARIA:
-            return self._analisar_expressao_unaria(no)
-        elif no.tipo == TipoNo.CHAMADA_FUNCAO:
-            self._analisar_chamada_funcao(no)
-            if no.valor == "ler":
-                return TipoSimbolo.TEXTO  # ler retorna texto
-            return TipoSimbolo.INDEFINIDO
-        else:
-            return TipoSimbolo.INDEFINIDO
+        """Analisa expressão e retorna seu tipo (pós-ordem: operandos antes do operador)"""
+        self._raizes.append(no)
+        if not no.filhos:
+            # Caso mais comum (literal ou variável): dispensa o percurso
+            return self._expressoes[no.tipo](no, [])
+        return reduzir_ast(no, self._tipo_expressao)
+    
+    def _tipo_expressao(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
+        """Tipo de um nó de expressão a partir dos tipos dos filhos já analisados"""
+        return self._expressoes[no.tipo](no, tipos_filhos)
+    
+    def _tipo_indefinido(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
+        """Tipo de um nó que não é expressão"""
+        return TipoSimbolo.INDEFINIDO
     
-    def _analisar_expressao_binaria(self, no: NoAST) -> TipoSimbolo:
+    def _analisar_expressao_binaria(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
         """Analisa expressão binária e retorna seu tipo"""
-        if len(no.filhos) < 2:
+        if len(tipos_filhos) < 2:
             return TipoSimbolo.INDEFINIDO
         
-        tipo_esq = self._analisar_expressao(no.filhos[0])
-        tipo_dir = self._analisar_expressao(no.filhos[1])
+        tipo_esq, tipo_dir = tipos_filhos[0], tipos_filhos[1]
         operador = no.valor
         
         # Operadores aritméticos
@@ -405,17 +796,11 @@ class AnalisadorSemantico:
                 elif tipo_esq == TipoSimbolo.NUMERO and tipo_dir == TipoSimbolo.NUMERO:
                     return TipoSimbolo.NUMERO
                 else:
-                    self.erros.append(
-                        f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                        f"Erro: Operador '+' requer tipos compatíveis"
-                    )
+                    self._erro(no, 'soma_incompativel')
                     return TipoSimbolo.INDEFINIDO
             else:
                 if tipo_esq != TipoSimbolo.NUMERO or tipo_dir != TipoSimbolo.NUMERO:
-                    self.erros.append(
-                        f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                        f"Erro: Operador '{operador}' requer operandos do tipo 'numero'"
-                    )
+                    self._erro(no, 'operandos_numero', operador)
                 return TipoSimbolo.NUMERO
         
         # Operadores relacionais
@@ -425,49 +810,37 @@ class AnalisadorSemantico:
                 tipo_esq != TipoSimbolo.INDEFINIDO and 
                 tipo_dir != TipoSimbolo.INDEFINIDO and
                 not self._tipos_comparaveis(tipo_esq, tipo_dir)):
-                self.avisos.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Aviso: Comparação entre tipos diferentes ('{tipo_esq.name}' e '{tipo_dir.name}')"
-                )
+                self._aviso(no, 'comparacao_tipos_diferentes', tipo_esq.name, tipo_dir.name)
             return TipoSimbolo.LOGICO
         
         # Operadores lógicos
         elif operador in ['E', 'OU']:
             if tipo_esq != TipoSimbolo.LOGICO or tipo_dir != TipoSimbolo.LOGICO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Operador '{operador}' requer operandos do tipo 'logico'"
-                )
+                self._erro(no, 'operandos_logico', operador)
             return TipoSimbolo.LOGICO
         
         return TipoSimbolo.INDEFINIDO
     
-    def _analisar_expressao_unaria(self, no: NoAST) -> TipoSimbolo:
+    def _analisar_expressao_unaria(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
         """Analisa expressão unária e retorna seu tipo"""
-        if not no.filhos:
+        if not tipos_filhos:
             return TipoSimbolo.INDEFINIDO
         
-        tipo_operando = self._analisar_expressao(no.filhos[0])
+        tipo_operando = tipos_filhos[0]
         operador = no.valor
         
         if operador == '-':
             if tipo_operando != TipoSimbolo.NUMERO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Operador '-' unário requer operando do tipo 'numero'"
-                )
+                self._erro(no, 'menos_unario')
             return TipoSimbolo.NUMERO
         elif operador == 'NAO':
             if tipo_operando != TipoSimbolo.LOGICO:
-                self.erros.append(
-                    f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                    f"Erro: Operador 'NAO' requer operando do tipo 'logico'"
-                )
+                self._erro(no, 'nao_unario')
             return TipoSimbolo.LOGICO
         
         return TipoSimbolo.INDEFINIDO
     
-    def _analisar_variavel(self, no: NoAST) -> TipoSimbolo:
+    def _analisar_variavel(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
         """Analisa uso de variável e retorna seu tipo"""
         nome_var = no.valor
         
@@ -475,10 +848,7 @@ class AnalisadorSemantico:
         if not simbolo:
             # Em Rainbow, variáveis podem ser usadas sem declaração explícita
             # Vamos criar um símbolo com tipo indefinido e gerar um aviso
-            self.avisos.append(
-                f"Linha: {no.linha:02d} - Coluna: {no.coluna:02d} - "
-                f"Aviso: Variável '{nome_var}' usada sem declaração explícita"
-            )
+            self._aviso(no, 'variavel_sem_declaracao', nome_var)
             # Declarar implicitamente com tipo indefinido
             self.tabela_simbolos.declarar_simbolo(nome_var, TipoSimbolo.INDEFINIDO, no.linha, no.coluna)
             simbolo = self.tabela_simbolos.buscar_simbolo(nome_var)
@@ -490,7 +860,7 @@ class AnalisadorSemantico:
         
         return TipoSimbolo.INDEFINIDO
     
-    def _analisar_literal(self, no: NoAST) -> TipoSimbolo:
+    def _analisar_literal(self, no: NoAST, tipos_filhos: List[TipoSimbolo]) -> TipoSimbolo:
         """Analisa literal e retorna seu tipo"""
         valor = no.valor
         
@@ -592,8 +962,8 @@ class AnalisadorSemantico:
                 'total_avisos': len(self.avisos)
             },
             'simbolos': [simbolo.to_dict() for simbolo in simbolos],
-            'erros': self.erros,
-            'avisos': self.avisos,
+            'erros': [str(erro) for erro in self.erros],
+            'avisos': [str(aviso) for aviso in self.avisos],
             'estatisticas': {
                 'simbolos_por_tipo': self._contar_simbolos_por_tipo(simbolos),
                 'simbolos_por_escopo': self._contar_simbolos_por_escopo(simbolos),
@@ -725,4 +1095,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -3,10 +3,17 @@ Analisador Sintático para a Linguagem Rainbow
 Implementa um parser recursivo descendente que constrói uma AST
 """
 
+from array import array
+from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import List, Optional, Union, Any
+from itertools import repeat
+from operator import attrgetter, sub
+from typing import Iterable, Iterator, List, Optional, Union, Any
 from enum import Enum, auto
 from analisador_lexico import TokenType, Token, AnalisadorLexico
+from diagnosticos import Diagnostico, SINTATICO, ERRO
+from percurso_ast import iterar_ast, reduzir_ast
 import json
 import os
 from datetime import datetime
@@ -27,6 +34,10 @@ class TipoNo(Enum):
     VARIAVEL = auto()
     BLOCO = auto()
 
+    # Membros são únicos: hash por identidade, sem o __hash__ em Python do Enum,
+    # deixa as tabelas de despacho por tipo de nó mais rápidas
+    __hash__ = object.__hash__
+
 
 @dataclass
 class NoAST:
@@ -43,13 +54,242 @@ class NoAST:
     
     def to_dict(self):
         """Converte o nó para dicionário para serialização"""
-        return {
-            'tipo': self.tipo.name,
-            'valor': self.valor,
-            'filhos': [filho.to_dict() for filho in self.filhos],
-            'linha': self.linha,
-            'coluna': self.coluna
-        }
+        return reduzir_ast(self, _dicionario_no)
+
+
+def _dicionario_no(no, filhos: list) -> dict:
+    """Dicionário de um nó (NoAST ou NoArena) a partir dos dicionários dos filhos"""
+    return {
+        'tipo': no.tipo.name,
+        'valor': no.valor,
+        'filhos': filhos,
+        'linha': no.linha,
+        'coluna': no.coluna
+    }
+
+
+# Tipo de nó pelo código guardado em ArenaAST (valor do enum)
+TIPOS_NO = {tipo.value: tipo for tipo in TipoNo}
+
+
+class ArenaAST:
+    """
+    AST plana guardada em colunas paralelas de array
+    Cada nó ocupa o código do tipo, o índice do valor em tabela_valores, o
+    primeiro filho, o próximo irmão (-1 quando não há), linha e coluna (21
+    bytes), em vez de um NoAST com seu dicionário e sua lista de filhos. Valores
+    repetidos (operadores, nomes de variáveis, literais) são guardados uma vez.
+    O percurso por índice (tipo(i), valor(i), filhos(i)) não cria objetos por
+    nó; no(i) devolve um NoArena com a mesma interface de NoAST.
+    """
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.valores = array('I')
+        self.primeiro_filho = array('i')
+        self.proximo_irmao = array('i')
+        self.linhas = array('I')
+        self.colunas = array('I')
+        self.tabela_valores: List[Any] = [None]
+        self._indices_valor = {None: 0}
+        # Último filho dos nós que recebem filhos com anexar()
+        self._ultimo_filho = {}
+
+    @classmethod
+    def de_no(cls, no: NoAST) -> 'ArenaAST':
+        """Copia uma árvore de NoAST para uma arena nova (a raiz fica no índice 0)"""
+        arena = cls()
+        arena.acrescentar(no)
+        return arena
+
+    def _novo(self, tipo: TipoNo, valor: Any, linha: int, coluna: int) -> int:
+        chave = tuple(valor.items()) if isinstance(valor, dict) else valor
+        indice_valor = self._indices_valor.get(chave)
+        if indice_valor is None:
+            indice_valor = len(self.tabela_valores)
+            self.tabela_valores.append(valor)
+            self._indices_valor[chave] = indice_valor
+        
+        self.tipos.append(tipo.value)
+        self.valores.append(indice_valor)
+        self.primeiro_filho.append(-1)
+        self.proximo_irmao.append(-1)
+        self.linhas.append(linha)
+        self.colunas.append(coluna)
+        return len(self.tipos) - 1
+
+    def acrescentar(self, no: NoAST) -> int:
+        """
+        Copia a subárvore de no para a arena e retorna o índice da sua raiz
+        Os filhos de cada nó ficam em índices consecutivos
+        """
+        raiz = self._novo(no.tipo, no.valor, no.linha, no.coluna)
+        pendentes = [(no, raiz)]
+        while pendentes:
+            no, indice = pendentes.pop()
+            anterior = -1
+            for filho in no.filhos:
+                atual = self._novo(filho.tipo, filho.valor, filho.linha, filho.coluna)
+                if anterior < 0:
+                    self.primeiro_filho[indice] = atual
+                else:
+                    self.proximo_irmao[anterior] = atual
+                anterior = atual
+                if filho.filhos:
+                    pendentes.append((filho, atual))
+        return raiz
+
+    def anexar(self, pai: int, no: NoAST) -> int:
+        """Copia a subárvore de no como último filho de pai"""
+        filho = self.acrescentar(no)
+        ultimo = self._ultimo_filho.get(pai)
+        if ultimo is None:
+            ultimo = -1
+            proximo = self.primeiro_filho[pai]
+            while proximo >= 0:
+                ultimo, proximo = proximo, self.proximo_irmao[proximo]
+        
+        if ultimo < 0:
+            self.primeiro_filho[pai] = filho
+        else:
+            self.proximo_irmao[ultimo] = filho
+        self._ultimo_filho[pai] = filho
+        return filho
+
+    def tipo(self, i: int) -> TipoNo:
+        return TIPOS_NO[self.tipos[i]]
+
+    def valor(self, i: int) -> Any:
+        return self.tabela_valores[self.valores[i]]
+
+    def filhos(self, i: int) -> Iterator[int]:
+        """Índices dos filhos de i, em ordem"""
+        filho = self.primeiro_filho[i]
+        proximo_irmao = self.proximo_irmao
+        while filho >= 0:
+            yield filho
+            filho = proximo_irmao[filho]
+
+    def no(self, i: int) -> 'NoArena':
+        return NoArena(self, i)
+
+    @property
+    def raiz(self) -> 'NoArena':
+        return NoArena(self, 0)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelas colunas (sem contar a tabela de valores)"""
+        return sum(coluna.itemsize * len(coluna) for coluna in
+                   (self.tipos, self.valores, self.primeiro_filho, self.proximo_irmao,
+                    self.linhas, self.colunas))
+
+
+class NoArena:
+    """
+    Visão de um nó de ArenaAST com a interface de NoAST (tipo, valor, filhos,
+    linha, coluna, to_dict); guarda só a arena e o índice
+    """
+    __slots__ = ('arena', 'indice')
+
+    def __init__(self, arena: ArenaAST, indice: int):
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def tipo(self) -> TipoNo:
+        return TIPOS_NO[self.arena.tipos[self.indice]]
+
+    @property
+    def valor(self) -> Any:
+        arena = self.arena
+        return arena.tabela_valores[arena.valores[self.indice]]
+
+    @property
+    def linha(self) -> int:
+        return self.arena.linhas[self.indice]
+
+    @property
+    def coluna(self) -> int:
+        return self.arena.colunas[self.indice]
+
+    @property
+    def filhos(self) -> List['NoArena']:
+        arena = self.arena
+        return [NoArena(arena, filho) for filho in arena.filhos(self.indice)]
+
+    def __eq__(self, outro):
+        return (isinstance(outro, NoArena) and self.arena is outro.arena
+                and self.indice == outro.indice)
+
+    def __hash__(self):
+        return hash((id(self.arena), self.indice))
+
+    def __repr__(self):
+        return f"NoArena({self.tipo.name}, {self.valor!r}, indice={self.indice})"
+
+    def to_dict(self):
+        """Converte o nó para dicionário para serialização (mesmo formato de NoAST)"""
+        return reduzir_ast(self, _dicionario_no)
+
+
+@dataclass
+class TrechoSintatico:
+    """
+    Declaração de nível superior guardada por analisar_incremental
+    A chave são os tokens do trecho e o token seguinte (lexema, coluna e linha
+    relativa à primeira), comparados por inteiro e não só pelo hash, então o
+    trecho se repete em qualquer posição do programa; linha é a do primeiro
+    token quando foi analisado
+    """
+    chave: tuple
+    tamanho: int
+    linha: int
+    no: Optional[NoAST]
+    erros: List[Diagnostico]
+
+
+def _deslocar_linhas(no: Optional[NoAST], erros: List[Diagnostico], delta: int) -> List[Diagnostico]:
+    """
+    Soma delta à linha de todos os nós da subárvore; retorna cópias deslocadas dos
+    erros, pois os originais podem estar em resultados já retornados
+    """
+    pendentes = [no] if no else []
+    while pendentes:
+        atual = pendentes.pop()
+        atual.linha += delta
+        pendentes.extend(atual.filhos)
+    return [erro.deslocado(delta) for erro in erros]
+
+
+# Campos dos tokens usados na chave de um TrechoSintatico
+_LEXEMA_COLUNA = attrgetter('lexema', 'coluna')
+_LINHA = attrgetter('linha')
+
+
+# Precedência dos operadores binários (maior liga mais forte); todos são
+# associativos à esquerda
+PRECEDENCIA_BINARIA = {
+    TokenType.OPER_OU: 1,
+    TokenType.OPER_E: 2,
+    TokenType.OPER_IGUAL: 3,
+    TokenType.OPER_DIFERENTE: 3,
+    TokenType.OPER_MAIOR: 4,
+    TokenType.OPER_MENOR: 4,
+    TokenType.OPER_MAIOR_IGUAL: 4,
+    TokenType.OPER_MENOR_IGUAL: 4,
+    TokenType.OPER_SOMA: 5,
+    TokenType.OPER_SUBTRACAO: 5,
+    TokenType.OPER_MULTIPLICACAO: 6,
+    TokenType.OPER_DIVISAO: 6,
+    TokenType.OPER_MODULO: 6,
+}
+
+OPERADORES_UNARIOS = (TokenType.OPER_NAO, TokenType.OPER_SUBTRACAO)
+# Marcador de '(' aberto na pilha de AnalisadorSintatico.expressao
+_GRUPO = ('(',)
 
 
 class AnalisadorSintatico:
@@ -58,39 +298,133 @@ class AnalisadorSintatico:
     def __init__(self):
         self.tokens: List[Token] = []
         self.posicao = 0
-        self.erros: List[str] = []
+        self.erros: List[Diagnostico] = []
         self.token_atual: Optional[Token] = None
-        
-    def analisar(self, tokens: List[Token]) -> tuple[Optional[NoAST], List[str]]:
+        # Tokens puxados sob demanda (ex.: AnalisadorLexico.analisar_fluxo)
+        self.fluxo: Optional[Iterator[Token]] = None
+        # Destino das declarações em analisar_compacto
+        self.arena: Optional[ArenaAST] = None
+        # Declarações da análise anterior (por posição do primeiro token) e da atual,
+        # usadas por analisar_incremental
+        self._trechos_anteriores: dict = {}
+        self._total_anterior = 0
+        self._trechos: Optional[dict] = None
+        
+    def analisar(self, tokens: Union[List[Token], Iterable[Token]]) -> tuple[Optional[NoAST], List[Diagnostico]]:
         """
         Analisa a lista de tokens e retorna a AST e lista de erros
+        Aceita também um iterável (gerador): cada token é lido apenas quando o
+        parser avança, sem materializar a lista
         """
-        self.tokens = tokens
         self.posicao = 0
         self.erros = []
         
-        if not tokens:
-            self.erros.append("Lista de tokens vazia")
-            return None, self.erros
+        if isinstance(tokens, Sequence):
+            self.tokens = tokens
+            self.fluxo = None
+            self.token_atual = tokens[0] if tokens else None
+        else:
+            self.tokens = []
+            self.fluxo = iter(tokens)
+            self.token_atual = next(self.fluxo, None)
         
-        self.token_atual = self.tokens[0] if self.tokens else None
+        if self.token_atual is None:
+            self.erros.append(Diagnostico(SINTATICO, ERRO, None, None, 'tokens_vazios'))
+            return None, self.erros
         
         try:
             ast = self.programa()
             
             # Verificar se chegamos ao final dos tokens
             if self.token_atual and self.token_atual.tipo != TokenType.EOF:
-                self.erro(f"Tokens inesperados após o fim do programa")
+                self.erro('tokens_apos_fim')
             
             return ast, self.erros
             
         except Exception as e:
-            self.erro(f"Erro interno do parser: {str(e)}")
+            self.erro('erro_interno_parser', str(e))
             return None, self.erros
+        
+        finally:
+            # Esgotar o fluxo para que o léxico registre os erros do restante do código
+            if self.fluxo is not None:
+                deque(self.fluxo, maxlen=0)
+                self.fluxo = None
+    
+    def analisar_compacto(self, tokens: Union[List[Token], Iterable[Token]]) -> tuple[Optional[NoArena], List[Diagnostico]]:
+        """
+        Como analisar, mas guarda a AST em uma ArenaAST e retorna a visão da raiz
+        Cada declaração de nível superior é copiada para a arena assim que é
+        reconhecida, então só a declaração em andamento existe como NoAST
+        """
+        self.arena = ArenaAST()
+        try:
+            return self.analisar(tokens)
+        finally:
+            self.arena = None
+    
+    def analisar_incremental(self, tokens: Sequence) -> tuple[Optional[NoAST], List[Diagnostico]]:
+        """
+        Como analisar, mas reaproveita as declarações de nível superior da chamada
+        anterior cujos tokens não mudaram (lexemas, colunas e linhas relativas
+        iguais), mesmo que tenham mudado de linha; só as declarações tocadas por
+        uma edição são analisadas de novo. As subárvores reaproveitadas são as mesmas da AST
+        anterior, com as linhas atualizadas, então aquela AST não deve mais ser
+        usada; os erros retornados antes não mudam.
+        """
+        if not isinstance(tokens, Sequence):
+            tokens = list(tokens)
+        
+        self._trechos = {}
+        try:
+            ast, erros = self.analisar(tokens)
+            if ast is None:
+                self._trechos = {}
+            return ast, erros
+        finally:
+            self._trechos_anteriores = self._trechos
+            self._total_anterior = len(tokens)
+            self._trechos = None
+    
+    def _chave_trecho(self, inicio: int, fim: int) -> tuple:
+        """
+        Tokens inicio..fim (inclusive) como tuplas: lexema, coluna e linha relativa à
+        primeira (o tipo é determinado pelo lexema). Montada só com map em C, sem
+        laço Python por token
+        """
+        fatia = self.tokens[inicio:fim + 1]
+        linhas = map(_LINHA, fatia)
+        return (tuple(map(_LEXEMA_COLUNA, fatia)),
+                tuple(map(sub, linhas, repeat(fatia[0].linha))))
+    
+    def _declaracao_reaproveitada(self) -> Optional[TrechoSintatico]:
+        """
+        Declaração da análise anterior que começa no token atual, se houver
+        Candidatas: a que começava na mesma posição (edição depois dela) e a que
+        começava na posição deslocada pela variação do número de tokens (edição antes)
+        """
+        inicio = self.posicao
+        deslocamento = len(self.tokens) - self._total_anterior
+        for candidata in (inicio, inicio - deslocamento):
+            trecho = self._trechos_anteriores.get(candidata)
+            if trecho is None or inicio + trecho.tamanho >= len(self.tokens):
+                continue
+            if self._chave_trecho(inicio, inicio + trecho.tamanho) == trecho.chave:
+                # Cada subárvore entra uma única vez na nova AST
+                del self._trechos_anteriores[candidata]
+                return trecho
+            if not deslocamento:
+                break
+        return None
     
     def avancar(self):
         """Avança para o próximo token"""
-        if self.posicao < len(self.tokens) - 1:
+        if self.fluxo is not None:
+            proximo = next(self.fluxo, None)
+            if proximo is not None:
+                self.posicao += 1
+            self.token_atual = proximo
+        elif self.posicao < len(self.tokens) - 1:
             self.posicao += 1
             self.token_atual = self.tokens[self.posicao]
         else:
@@ -107,7 +441,7 @@ class AnalisadorSintatico:
             return True
         else:
             tipo_atual = self.token_atual.tipo.name if self.token_atual else "EOF"
-            self.erro(f"Esperado {tipo_esperado.name}, encontrado {tipo_atual}")
+            self.erro('token_esperado', tipo_esperado.name, tipo_atual)
             return False
     
     def pular_ate_token(self, tipos_alvo: List[TokenType]):
@@ -117,11 +451,11 @@ class AnalisadorSintatico:
                self.token_atual.tipo not in tipos_alvo):
             self.avancar()
     
-    def erro(self, mensagem: str):
-        """Adiciona um erro à lista"""
+    def erro(self, codigo: str, *argumentos):
+        """Adiciona um erro na posição do token atual (mensagem em diagnosticos.MENSAGENS)"""
         linha = self.token_atual.linha if self.token_atual else 0
         coluna = self.token_atual.coluna if self.token_atual else 0
-        self.erros.append(f"Linha: {linha:02d} - Coluna: {coluna:02d} - Erro Sintático: {mensagem}")
+        self.erros.append(Diagnostico(SINTATICO, ERRO, linha, coluna, codigo, argumentos))
     
     def sincronizar(self):
         """Sincroniza o parser após um erro"""
@@ -142,7 +476,7 @@ class AnalisadorSintatico:
         programa ::= 'RAINBOW' '.' declaracoes
         """
         if not self.verificar_token(TokenType.RAINBOW):
-            self.erro("Programa deve começar com 'RAINBOW'")
+            self.erro('inicio_programa')
             return None
         
         linha = self.token_atual.linha
@@ -155,21 +489,67 @@ class AnalisadorSintatico:
         
         # Criar nó do programa
         no_programa = NoAST(TipoNo.PROGRAMA, "RAINBOW", [], linha, coluna)
+        arena = self.arena
+        if arena is not None:
+            indice_programa = arena.acrescentar(no_programa)
         
         # Processar declarações
         while self.token_atual and self.token_atual.tipo != TokenType.EOF:
-            posicao_anterior = self.posicao
-            declaracao = self.declaracao()
+            if self._trechos is not None:
+                declaracao = self._declaracao_incremental()
+            else:
+                declaracao = self._declaracao_programa()
             if declaracao:
-                no_programa.filhos.append(declaracao)
-            
-            # Verificar se avançou para evitar loop infinito
-            if self.posicao == posicao_anterior:
-                self.erro(f"Token não processado: {self.token_atual.tipo.name}")
-                self.avancar()  # Forçar avanço para evitar loop infinito
+                if arena is not None:
+                    arena.anexar(indice_programa, declaracao)
+                else:
+                    no_programa.filhos.append(declaracao)
         
+        if arena is not None:
+            return arena.no(indice_programa)
         return no_programa
     
+    def _declaracao_programa(self) -> Optional[NoAST]:
+        """Uma declaração de nível superior, sempre consumindo ao menos um token"""
+        posicao_anterior = self.posicao
+        declaracao = self.declaracao()
+        
+        # Verificar se avançou para evitar loop infinito
+        if self.posicao == posicao_anterior:
+            self.erro('token_nao_processado', self.token_atual.tipo.name)
+            self.avancar()  # Forçar avanço para evitar loop infinito
+        
+        return declaracao
+    
+    def _declaracao_incremental(self) -> Optional[NoAST]:
+        """
+        Declaração de nível superior em analisar_incremental: reaproveitada da análise
+        anterior quando os tokens do trecho coincidem, senão analisada e guardada
+        """
+        inicio = self.posicao
+        linha = self.token_atual.linha
+        trecho = self._declaracao_reaproveitada()
+        
+        if trecho is not None:
+            if linha != trecho.linha:
+                trecho.erros = _deslocar_linhas(trecho.no, trecho.erros, linha - trecho.linha)
+                trecho.linha = linha
+            self.erros.extend(trecho.erros)
+            self.posicao = inicio + trecho.tamanho
+            self.token_atual = self.tokens[self.posicao]
+        else:
+            total_erros = len(self.erros)
+            declaracao = self._declaracao_programa()
+            if self.token_atual is None:
+                # Lista sem EOF: o último trecho não tem token seguinte para a chave
+                return declaracao
+            tamanho = self.posicao - inicio
+            trecho = TrechoSintatico(self._chave_trecho(inicio, self.posicao), tamanho, linha,
+                                     declaracao, self.erros[total_erros:])
+        
+        self._trechos[inicio] = trecho
+        return trecho.no
+    
     def declaracao(self) -> Optional[NoAST]:
         """
         declaracao ::= declaracao_variavel | atribuicao | condicional | laco | chamada_funcao
@@ -202,14 +582,14 @@ class AnalisadorSintatico:
                 return self.chamada_funcao()
             
             else:
-                self.erro(f"Declaração inválida: {self.token_atual.tipo.name}")
+                self.erro('declaracao_invalida', self.token_atual.tipo.name)
                 self.sincronizar()
                 if self.token_atual and self.token_atual.tipo == TokenType.FIM_LINHA:
                     self.avancar()
                 return None
                 
         except Exception as e:
-            self.erro(f"Erro na declaração: {str(e)}")
+            self.erro('erro_declaracao', str(e))
             self.sincronizar()
             if self.token_atual and self.token_atual.tipo == TokenType.FIM_LINHA:
                 self.avancar()
@@ -229,7 +609,7 @@ class AnalisadorSintatico:
         self.avancar()  # Consumir tipo
         
         if not self.verificar_token(TokenType.VARIAVEL):
-            self.erro("Esperado nome de variável após tipo")
+            self.erro('nome_variavel_esperado')
             return None
         
         nome_var = self.token_atual.lexema
@@ -350,7 +730,7 @@ class AnalisadorSintatico:
         self.avancar()  # Consumir 'para'
         
         if not self.verificar_token(TokenType.VARIAVEL):
-            self.erro("Esperado variável após 'para'")
+            self.erro('variavel_para_esperada')
             return None
         
         var_controle = self.token_atual.lexema
@@ -459,7 +839,7 @@ class AnalisadorSintatico:
         bloco ::= '{' declaracoes* '}'
         """
         if not self.verificar_token(TokenType.ABRE_CHAVES):
-            self.erro("Esperado '{' para início do bloco")
+            self.erro('abre_bloco_esperado')
             return None
         
         linha = self.token_atual.linha
@@ -484,17 +864,17 @@ class AnalisadorSintatico:
             
             # Verificar se avançou para evitar loop infinito
             if self.posicao == posicao_antes:
-                self.erro(f"Token não processado no bloco: {self.token_atual.tipo.name}")
+                self.erro('token_nao_processado_bloco', self.token_atual.tipo.name)
                 self.avancar()
             
             iteracoes += 1
         
         if iteracoes >= max_iteracoes:
-            self.erro("Limite de iterações atingido no bloco - possível loop infinito")
+            self.erro('limite_bloco')
         
         if self.token_atual and not self.verificar_token(TokenType.FECHA_CHAVES):
             if self.token_atual.tipo != TokenType.EOF:
-                self.erro("Esperado '}' para fechar o bloco")
+                self.erro('fecha_bloco_esperado')
         else:
             if self.verificar_token(TokenType.FECHA_CHAVES):
                 self.avancar()  # Consumir '}'
@@ -504,184 +884,92 @@ class AnalisadorSintatico:
         
         return no_bloco
     
-    def expressao(self) -> Optional[NoAST]:
-        """
-        expressao ::= expressao_ou
-        """
-        return self.expressao_ou()
-    
-    def expressao_ou(self) -> Optional[NoAST]:
-        """
-        expressao_ou ::= expressao_e ('OU' expressao_e)*
-        """
-        esquerda = self.expressao_e()
-        if not esquerda:
-            return None
-        
-        while self.verificar_token(TokenType.OPER_OU):
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_e()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_e(self) -> Optional[NoAST]:
-        """
-        expressao_e ::= expressao_igualdade ('E' expressao_igualdade)*
-        """
-        esquerda = self.expressao_igualdade()
-        if not esquerda:
-            return None
-        
-        while self.verificar_token(TokenType.OPER_E):
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_igualdade()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_igualdade(self) -> Optional[NoAST]:
-        """
-        expressao_igualdade ::= expressao_comparacao (('igual' | 'diferente') expressao_comparacao)*
-        """
-        esquerda = self.expressao_comparacao()
-        if not esquerda:
-            return None
-        
-        while self.verificar_token(TokenType.OPER_IGUAL) or self.verificar_token(TokenType.OPER_DIFERENTE):
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_comparacao()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_comparacao(self) -> Optional[NoAST]:
-        """
-        expressao_comparacao ::= expressao_adicao (('>' | '<' | '>=' | '<=') expressao_adicao)*
-        """
-        esquerda = self.expressao_adicao()
-        if not esquerda:
-            return None
-        
-        while self.token_atual and self.token_atual.tipo in [
-            TokenType.OPER_MAIOR, TokenType.OPER_MENOR, 
-            TokenType.OPER_MAIOR_IGUAL, TokenType.OPER_MENOR_IGUAL
-        ]:
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_adicao()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_adicao(self) -> Optional[NoAST]:
-        """
-        expressao_adicao ::= expressao_multiplicacao (('+' | '-') expressao_multiplicacao)*
-        """
-        esquerda = self.expressao_multiplicacao()
-        if not esquerda:
-            return None
-        
-        while self.verificar_token(TokenType.OPER_SOMA) or self.verificar_token(TokenType.OPER_SUBTRACAO):
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_multiplicacao()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_multiplicacao(self) -> Optional[NoAST]:
+    def expressao(self, precedencia_minima: int = 1) -> Optional[NoAST]:
         """
-        expressao_multiplicacao ::= expressao_unaria (('*' | '/' | '%') expressao_unaria)*
+        expressao      ::= unaria (operador_binario unaria)*
+        unaria         ::= ('NAO' | '-')* expressao_primaria
+        
+        Precedence climbing sobre PRECEDENCIA_BINARIA (OU < E < igualdade <
+        comparação < adição < multiplicação, todos associativos à esquerda), sem
+        recursão: cada expressão em andamento é um quadro [precedência mínima,
+        unários, esquerda, operador pendente] em uma pilha explícita, e um '(' ou
+        o argumento de ler() empilha um marcador até o ')' correspondente. Cadeias
+        longas e parênteses profundamente aninhados não esbarram no limite de
+        recursão.
         """
-        esquerda = self.expressao_unaria()
-        if not esquerda:
-            return None
-        
-        while self.token_atual and self.token_atual.tipo in [
-            TokenType.OPER_MULTIPLICACAO, TokenType.OPER_DIVISAO, TokenType.OPER_MODULO
-        ]:
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
+        pilha = []
+        precedencia_de = PRECEDENCIA_BINARIA.get
+        while True:
+            # Início de uma expressão: operadores unários prefixados e a primária
+            unarios = None
+            if self.token_atual and self.token_atual.tipo in OPERADORES_UNARIOS:
+                unarios = []
+                while self.token_atual and self.token_atual.tipo in OPERADORES_UNARIOS:
+                    unarios.append(self.token_atual)
+                    self.avancar()  # Consumir operador
+            pilha.append([precedencia_minima, unarios, None, None])
             
-            self.avancar()  # Consumir operador
-            
-            direita = self.expressao_unaria()
-            if not direita:
-                return None
-            
-            esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador, 
-                           [esquerda, direita], linha, coluna)
-        
-        return esquerda
-    
-    def expressao_unaria(self) -> Optional[NoAST]:
-        """
-        expressao_unaria ::= ('NAO' | '-') expressao_unaria | expressao_primaria
-        """
-        if self.verificar_token(TokenType.OPER_NAO) or self.verificar_token(TokenType.OPER_SUBTRACAO):
-            operador = self.token_atual.lexema
-            linha = self.token_atual.linha
-            coluna = self.token_atual.coluna
-            
-            self.avancar()  # Consumir operador
-            
-            expressao = self.expressao_unaria()
-            if not expressao:
-                return None
+            valor = self.expressao_primaria()
+            if valor.__class__ is tuple:
+                # '(' ou 'ler(' com argumento: a expressão interna começa do nível mais baixo
+                pilha.append(valor)
+                precedencia_minima = 1
+                continue
             
-            return NoAST(TipoNo.EXPRESSAO_UNARIA, operador, [expressao], linha, coluna)
-        
-        return self.expressao_primaria()
+            # Entregar o valor ao quadro do topo até precisar de um novo operando
+            while True:
+                topo = pilha[-1]
+                if topo.__class__ is tuple:
+                    pilha.pop()
+                    if topo is _GRUPO:
+                        if valor is not None and not self.consumir_token(TokenType.FECHA_PARENTESES):
+                            valor = None
+                    else:
+                        _, nome_funcao, linha, coluna = topo
+                        argumentos = [valor] if valor is not None else []
+                        valor = (NoAST(TipoNo.CHAMADA_FUNCAO, nome_funcao, argumentos, linha, coluna)
+                                 if self.consumir_token(TokenType.FECHA_PARENTESES) else None)
+                    continue
+                
+                minima, unarios, esquerda, operador = topo
+                if valor is None:
+                    pilha.pop()
+                    if not pilha:
+                        return None
+                    continue
+                
+                if operador is None:
+                    # Operadores unários aplicados de dentro para fora
+                    if unarios:
+                        for token in reversed(unarios):
+                            valor = NoAST(TipoNo.EXPRESSAO_UNARIA, token.lexema, [valor],
+                                          token.linha, token.coluna)
+                    esquerda = valor
+                else:
+                    esquerda = NoAST(TipoNo.EXPRESSAO_BINARIA, operador.lexema,
+                                     [esquerda, valor], operador.linha, operador.coluna)
+                
+                token = self.token_atual
+                precedencia = precedencia_de(token.tipo, 0) if token else 0
+                if precedencia >= minima:
+                    topo[2] = esquerda
+                    topo[3] = token
+                    self.avancar()  # Consumir operador
+                    precedencia_minima = precedencia + 1
+                    break
+                
+                pilha.pop()
+                if not pilha:
+                    return esquerda
+                valor = esquerda
     
-    def expressao_primaria(self) -> Optional[NoAST]:
+    def expressao_primaria(self) -> Union[NoAST, tuple, None]:
         """
         expressao_primaria ::= numero | texto | 'Verdadeiro' | 'Falso' | variavel | 
                               '(' expressao ')' | chamada_funcao_expr
+        
+        Literais, variáveis e ler() sem argumento viram nós. Depois de '(' ou de
+        'ler(' com argumento retorna o marcador que expressao empilha até o ')'
         """
         if not self.token_atual:
             return None
@@ -713,18 +1001,10 @@ class AnalisadorSintatico:
             self.avancar()
             return NoAST(TipoNo.VARIAVEL, nome, [], linha, coluna)
         
-        # Expressões parentizadas
+        # Expressões parentizadas: a expressão interna e o ')' ficam com expressao
         if self.verificar_token(TokenType.ABRE_PARENTESES):
             self.avancar()  # Consumir '('
-            
-            expr = self.expressao()
-            if not expr:
-                return None
-            
-            if not self.consumir_token(TokenType.FECHA_PARENTESES):
-                return None
-            
-            return expr
+            return _GRUPO
         
         # Chamadas de função em expressões (principalmente 'ler')
         if self.verificar_token(TokenType.LER):
@@ -734,21 +1014,15 @@ class AnalisadorSintatico:
             if not self.consumir_token(TokenType.ABRE_PARENTESES):
                 return None
             
-            argumentos = []
-            
-            # Verificar se há argumentos
+            # Com argumento, a expressão dele e o ')' ficam com expressao
             if not self.verificar_token(TokenType.FECHA_PARENTESES):
-                arg = self.expressao()
-                if arg:
-                    argumentos.append(arg)
-            
-            if not self.consumir_token(TokenType.FECHA_PARENTESES):
-                return None
+                return ('ler', nome_funcao, linha, coluna)
             
-            return NoAST(TipoNo.CHAMADA_FUNCAO, nome_funcao, argumentos, linha, coluna)
+            self.avancar()  # Consumir ')'
+            return NoAST(TipoNo.CHAMADA_FUNCAO, nome_funcao, [], linha, coluna)
         
         # Se chegou aqui, não reconheceu o token
-        self.erro(f"Expressão inválida: {self.token_atual.tipo.name}")
+        self.erro('expressao_invalida', self.token_atual.tipo.name)
         return None
     
     def gerar_relatorio_ast(self, ast: Optional[NoAST], arquivo_saida: str):
@@ -763,17 +1037,15 @@ class AnalisadorSintatico:
                 f.write("AST não foi gerada devido a erros.\n")
     
     def _escrever_ast(self, arquivo, no: NoAST, indentacao: int):
-        """Escreve um nó da AST no arquivo com indentação"""
-        indent = "  " * indentacao
-        arquivo.write(f"{indent}{no.tipo.name}")
-        
-        if no.valor:
-            arquivo.write(f": {no.valor}")
-        
-        arquivo.write(f" (L:{no.linha}, C:{no.coluna})\n")
-        
-        for filho in no.filhos:
-            self._escrever_ast(arquivo, filho, indentacao + 1)
+        """Escreve a subárvore de um nó no arquivo, um nó por linha com indentação"""
+        for atual, profundidade in iterar_ast(no):
+            indent = "  " * (indentacao + profundidade)
+            arquivo.write(f"{indent}{atual.tipo.name}")
+            
+            if atual.valor:
+                arquivo.write(f": {atual.valor}")
+            
+            arquivo.write(f" (L:{atual.linha}, C:{atual.coluna})\n")
     
     def exportar_ast_json(self, ast: Optional[NoAST], arquivo_saida: str):
         """Exporta AST em formato JSON"""
@@ -783,7 +1055,7 @@ class AnalisadorSintatico:
                 'total_erros': len(self.erros)
             },
             'ast': ast.to_dict() if ast else None,
-            'erros': self.erros
+            'erros': [str(erro) for erro in self.erros]
         }
         
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
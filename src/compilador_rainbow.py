@@ -22,6 +22,12 @@ except ImportError:
 class CompiladorRainbow:
     """Compilador principal da linguagem Rainbow"""
     
+    # A partir deste tamanho de código (em caracteres) os tokens ficam em TokensCompactos
+    # e a AST em uma ArenaAST
+    LIMITE_TOKENS_COMPACTOS = 1024 * 1024
+    # A partir deste tamanho a análise léxica é dividida entre processos
+    LIMITE_LEXICO_PARALELO = 50 * 1024 * 1024
+    
     def __init__(self):
         self.analisador_lexico = AnalisadorLexico()
         self.analisador_sintatico = AnalisadorSintatico()
@@ -56,7 +62,12 @@ class CompiladorRainbow:
         print("📋 Fase 1: Análise Léxica")
         print("-" * 40)
         
-        self.tokens, self.erros_lexicos = self.analisador_lexico.analisar(codigo_fonte)
+        if len(codigo_fonte) >= self.LIMITE_LEXICO_PARALELO:
+            self.tokens, self.erros_lexicos = self.analisador_lexico.analisar_paralelo(codigo_fonte)
+        elif len(codigo_fonte) >= self.LIMITE_TOKENS_COMPACTOS:
+            self.tokens, self.erros_lexicos = self.analisador_lexico.analisar_compacto(codigo_fonte)
+        else:
+            self.tokens, self.erros_lexicos = self.analisador_lexico.analisar(codigo_fonte)
         
         if self.erros_lexicos:
             print(f"❌ {len(self.erros_lexicos)} erro(s) léxico(s) encontrado(s):")
@@ -71,7 +82,10 @@ class CompiladorRainbow:
         print("\n🌳 Fase 2: Análise Sintática")
         print("-" * 40)
         
-        self.ast, self.erros_sintaticos = self.analisador_sintatico.analisar(self.tokens)
+        if len(codigo_fonte) >= self.LIMITE_TOKENS_COMPACTOS:
+            self.ast, self.erros_sintaticos = self.analisador_sintatico.analisar_compacto(self.tokens)
+        else:
+            self.ast, self.erros_sintaticos = self.analisador_sintatico.analisar(self.tokens)
         
         if self.erros_sintaticos:
             print(f"❌ {len(self.erros_sintaticos)} erro(s) sintático(s) encontrado(s):")
@@ -191,7 +205,7 @@ class CompiladorRainbow:
             'analise_lexica': {
                 'total_tokens': len(self.tokens) - 1,
                 'tokens': [token.to_dict() for token in self.tokens if token.tipo != TokenType.EOF],
-                'erros': self.erros_lexicos,
+                'erros': [str(erro) for erro in self.erros_lexicos],
                 'estatisticas': {
                     'total_linhas': self.analisador_lexico.stats['total_linhas'],
                     'total_caracteres': self.analisador_lexico.stats['total_caracteres'],
@@ -202,13 +216,13 @@ class CompiladorRainbow:
             },
             'analise_sintatica': {
                 'ast': self.ast.to_dict() if self.ast else None,
-                'erros': self.erros_sintaticos,
+                'erros': [str(erro) for erro in self.erros_sintaticos],
                 'sucesso': len(self.erros_sintaticos) == 0
             },
             'analise_semantica': {
                 'simbolos': [simbolo.to_dict() for simbolo in self.analisador_semantico.tabela_simbolos.obter_todos_simbolos()] if self.ast else [],
-                'erros': self.erros_semanticos,
-                'avisos': self.avisos_semanticos,
+                'erros': [str(erro) for erro in self.erros_semanticos],
+                'avisos': [str(aviso) for aviso in self.avisos_semanticos],
                 'sucesso': len(self.erros_semanticos) == 0
             },
             'resumo': {
@@ -0,0 +1,123 @@
+"""
+Diagnósticos das análises léxica, sintática e semântica da Linguagem Rainbow
+Cada erro ou aviso é um registro com fase, severidade, posição, código e os
+argumentos da mensagem; o texto só é montado quando um relatório é escrito
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+# Fases
+LEXICO = 'lexico'
+SINTATICO = 'sintatico'
+SEMANTICO = 'semantico'
+
+# Severidades
+ERRO = 'erro'
+AVISO = 'aviso'
+
+# Modelo da mensagem de cada código (preenchido com str.format(*argumentos))
+MENSAGENS = {
+    # Análise léxica
+    'chave_nao_fechada': "Chave aberta não foi fechada",
+    'chave_sem_par': "Chave de fechamento sem correspondente",
+    'string_nao_fechada': "String não fechada",
+    'string_muito_longa': "String muito longa (máximo {} caracteres)",
+    'escape_invalido': "Caractere de escape inválido '\\{}'",
+    'variavel_mal_formada': "Variável mal formada",
+    'variavel_muito_longa': "Nome de variável muito longo: {}...",
+    'numero_mal_formado': "Número mal formado",
+    'numero_muito_grande': "Número muito grande: {}",
+    'identificador_invalido': "Identificador inválido: {}",
+    'simbolo_nao_reconhecido': "Símbolo não reconhecido: '{}'",
+
+    # Análise sintática
+    'tokens_vazios': "Lista de tokens vazia",
+    'erro_interno_parser': "Erro interno do parser: {}",
+    'tokens_apos_fim': "Tokens inesperados após o fim do programa",
+    'token_esperado': "Esperado {}, encontrado {}",
+    'inicio_programa': "Programa deve começar com 'RAINBOW'",
+    'token_nao_processado': "Token não processado: {}",
+    'declaracao_invalida': "Declaração inválida: {}",
+    'erro_declaracao': "Erro na declaração: {}",
+    'nome_variavel_esperado': "Esperado nome de variável após tipo",
+    'variavel_para_esperada': "Esperado variável após 'para'",
+    'abre_bloco_esperado': "Esperado '{{' para início do bloco",
+    'token_nao_processado_bloco': "Token não processado no bloco: {}",
+    'limite_bloco': "Limite de iterações atingido no bloco - possível loop infinito",
+    'fecha_bloco_esperado': "Esperado '}}' para fechar o bloco",
+    'expressao_invalida': "Expressão inválida: {}",
+
+    # Análise semântica
+    'ast_ausente': "AST não fornecida para análise semântica",
+    'erro_interno_semantico': "Erro interno na análise semântica: {}",
+    'declaracao_mal_formada': "Declaração de variável mal formada",
+    'tipo_desconhecido': "Tipo '{}' não reconhecido",
+    'variavel_redeclarada': "Variável '{}' já foi declarada neste escopo",
+    'tipos_incompativeis': "Possível incompatibilidade de tipos - esperado '{}', encontrado '{}'",
+    'condicao_nao_logica': "Condição deve ser do tipo 'logico', encontrado '{}'",
+    'controle_nao_numerico': "Variável de controle '{}' deve ser do tipo 'numero'",
+    'limites_para_nao_numericos': "Expressões do laço 'para' devem ser do tipo 'numero'",
+    'condicao_enquanto_nao_logica': "Condição do 'enquanto' deve ser do tipo 'logico'",
+    'argumento_ler': "Argumento de 'ler' deve ser do tipo 'texto'",
+    'funcao_desconhecida': "Função '{}' não reconhecida",
+    'soma_incompativel': "Operador '+' requer tipos compatíveis",
+    'operandos_numero': "Operador '{}' requer operandos do tipo 'numero'",
+    'operandos_logico': "Operador '{}' requer operandos do tipo 'logico'",
+    'comparacao_tipos_diferentes': "Comparação entre tipos diferentes ('{}' e '{}')",
+    'menos_unario': "Operador '-' unário requer operando do tipo 'numero'",
+    'nao_unario': "Operador 'NAO' requer operando do tipo 'logico'",
+    'variavel_sem_declaracao': "Variável '{}' usada sem declaração explícita",
+    'variavel_nao_utilizada': "Variável '{}' declarada mas não utilizada",
+}
+
+# Rótulo que precede a mensagem no texto, por fase e severidade
+ROTULOS = {
+    (LEXICO, ERRO): "Erro",
+    (SINTATICO, ERRO): "Erro Sintático",
+    (SEMANTICO, ERRO): "Erro",
+    (SEMANTICO, AVISO): "Aviso",
+}
+
+
+@dataclass(slots=True)
+class Diagnostico:
+    """
+    Erro ou aviso de uma fase da compilação
+    Sem linha o diagnóstico não tem posição (ex.: erro interno); sem coluna só a
+    linha aparece no texto
+    """
+    fase: str
+    severidade: str
+    linha: Optional[int]
+    coluna: Optional[int]
+    codigo: str
+    argumentos: tuple = ()
+
+    @property
+    def mensagem(self) -> str:
+        return MENSAGENS[self.codigo].format(*self.argumentos)
+
+    def deslocado(self, delta: int) -> 'Diagnostico':
+        """Cópia com delta somado à linha; o original, que pode já ter sido retornado, não muda"""
+        if self.linha is None:
+            return self
+        return replace(self, linha=self.linha + delta)
+
+    def __str__(self):
+        if self.linha is None:
+            return self.mensagem
+        rotulo = ROTULOS[self.fase, self.severidade]
+        if self.coluna is None:
+            return f"Linha: {self.linha:02d} - {rotulo}: {self.mensagem}"
+        return f"Linha: {self.linha:02d} - Coluna: {self.coluna:02d} - {rotulo}: {self.mensagem}"
+
+    def to_dict(self):
+        return {
+            'fase': self.fase,
+            'severidade': self.severidade,
+            'linha': self.linha,
+            'coluna': self.coluna,
+            'codigo': self.codigo,
+            'mensagem': self.mensagem
+        }
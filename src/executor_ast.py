@@ -0,0 +1,230 @@
+"""
+Executor AST para a Linguagem Rainbow
+Executa programas percorrendo a AST produzida pelo analisador sintático,
+sem reprocessar o texto do código a cada iteração
+"""
+
+from typing import Any, Callable, Dict, Optional
+from analisador_sintatico import NoAST, TipoNo
+from operacoes_rainbow import (ErroExecucao, converter_literal, formatar_valor,
+                               OPERADORES_BINARIOS, OPERADORES_UNARIOS)
+from limites_execucao import OrcamentoExecucao
+from percurso_ast import iterar_ast
+
+# Tipos de nó das expressões em variáveis do módulo: ler um membro pela classe
+# do Enum (TipoNo.LITERAL) custa bem mais que ler uma variável global
+_LITERAL = TipoNo.LITERAL
+_VARIAVEL = TipoNo.VARIAVEL
+_BINARIA = TipoNo.EXPRESSAO_BINARIA
+_UNARIA = TipoNo.EXPRESSAO_UNARIA
+_CHAMADA = TipoNo.CHAMADA_FUNCAO
+# Expressões sem operandos
+FOLHAS = (_LITERAL, _VARIAVEL)
+
+
+class ExecutorAST:
+    """Interpretador que percorre a árvore sintática abstrata"""
+
+    def __init__(self, saida: Callable[[str], None], entrada: Callable[[str], Any],
+                 orcamento: Optional[OrcamentoExecucao] = None):
+        self.saida = saida      # Recebe o texto de cada mostrar()
+        self.entrada = entrada  # Atende as chamadas a ler()
+        # Limites da execução (passos, tempo, tamanho de textos, iterações de 'enquanto')
+        self.orcamento = orcamento if orcamento is not None else OrcamentoExecucao()
+        self.variaveis: Dict[str, Any] = {}
+        self._literais: Dict[int, Any] = {}
+        # '+' confere o tamanho dos textos concatenados quando há limite
+        self._binarios = {**OPERADORES_BINARIOS, '+': self.orcamento.somar}
+
+        # Tabelas de despacho por tipo de nó
+        self._comandos = {
+            TipoNo.PROGRAMA: self._executar_bloco,
+            TipoNo.BLOCO: self._executar_bloco,
+            TipoNo.DECLARACAO_VARIAVEL: self._executar_declaracao,
+            TipoNo.ATRIBUICAO: self._executar_atribuicao,
+            TipoNo.CONDICIONAL: self._executar_condicional,
+            TipoNo.LACO_PARA: self._executar_para,
+            TipoNo.LACO_ENQUANTO: self._executar_enquanto,
+            TipoNo.CHAMADA_FUNCAO: self._executar_chamada
+        }
+
+    def executar(self, ast: NoAST) -> Dict[str, Any]:
+        """
+        Executa o programa representado pela AST
+        Retorna o dicionário final de variáveis
+        """
+        self.variaveis = {}
+        self._literais = {}
+        self._preparar(ast)
+        self._executar_bloco(ast)
+        return self.variaveis
+
+    def _preparar(self, ast: NoAST):
+        """
+        Converte os literais uma única vez, antes da execução
+        O valor depende só do lexema, então a chave é o lexema e não a identidade
+        do nó (que muda a cada visão de uma ArenaAST)
+        """
+        literais = self._literais
+        for no, _ in iterar_ast(ast):
+            if no.tipo == TipoNo.LITERAL and no.valor not in literais:
+                literais[no.valor] = converter_literal(no.valor)
+
+    # Comandos
+
+    def _executar_bloco(self, no: NoAST):
+        """Executa as declarações de um bloco (ou do programa) em ordem"""
+        comandos = self._comandos
+        for filho in no.filhos:
+            try:
+                comandos[filho.tipo](filho)
+            except ErroExecucao as e:
+                if not e.linha:
+                    e.linha = filho.linha
+                raise
+            except Exception as e:
+                raise ErroExecucao(str(e), filho.linha)
+
+    def _executar_declaracao(self, no: NoAST):
+        """Declarações explícitas não criam valor em tempo de execução"""
+        pass
+
+    def _executar_atribuicao(self, no: NoAST):
+        self.variaveis[no.valor] = self._avaliar(no.filhos[0])
+
+    def _executar_condicional(self, no: NoAST):
+        """se / senaose / senao: filhos = [cond, bloco, (cond, bloco)*, bloco_senao?]"""
+        filhos = no.filhos
+        i = 0
+        while i + 1 < len(filhos):
+            if self._avaliar(filhos[i]):
+                self._executar_bloco(filhos[i + 1])
+                return
+            i += 2
+        if i < len(filhos):
+            self._executar_bloco(filhos[i])
+
+    def _executar_para(self, no: NoAST):
+        inicio = self._avaliar(no.filhos[0])
+        fim = self._avaliar(no.filhos[1])
+        passo = self._avaliar(no.filhos[2])
+        corpo = no.filhos[3]
+        nome_var = no.valor
+        passo_orcamento = self.orcamento.passo
+
+        valor_atual = inicio
+        while (passo > 0 and valor_atual <= fim) or (passo < 0 and valor_atual >= fim):
+            passo_orcamento()
+            self.variaveis[nome_var] = valor_atual
+            self._executar_bloco(corpo)
+            valor_atual += passo
+
+    def _executar_enquanto(self, no: NoAST):
+        condicao, corpo = no.filhos[0], no.filhos[1]
+        passo_orcamento = self.orcamento.passo
+        max_iteracoes = self.orcamento.max_iteracoes
+        iteracoes = 0
+
+        while self._avaliar(condicao) and iteracoes < max_iteracoes:
+            passo_orcamento()
+            self._executar_bloco(corpo)
+            iteracoes += 1
+
+        if iteracoes >= max_iteracoes:
+            self.orcamento.loop_infinito()
+
+    def _executar_chamada(self, no: NoAST):
+        if no.valor == "mostrar":
+            valor = self._avaliar(no.filhos[0]) if no.filhos else ""
+            self.saida(formatar_valor(valor))
+        else:
+            self._avaliar(no)
+
+    # Expressões
+
+    def _avaliar(self, no: NoAST) -> Any:
+        tipo = no.tipo
+        if tipo is _LITERAL:
+            return self._literais[no.valor]
+        if tipo is _VARIAVEL:
+            return self._avaliar_variavel(no)
+        if tipo is _BINARIA:
+            # Caso mais comum: operação entre duas folhas, sem montar as pilhas
+            esq, dir = no.filhos
+            if esq.tipo in FOLHAS and dir.tipo in FOLHAS and no.valor in self._binarios:
+                return self._binarios[no.valor](self._avaliar_folha(esq), self._avaliar_folha(dir))
+        return self._avaliar_composta(no)
+
+    def _avaliar_folha(self, no: NoAST) -> Any:
+        if no.tipo is _LITERAL:
+            return self._literais[no.valor]
+        return self._avaliar_variavel(no)
+
+    def _avaliar_variavel(self, no: NoAST) -> Any:
+        try:
+            return self.variaveis[no.valor]
+        except KeyError:
+            raise ErroExecucao(f"Variável {no.valor} não definida", no.linha)
+
+    def _avaliar_composta(self, raiz: NoAST) -> Any:
+        """
+        Avalia operações e chamadas com pilhas explícitas, sem recursão: cadeias de
+        operadores de qualquer comprimento aceitas pelo parser não esbarram no
+        limite de recursão do Python
+        pendentes: nós a avaliar e, em tuplas (no,), operações cujos operandos já
+        estão no topo de valores
+        """
+        literais = self._literais
+        variaveis = self.variaveis
+        binarios = self._binarios
+        valores = []
+        pendentes = [raiz]
+        while pendentes:
+            no = pendentes.pop()
+            if no.__class__ is tuple:
+                no = no[0]
+                tipo = no.tipo
+                if tipo is _BINARIA:
+                    operador = no.valor
+                    if operador == 'E' or operador == 'OU':
+                        # Curto-circuito: o esquerdo é o resultado, a menos que
+                        # seja verdadeiro em E ou falso em OU
+                        if (operador == 'E') == bool(valores[-1]):
+                            valores.pop()
+                            pendentes.append(no.filhos[1])
+                        continue
+                    dir = valores.pop()
+                    valores[-1] = binarios[operador](valores[-1], dir)
+                elif tipo is _UNARIA:
+                    valores[-1] = OPERADORES_UNARIOS[no.valor](valores[-1])
+                else:
+                    prompt = formatar_valor(valores.pop()) if no.filhos else ""
+                    valores.append(self.entrada(prompt))
+                continue
+
+            tipo = no.tipo
+            if tipo is _LITERAL:
+                valores.append(literais[no.valor])
+            elif tipo is _VARIAVEL:
+                try:
+                    valores.append(variaveis[no.valor])
+                except KeyError:
+                    raise ErroExecucao(f"Variável {no.valor} não definida", no.linha)
+            elif tipo is _BINARIA:
+                filhos = no.filhos
+                pendentes.append((no,))
+                if no.valor != 'E' and no.valor != 'OU':
+                    pendentes.append(filhos[1])
+                pendentes.append(filhos[0])
+            elif tipo is _UNARIA:
+                pendentes.append((no,))
+                pendentes.append(no.filhos[0])
+            elif tipo is _CHAMADA:
+                if no.valor != "ler":
+                    raise ErroExecucao(f"Função '{no.valor}' não pode ser usada em expressões", no.linha)
+                pendentes.append((no,))
+                if no.filhos:
+                    pendentes.append(no.filhos[0])
+            else:
+                raise ErroExecucao(f"Expressão não suportada: {tipo.name}", no.linha)
+        return valores[0]
@@ -0,0 +1,302 @@
+"""
+Gerador de Bytecode para a Linguagem Rainbow
+Traduz a AST em um vetor compacto de instruções (opcodes + operandos)
+executado pela máquina virtual de pilha
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum, auto
+from typing import Any, Dict, List, Optional, Tuple
+from analisador_sintatico import NoAST, TipoNo
+from operacoes_rainbow import converter_literal
+
+
+class OpCode(IntEnum):
+    """Instruções da máquina virtual"""
+    CONST = auto()              # empilha constantes[arg]
+    CARREGAR = auto()           # empilha a variável do slot arg
+    ARMAZENAR = auto()          # desempilha para a variável do slot arg
+    DESCARTAR = auto()          # remove o topo da pilha
+
+    SOMAR = auto()
+    SUBTRAIR = auto()
+    MULTIPLICAR = auto()
+    DIVIDIR = auto()
+    MODULO = auto()
+    MAIOR = auto()
+    MENOR = auto()
+    MAIOR_IGUAL = auto()
+    MENOR_IGUAL = auto()
+    IGUAL = auto()
+    DIFERENTE = auto()
+    NEGAR = auto()
+    NAO = auto()
+
+    SALTAR = auto()                     # pc = arg
+    SALTAR_SE_FALSO = auto()            # desempilha; salta se falso
+    SALTAR_SE_FALSO_OU_MANTER = auto()  # 'E': salta mantendo o topo se falso, senão desempilha
+    SALTAR_SE_VERDADEIRO_OU_MANTER = auto()  # 'OU': idem para verdadeiro
+
+    PARA_INICIAR = auto()       # desempilha passo, fim, início do laço lacos[arg]
+    PARA_TESTAR = auto()        # atribui a variável de controle ou sai do laço lacos[arg]
+    PARA_AVANCAR = auto()       # incrementa e volta ao teste do laço lacos[arg]
+    ENQUANTO_INICIAR = auto()   # zera o contador de iterações do laço lacos[arg]
+    ENQUANTO_CONTAR = auto()    # conta uma iteração do laço lacos[arg]
+    ENQUANTO_VERIFICAR = auto() # verifica o limite de iterações na saída do laço lacos[arg]
+
+    MOSTRAR = auto()            # desempilha e escreve na saída
+    LER = auto()                # desempilha o prompt e empilha a entrada
+    FIM = auto()
+
+
+# Operadores binários e unários indexados pelo lexema
+OPCODES_BINARIOS = {
+    '+': OpCode.SOMAR,
+    '-': OpCode.SUBTRAIR,
+    '*': OpCode.MULTIPLICAR,
+    '/': OpCode.DIVIDIR,
+    '%': OpCode.MODULO,
+    '>': OpCode.MAIOR,
+    '<': OpCode.MENOR,
+    '>=': OpCode.MAIOR_IGUAL,
+    '<=': OpCode.MENOR_IGUAL,
+    'igual': OpCode.IGUAL,
+    'diferente': OpCode.DIFERENTE
+}
+
+OPCODES_UNARIOS = {
+    '-': OpCode.NEGAR,
+    'NAO': OpCode.NAO
+}
+
+
+@dataclass
+class ProgramaBytecode:
+    """Programa compilado: instruções em vetores paralelos e tabelas auxiliares"""
+    codigo: array = field(default_factory=lambda: array('B'))
+    argumentos: array = field(default_factory=lambda: array('i'))
+    linhas: array = field(default_factory=lambda: array('I'))
+    constantes: List[Any] = field(default_factory=list)
+    # Nome da variável de cada slot (nomes[slot])
+    nomes: List[str] = field(default_factory=list)
+    # Laço i: (slot da variável de controle ou -1, pc do teste, pc da saída)
+    lacos: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.codigo)
+
+    def desmontar(self) -> str:
+        """Listagem legível das instruções (útil para depuração)"""
+        linhas_saida = []
+        for pc, (op, arg) in enumerate(zip(self.codigo, self.argumentos)):
+            opcode = OpCode(op)
+            detalhe = ""
+            if opcode == OpCode.CONST:
+                detalhe = f" ({self.constantes[arg]!r})"
+            elif opcode in (OpCode.CARREGAR, OpCode.ARMAZENAR):
+                detalhe = f" ({self.nomes[arg]})"
+            linhas_saida.append(f"{pc:04d} L{self.linhas[pc]:02d} {opcode.name} {arg}{detalhe}")
+        return "\n".join(linhas_saida)
+
+
+# Ações adiadas de _gerar_expressao
+_EMITIR = 'emitir'
+_SALTAR = 'saltar'
+_CORRIGIR = 'corrigir'
+
+
+class GeradorBytecode:
+    """Gera bytecode a partir de uma AST validada"""
+
+    def __init__(self):
+        self.programa = ProgramaBytecode()
+        self._indice_constantes: Dict[Tuple[type, Any], int] = {}
+        self._indice_nomes: Dict[str, int] = {}
+
+        self._comandos = {
+            TipoNo.PROGRAMA: self._gerar_bloco,
+            TipoNo.BLOCO: self._gerar_bloco,
+            TipoNo.DECLARACAO_VARIAVEL: self._gerar_declaracao,
+            TipoNo.ATRIBUICAO: self._gerar_atribuicao,
+            TipoNo.CONDICIONAL: self._gerar_condicional,
+            TipoNo.LACO_PARA: self._gerar_para,
+            TipoNo.LACO_ENQUANTO: self._gerar_enquanto,
+            TipoNo.CHAMADA_FUNCAO: self._gerar_chamada
+        }
+
+    def gerar(self, ast: NoAST, slots: Optional[Dict[str, int]] = None) -> ProgramaBytecode:
+        """
+        Traduz a AST completa e retorna o programa
+        slots: índices das variáveis resolvidos pela tabela de símbolos (opcional);
+        nomes ausentes recebem o próximo slot livre
+        """
+        self.programa = ProgramaBytecode()
+        self._indice_constantes = {}
+        self._indice_nomes = {}
+
+        for nome, _ in sorted((slots or {}).items(), key=lambda item: item[1]):
+            self._nome(nome)
+
+        self._comandos[ast.tipo](ast)
+        self._emitir(OpCode.FIM, 0, ast.linha)
+        return self.programa
+
+    # Utilitários
+
+    def _emitir(self, opcode: OpCode, argumento: int, linha: int) -> int:
+        """Acrescenta uma instrução e retorna sua posição"""
+        self.programa.codigo.append(opcode)
+        self.programa.argumentos.append(argumento)
+        self.programa.linhas.append(linha)
+        return len(self.programa.codigo) - 1
+
+    def _corrigir_salto(self, posicao: int, destino: int):
+        self.programa.argumentos[posicao] = destino
+
+    def _posicao_atual(self) -> int:
+        return len(self.programa.codigo)
+
+    def _constante(self, valor: Any) -> int:
+        # O tipo faz parte da chave para não confundir 1, 1.0 e Verdadeiro
+        chave = (type(valor), valor)
+        if chave not in self._indice_constantes:
+            self._indice_constantes[chave] = len(self.programa.constantes)
+            self.programa.constantes.append(valor)
+        return self._indice_constantes[chave]
+
+    def _nome(self, nome: str) -> int:
+        if nome not in self._indice_nomes:
+            self._indice_nomes[nome] = len(self.programa.nomes)
+            self.programa.nomes.append(nome)
+        return self._indice_nomes[nome]
+
+    def _novo_laco(self) -> int:
+        self.programa.lacos.append((-1, 0, 0))
+        return len(self.programa.lacos) - 1
+
+    # Comandos
+
+    def _gerar_bloco(self, no: NoAST):
+        for filho in no.filhos:
+            self._comandos[filho.tipo](filho)
+
+    def _gerar_declaracao(self, no: NoAST):
+        """Declarações explícitas não geram código"""
+        pass
+
+    def _gerar_atribuicao(self, no: NoAST):
+        self._gerar_expressao(no.filhos[0])
+        self._emitir(OpCode.ARMAZENAR, self._nome(no.valor), no.linha)
+
+    def _gerar_condicional(self, no: NoAST):
+        """se / senaose / senao: filhos = [cond, bloco, (cond, bloco)*, bloco_senao?]"""
+        filhos = no.filhos
+        saltos_fim = []
+        i = 0
+
+        while i + 1 < len(filhos):
+            self._gerar_expressao(filhos[i])
+            salto_proximo = self._emitir(OpCode.SALTAR_SE_FALSO, 0, filhos[i].linha)
+            self._gerar_bloco(filhos[i + 1])
+            saltos_fim.append(self._emitir(OpCode.SALTAR, 0, no.linha))
+            self._corrigir_salto(salto_proximo, self._posicao_atual())
+            i += 2
+
+        if i < len(filhos):
+            self._gerar_bloco(filhos[i])
+
+        for salto in saltos_fim:
+            self._corrigir_salto(salto, self._posicao_atual())
+
+    def _gerar_para(self, no: NoAST):
+        laco = self._novo_laco()
+        slot = self._nome(no.valor)
+
+        for expressao in no.filhos[:3]:
+            self._gerar_expressao(expressao)
+        self._emitir(OpCode.PARA_INICIAR, laco, no.linha)
+
+        teste = self._emitir(OpCode.PARA_TESTAR, laco, no.linha)
+        self._gerar_bloco(no.filhos[3])
+        self._emitir(OpCode.PARA_AVANCAR, laco, no.linha)
+
+        self.programa.lacos[laco] = (slot, teste, self._posicao_atual())
+
+    def _gerar_enquanto(self, no: NoAST):
+        laco = self._novo_laco()
+        self._emitir(OpCode.ENQUANTO_INICIAR, laco, no.linha)
+
+        inicio = self._posicao_atual()
+        self._gerar_expressao(no.filhos[0])
+        salto_saida = self._emitir(OpCode.SALTAR_SE_FALSO, 0, no.linha)
+        self._emitir(OpCode.ENQUANTO_CONTAR, laco, no.linha)
+        self._gerar_bloco(no.filhos[1])
+        self._emitir(OpCode.SALTAR, inicio, no.linha)
+
+        self._corrigir_salto(salto_saida, self._posicao_atual())
+        self._emitir(OpCode.ENQUANTO_VERIFICAR, laco, no.linha)
+        self.programa.lacos[laco] = (-1, inicio, self._posicao_atual())
+
+    def _gerar_chamada(self, no: NoAST):
+        if no.valor == "mostrar":
+            if no.filhos:
+                self._gerar_expressao(no.filhos[0])
+            else:
+                self._emitir(OpCode.CONST, self._constante(""), no.linha)
+            self._emitir(OpCode.MOSTRAR, 0, no.linha)
+        else:
+            self._gerar_expressao(no)
+            self._emitir(OpCode.DESCARTAR, 0, no.linha)
+
+    # Expressões
+
+    def _gerar_expressao(self, raiz: NoAST):
+        """
+        Gera o código da expressão em pós-ordem com uma pilha explícita, sem
+        recursão, para cadeias de operadores de qualquer comprimento
+        pendentes: nós a gerar e tuplas (ação, nó, argumento) executadas depois dos
+        operandos: _EMITIR emite o opcode do argumento; _SALTAR emite o salto de
+        curto-circuito de E/OU e agenda o operando direito e _CORRIGIR, que aponta
+        o salto para o fim da expressão
+        """
+        pendentes = [raiz]
+        while pendentes:
+            no = pendentes.pop()
+            if no.__class__ is tuple:
+                acao, no, argumento = no
+                if acao is _EMITIR:
+                    self._emitir(argumento, 0, no.linha)
+                elif acao is _SALTAR:
+                    salto = self._emitir(argumento, 0, no.linha)
+                    pendentes.append((_CORRIGIR, no, salto))
+                    pendentes.append(no.filhos[1])
+                else:
+                    self._corrigir_salto(argumento, self._posicao_atual())
+                continue
+
+            tipo = no.tipo
+            if tipo == TipoNo.LITERAL:
+                self._emitir(OpCode.CONST, self._constante(converter_literal(no.valor)), no.linha)
+            elif tipo == TipoNo.VARIAVEL:
+                self._emitir(OpCode.CARREGAR, self._nome(no.valor), no.linha)
+            elif tipo == TipoNo.EXPRESSAO_BINARIA:
+                operador = no.valor
+                if operador in ('E', 'OU'):
+                    # Operadores lógicos em curto-circuito
+                    opcode = (OpCode.SALTAR_SE_FALSO_OU_MANTER if operador == 'E'
+                              else OpCode.SALTAR_SE_VERDADEIRO_OU_MANTER)
+                    pendentes.append((_SALTAR, no, opcode))
+                else:
+                    pendentes.append((_EMITIR, no, OPCODES_BINARIOS[operador]))
+                    pendentes.append(no.filhos[1])
+                pendentes.append(no.filhos[0])
+            elif tipo == TipoNo.EXPRESSAO_UNARIA:
+                pendentes.append((_EMITIR, no, OPCODES_UNARIOS[no.valor]))
+                pendentes.append(no.filhos[0])
+            else:
+                pendentes.append((_EMITIR, no, OpCode.LER))
+                if no.filhos:
+                    pendentes.append(no.filhos[0])
+                else:
+                    self._emitir(OpCode.CONST, self._constante(""), no.linha)
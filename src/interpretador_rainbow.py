@@ -5,106 +5,299 @@ import json
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, NoAST
+from analisador_semantico import AnalisadorSemantico
+from executor_ast import ExecutorAST
+from gerador_bytecode import GeradorBytecode, ProgramaBytecode
+from maquina_virtual import MaquinaVirtual
+from transpilador_python import (TranspiladorPython, ExecutorPython, ProgramaPython, ErroTranspilacao,
+                                  CACHE_PROGRAMAS)
+from otimizador_ast import OtimizadorAST
+from operacoes_rainbow import ErroExecucao
+from limites_execucao import LimitesExecucao, OrcamentoExecucao, ResultadoExecucao
+from saida_programa import SaidaStreaming
+from diagnosticos import Diagnostico
+
+@dataclass
+class ResultadoCompilacao:
+    """Diagnósticos da verificação de compilação feita antes da execução"""
+    ast: Optional[NoAST] = None
+    erros_lexicos: List[Diagnostico] = field(default_factory=list)
+    erros_sintaticos: List[Diagnostico] = field(default_factory=list)
+    erros_semanticos: List[Diagnostico] = field(default_factory=list)
+    avisos: List[Diagnostico] = field(default_factory=list)
+    slots: Dict[str, int] = field(default_factory=dict)  # Slots das variáveis (motor 'vm')
+    # Análise semântica da AST; a anotação de tipos (semantico.tipos) é calculada
+    # só quando um motor a consulta
+    semantico: Optional[AnalisadorSemantico] = None
+    
+    # Erros de tipo resolvidos dinamicamente pelo interpretador
+    ERROS_TIPO_DINAMICO = frozenset({'operandos_numero', 'operandos_logico'})
+    
+    @property
+    def erros_criticos(self) -> List[Diagnostico]:
+        """Erros semânticos que impedem a execução"""
+        return [erro for erro in self.erros_semanticos if erro.codigo not in self.ERROS_TIPO_DINAMICO]
+    
+    @property
+    def diagnosticos(self) -> List[Diagnostico]:
+        """Erros de todas as fases seguidos dos avisos"""
+        return self.erros_lexicos + self.erros_sintaticos + self.erros_semanticos + self.avisos
+    
+    @property
+    def executavel(self) -> bool:
+        return not (self.erros_lexicos or self.erros_sintaticos or self.erros_criticos)
+
 
 class InterpretadorRainbow:
-    def __init__(self, ide_callback=None):
+    # Motores de execução disponíveis
+    MOTORES = ('python', 'ast', 'vm', 'linhas')
+    # Tempo máximo de uma execução pela linha de comando (interrompe loops infinitos)
+    TEMPO_MAXIMO_LINHA_COMANDO = 60.0
+    
+    def __init__(self, ide_callback=None, motor='python', cache_programas=None, limites=None,
+                 saida=None):
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor de execução desconhecido: {motor}")
         self.variaveis = {}
         self.ide_callback = ide_callback  # Para comunicação com a IDE
+        self.motor = motor
+        # Limites de cada execução e resultado estruturado da última execução
+        self.limites = limites if limites is not None else LimitesExecucao()
+        self.resultado = None
+        self.compilacao = None  # ResultadoCompilacao da última verificação
+        self.otimizacao = None  # OtimizadorAST da última execução (reescritas e estatísticas)
+        # Saída em fluxo: função, objeto com write() ou SaidaStreaming; sem ela a saída
+        # é acumulada em self.output e devolvida no fim da execução
+        if saida is not None and not isinstance(saida, SaidaStreaming):
+            saida = SaidaStreaming(saida)
+        self.saida = saida
+        self._orcamento = self._novo_orcamento()
+        # Programas compilados pelo motor 'python', indexados pelo hash do código
+        self.cache_programas = cache_programas if cache_programas is not None else CACHE_PROGRAMAS
         self.output = []
         self.input_requests = []
+        # Tabela de blocos do interpretador por linhas: (linhas, fechamentos, senaos)
+        self._mapa_blocos = None
         
     def executar_arquivo(self, arquivo_path):
         """Executa um arquivo Rainbow (.rainbow)"""
+        self.output = []
+        self._orcamento = self._novo_orcamento()
         try:
-            # Primeiro, compilar para verificar erros
-            if not self.compilar_arquivo(arquivo_path):
-                return False, "Erro na compilação. Verifique os erros."
-                
-            # Se passou na compilação, executar
             with open(arquivo_path, 'r', encoding='utf-8') as f:
                 codigo = f.read()
+            
+            # Programa já validado e compilado: dispensa análise e geração de código
+            if self.motor == 'python':
+                programa = self.cache_programas.obter(codigo, self._configuracao_cache())
+                if programa is not None:
+                    return self._executar_alvo(programa)
+            
+            # Primeiro, compilar para verificar erros
+            compilacao = self.compilar_codigo(codigo)
+            if not compilacao.executavel:
+                return self._concluir(False, "Erro na compilação. Verifique os erros.")
+                
+            # Se passou na compilação, executar reaproveitando a AST verificada
+            if self.motor == 'linhas':
+                return self.executar_codigo_linhas(codigo)
+            # Expressões constantes são calculadas uma vez e o código morto é removido antes da execução
+            self.otimizacao = OtimizadorAST(compilacao.semantico, self.limites.max_tamanho_texto)
+            self.otimizacao.otimizar(compilacao.ast)
+            if self.motor == 'python':
+                # Operações com operandos de tipo garantido dispensam verificações
+                programa = self._compilar_python(compilacao.ast, compilacao.semantico.tipos, compilacao.slots)
+                if isinstance(programa, ProgramaPython):
+                    self.cache_programas.armazenar(codigo, programa, self._configuracao_cache())
+                return self._executar_alvo(programa)
                 
-            return self.executar_codigo(codigo)
+            return self.executar_ast(compilacao.ast, compilacao.slots)
             
         except Exception as e:
-            return False, f"Erro ao executar arquivo: {str(e)}"
+            return self._concluir(False, f"Erro ao executar arquivo: {str(e)}")
+    
+    def programa_em_cache(self, codigo):
+        """Indica se o código já foi validado e compilado pelo motor 'python'"""
+        return (self.motor == 'python'
+                and self.cache_programas.obter(codigo, self._configuracao_cache()) is not None)
+    
+    def _configuracao_cache(self):
+        """Limites que mudam o código gerado: o otimizador só dobra textos até max_tamanho_texto"""
+        return f"max_tamanho_texto={self.limites.max_tamanho_texto}"
     
     def compilar_arquivo(self, arquivo_path):
         """Verifica se o arquivo compila sem erros críticos"""
         try:
-            import subprocess
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            compilador_path = os.path.join(base_dir, "src", "compilador_rainbow.py")
-            
-            result = subprocess.run([sys.executable, compilador_path, arquivo_path], 
-                                  capture_output=True, text=True)
-            
-            # Não bloquear baseado apenas no return code, pois erros semânticos 
-            # de tipo podem ser resolvidos pelo interpretador
-            # Continue para verificar quais tipos de erro
-                
-            # Verificar apenas erros léxicos e sintáticos críticos nos arquivos
-            base_name = arquivo_path.rsplit('.', 1)[0]
-            critical_error_files = [
-                base_name + ".errors",
-                base_name + ".syntax.errors"
-            ]
-            
-            for error_file in critical_error_files:
-                if os.path.exists(error_file):
-                    with open(error_file, 'r', encoding='utf-8') as f:
-                        content = f.read().strip()
-                        # Verificar se há erros reais (não apenas texto de cabeçalho)
-                        lines = content.split('\n')
-                        error_found = False
-                        for line in lines:
-                            if 'Erro' in line and 'Nenhum erro' not in line and 'ERROS SEMÂNTICOS' not in line:
-                                error_found = True
-                                break
-                        if error_found:
-                            return False
-            
-            # Para erros semânticos, verificar apenas erros críticos que impedem execução
-            semantic_error_file = base_name + ".semantic.errors"
-            if os.path.exists(semantic_error_file):
-                with open(semantic_error_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    lines = content.split('\n')
-                    for line in lines:
-                        # Apenas bloquear para erros críticos, não para problemas de tipo
-                        if ('Erro' in line and 'Nenhum erro' not in line):
-                            # Verificar se é erro crítico
-                            if ('não definida' in line or 'não declarada' in line):
-                                return False
-                            # Permitir erros de tipo que o interpretador pode resolver dinamicamente
-                            elif ('requer operandos do tipo' in line or 'incompatível' in line):
-                                continue  # Ignorar estes erros
-                            else:
-                                return False
-                            
-            # Se chegou aqui, pode prosseguir com a execução
-            return True
-            
+            with open(arquivo_path, 'r', encoding='utf-8') as f:
+                # Os tokens são lidos do arquivo à medida que o parser avança
+                erros_lexicos = []
+                tokens = AnalisadorLexico(estatisticas=False).analisar_fluxo(f, erros_lexicos)
+                return self._compilar(tokens, erros_lexicos).executavel
         except Exception as e:
             print(f"Erro na compilação: {e}")
             return False
     
+    def compilar_codigo(self, codigo):
+        """
+        Executa as análises léxica, sintática e semântica em memória
+        Retorna um ResultadoCompilacao (também guardado em self.compilacao)
+        """
+        tokens, erros_lexicos = AnalisadorLexico(estatisticas=False).analisar(codigo)
+        return self._compilar(tokens, erros_lexicos)
+    
+    def _compilar(self, tokens, erros_lexicos):
+        """Análises sintática e semântica sobre uma lista ou um fluxo de tokens"""
+        resultado = ResultadoCompilacao()
+        self.compilacao = resultado
+        
+        resultado.erros_lexicos = erros_lexicos
+        ast, resultado.erros_sintaticos = AnalisadorSintatico().analisar(tokens)
+        if not ast:
+            return resultado
+        
+        resultado.ast = ast
+        analisador = AnalisadorSemantico()
+        resultado.erros_semanticos, resultado.avisos = analisador.analisar(ast)
+        resultado.slots = analisador.tabela_simbolos.obter_slots()
+        resultado.semantico = analisador
+        return resultado
+    
     def executar_codigo(self, codigo):
+        """Executa código Rainbow com o motor configurado"""
+        if self.motor == 'linhas':
+            return self.executar_codigo_linhas(codigo)
+        
+        ast = self._gerar_ast(codigo)
+        if ast is None:
+            # Código que não passa na análise sintática segue pelo interpretador por linhas
+            return self.executar_codigo_linhas(codigo)
+        
+        return self.executar_ast(ast)
+    
+    def _gerar_ast(self, codigo):
+        """Gera a AST do código ou None se houver erros léxicos/sintáticos"""
+        tokens, erros_lexicos = AnalisadorLexico(estatisticas=False).analisar(codigo)
+        if erros_lexicos:
+            return None
+        
+        ast, erros_sintaticos = AnalisadorSintatico().analisar(tokens)
+        if erros_sintaticos:
+            return None
+        
+        return ast
+    
+    def executar_ast(self, ast, slots=None):
+        """
+        Executa uma AST já validada com o motor configurado
+        slots: índices das variáveis já resolvidos pela análise semântica (motor 'vm')
+        """
+        if self.motor == 'python':
+            # Transpilar para Python e compilar em um objeto de código
+            alvo = self._compilar_python(ast, None, slots)
+        elif self.motor == 'vm':
+            alvo = self._gerar_bytecode(ast, slots)
+        else:
+            alvo = ast
+        
+        return self._executar_alvo(alvo)
+    
+    def _gerar_bytecode(self, ast, slots=None):
+        """Compila a AST para a máquina virtual, com cada variável em um slot fixo"""
+        if slots is None:
+            analisador = AnalisadorSemantico()
+            analisador.analisar(ast)
+            slots = analisador.tabela_simbolos.obter_slots()
+        return GeradorBytecode().gerar(ast, slots)
+    
+    def _compilar_python(self, ast, tipos=None, slots=None):
+        """
+        Programa Python da AST ou, se o Python não compila o código gerado
+        (aninhamento além dos limites do compilador), bytecode da máquina virtual
+        """
+        try:
+            return TranspiladorPython(tipos).compilar(ast)
+        except ErroTranspilacao:
+            return self._gerar_bytecode(ast, slots)
+    
+    def _executar_alvo(self, alvo):
+        """Executa uma AST, bytecode ou programa Python com o executor correspondente"""
+        self.variaveis = {}
+        self.output = []
+        self._orcamento = self._novo_orcamento()
+        
+        if isinstance(alvo, ProgramaPython):
+            classe = ExecutorPython
+        elif isinstance(alvo, ProgramaBytecode):
+            classe = MaquinaVirtual
+        else:
+            classe = ExecutorAST
+        executor = classe(self._escrever_saida, self.solicitar_entrada, self._orcamento)
+        
+        try:
+            self.variaveis = executor.executar(alvo)
+        except ErroExecucao as e:
+            self.variaveis = executor.variaveis
+            return self._concluir(False, f"Erro na linha {e.linha}: {str(e)}", e.linha)
+        except Exception as e:
+            return self._concluir(False, f"Erro na execução: {str(e)}")
+        
+        return self._concluir(True, "\n".join(self.output))
+    
+    def _novo_orcamento(self):
+        """Orçamento de uma execução; a saída em fluxo é enviada nas verificações periódicas"""
+        periodico = self.saida.verificar_intervalo if self.saida is not None else None
+        return OrcamentoExecucao(self.limites, periodico)
+    
+    def _escrever_saida(self, texto):
+        """Recebe cada linha de mostrar(), contabilizando o limite de saída"""
+        self._orcamento.registrar_saida(texto)
+        if self.saida is not None:
+            self.saida.escrever(texto)
+        else:
+            self.output.append(texto)
+    
+    def _concluir(self, sucesso, mensagem, linha=0):
+        """Registra o resultado estruturado da execução e retorna (sucesso, mensagem)"""
+        if self.saida is not None:
+            self.saida.descarregar()
+        
+        orcamento = self._orcamento
+        self.resultado = ResultadoExecucao(
+            sucesso=sucesso,
+            saida="\n".join(self.output),
+            erro=None if sucesso else mensagem,
+            linha=linha,
+            limite=orcamento.limite_excedido,
+            passos=orcamento.passos_executados,
+            tempo=orcamento.tempo_decorrido,
+            bytes_saida=orcamento.bytes_saida
+        )
+        return sucesso, mensagem
+    
+    def executar_codigo_linhas(self, codigo):
         """Executa código Rainbow linha por linha"""
         try:
             self.variaveis = {}
             self.output = []
+            self._orcamento = self._novo_orcamento()
             
-            linhas = codigo.strip().split('\n')
+            linhas = [linha.strip() for linha in codigo.strip().split('\n')]
             
             # Verificar se começa com RAINBOW
-            if not linhas[0].strip().startswith("RAINBOW"):
-                return False, "Programa deve começar com RAINBOW."
+            if not linhas[0].startswith("RAINBOW"):
+                return self._concluir(False, "Programa deve começar com RAINBOW.")
+            
+            # Casar as chaves de todos os blocos uma única vez
+            self._mapear_blocos(linhas)
             
             # Executar linha por linha
             i = 1  # Pular linha RAINBOW
             while i < len(linhas):
-                linha = linhas[i].strip()
+                linha = linhas[i]
                 
                 # Pular comentários e linhas vazias
                 if not linha or linha.startswith('//'):
@@ -114,15 +307,15 @@ class InterpretadorRainbow:
                 try:
                     i = self.executar_linha(linha, linhas, i)
                 except Exception as e:
-                    return False, f"Erro na linha {i+1}: {str(e)}"
+                    return self._concluir(False, f"Erro na linha {i+1}: {str(e)}", i + 1)
                     
-            return True, "\n".join(self.output)
+            return self._concluir(True, "\n".join(self.output))
             
         except Exception as e:
-            return False, f"Erro na execução: {str(e)}"
+            return self._concluir(False, f"Erro na execução: {str(e)}")
     
-    def executar_linha(self, linha, linhas, indice_atual):
-        """Executa uma linha específica"""
+    def executar_linha(self, linha, linhas, indice_atual, fim=None):
+        """Executa uma linha específica; fim limita o bloco em execução"""
         linha = linha.rstrip('.')
         
         # Atribuição de variável
@@ -135,15 +328,15 @@ class InterpretadorRainbow:
             
         # Estrutura se
         elif linha.startswith('se ('):
-            return self.executar_se(linha, linhas, indice_atual)
+            return self.executar_se(linha, linhas, indice_atual, fim)
             
         # Estrutura enquanto
         elif linha.startswith('enquanto ('):
-            return self.executar_enquanto(linha, linhas, indice_atual)
+            return self.executar_enquanto(linha, linhas, indice_atual, fim)
             
         # Estrutura para
         elif linha.startswith('para '):
-            return self.executar_para(linha, linhas, indice_atual)
+            return self.executar_para(linha, linhas, indice_atual, fim)
             
         return indice_atual + 1
     
@@ -181,9 +374,9 @@ class InterpretadorRainbow:
         elif valor is None:
             valor = ""
             
-        self.output.append(str(valor))
+        self._escrever_saida(str(valor))
     
-    def executar_se(self, linha, linhas, indice):
+    def executar_se(self, linha, linhas, indice, fim=None):
         """Executa estrutura condicional se"""
         # Exemplo: se (#idade >= 18) {
         match = re.match(r'se \((.+)\) \{', linha)
@@ -193,47 +386,81 @@ class InterpretadorRainbow:
         condicao = match.group(1)
         resultado = self.avaliar_expressao(condicao)
         
-        # Encontrar o bloco correspondente
-        i = indice + 1
-        nivel = 1
-        bloco_se = []
-        bloco_senao = []
-        em_senao = False
-        
-        while i < len(linhas) and nivel > 0:
-            linha_atual = linhas[i].strip()
-            
-            if '{' in linha_atual:
-                nivel += linha_atual.count('{')
-            if '}' in linha_atual:
-                nivel -= linha_atual.count('}')
-                
-            if nivel == 1 and linha_atual == '} senao {':
-                em_senao = True
-                i += 1
-                continue
-                
-            if nivel > 0:
-                if em_senao:
-                    bloco_senao.append(linha_atual)
-                else:
-                    bloco_se.append(linha_atual)
-                    
-            i += 1
+        # Consultar o bloco correspondente na tabela de chaves
+        fim_bloco, senao, i = self._localizar_bloco(linhas, indice, fim)
         
         # Executar bloco apropriado
         if resultado:
-            self._executar_bloco(bloco_se)
-        else:
-            self._executar_bloco(bloco_senao)
+            self._executar_bloco(linhas, indice + 1, senao if senao is not None else fim_bloco)
+        elif senao is not None:
+            self._executar_bloco(linhas, senao + 1, fim_bloco)
         
         return i
     
-    def _executar_bloco(self, bloco_linhas):
-        """Executa um bloco de linhas de código"""
-        i = 0
-        while i < len(bloco_linhas):
-            linha = bloco_linhas[i].strip()
+    def _mapear_blocos(self, linhas):
+        """
+        Pré-processa as chaves de todas as linhas em uma única passada
+        fechamentos[k]: índice da linha após o bloco aberto na linha k (None se não fecha)
+        senaos[k]: linha '} senao {' do bloco aberto na linha k (ou None)
+        """
+        if self._mapa_blocos is not None and self._mapa_blocos[0] is linhas:
+            return self._mapa_blocos
+        
+        total = len(linhas)
+        # niveis[m]: saldo de chaves antes da linha m
+        niveis = [0] * (total + 1)
+        for m, linha in enumerate(linhas):
+            niveis[m + 1] = niveis[m] + linha.count('{') - linha.count('}')
+        
+        # O bloco aberto na linha k termina na primeira linha j > k em que o
+        # saldo fica abaixo do saldo antes de k + 1 (próximo menor elemento)
+        fechamentos = [None] * total
+        pendentes = []
+        for m in range(1, total + 1):
+            while pendentes and niveis[m] < niveis[pendentes[-1]]:
+                fechamentos[pendentes.pop() - 1] = m
+            pendentes.append(m)
+        
+        # '} senao {' mais próximo com o mesmo saldo do início do bloco
+        senaos = [None] * total
+        proximo_senao = {}
+        for k in range(total - 1, -1, -1):
+            senao = proximo_senao.get(niveis[k + 1])
+            if senao is not None and (fechamentos[k] is None or senao < fechamentos[k] - 1):
+                senaos[k] = senao
+            if linhas[k] == '} senao {':
+                proximo_senao[niveis[k + 1]] = k
+        
+        self._mapa_blocos = (linhas, fechamentos, senaos)
+        return self._mapa_blocos
+    
+    def _localizar_bloco(self, linhas, indice, fim=None):
+        """
+        Retorna (fim do conteúdo, linha do senao ou None, próxima linha)
+        do bloco aberto em linhas[indice], limitado ao bloco em execução
+        """
+        _, fechamentos, senaos = self._mapear_blocos(linhas)
+        if fim is None:
+            fim = len(linhas)
+        
+        fechamento = fechamentos[indice]
+        if fechamento is None or fechamento > fim:
+            # Bloco sem fechamento dentro do trecho em execução
+            fim_bloco = proxima = fim
+        else:
+            # A linha de fechamento não faz parte do conteúdo do bloco
+            fim_bloco, proxima = fechamento - 1, fechamento
+        senao = senaos[indice]
+        if senao is not None and senao >= fim_bloco:
+            senao = None
+        
+        return fim_bloco, senao, proxima
+    
+    def _executar_bloco(self, linhas, inicio, fim):
+        """Executa as linhas de código do intervalo [inicio, fim)"""
+        i = inicio
+        while i < fim:
+            linha = linhas[i]
             
             # Pular linhas vazias e fechamentos de bloco
             if not linha or linha == '}':
@@ -241,17 +468,12 @@ class InterpretadorRainbow:
                 continue
                 
             try:
-                novo_i = self.executar_linha(linha, bloco_linhas, i)
-                # Se executar_linha retornou um novo índice (estruturas de controle),
-                # usar esse índice. Caso contrário, incrementar normalmente.
-                if novo_i != i + 1:
-                    i = novo_i
-                else:
-                    i += 1
+                # Estruturas de controle retornam a linha após o seu bloco
+                i = self.executar_linha(linha, linhas, i, fim)
             except Exception as e:
-                raise Exception(f"Erro na execução do bloco, linha {i+1}: {str(e)}")
+                raise Exception(f"Erro na execução do bloco, linha {i - inicio + 1}: {str(e)}")
     
-    def executar_enquanto(self, linha, linhas, indice):
+    def executar_enquanto(self, linha, linhas, indice, fim=None):
         """Executa laço enquanto"""
         # Exemplo: enquanto (#i <= 10) {
         match = re.match(r'enquanto \((.+)\) \{', linha)
@@ -260,38 +482,24 @@ class InterpretadorRainbow:
             
         condicao = match.group(1)
         
-        # Encontrar o bloco
-        i = indice + 1
-        nivel = 1
-        bloco = []
-        
-        while i < len(linhas) and nivel > 0:
-            linha_atual = linhas[i].strip()
-            
-            if '{' in linha_atual:
-                nivel += linha_atual.count('{')
-            if '}' in linha_atual:
-                nivel -= linha_atual.count('}')
-                
-            if nivel > 0:
-                bloco.append(linha_atual)
-                
-            i += 1
+        # Consultar o bloco na tabela de chaves
+        fim_bloco, _, i = self._localizar_bloco(linhas, indice, fim)
         
         # Executar laço
-        max_iteracoes = 1000  # Prevenir loop infinito
+        max_iteracoes = self._orcamento.max_iteracoes  # Prevenir loop infinito
         iteracoes = 0
         
         while self.avaliar_expressao(condicao) and iteracoes < max_iteracoes:
-            self._executar_bloco(bloco)
+            self._orcamento.passo()
+            self._executar_bloco(linhas, indice + 1, fim_bloco)
             iteracoes += 1
             
         if iteracoes >= max_iteracoes:
-            raise Exception("Loop infinito detectado!")
+            self._orcamento.loop_infinito()
         
         return i
     
-    def executar_para(self, linha, linhas, indice):
+    def executar_para(self, linha, linhas, indice, fim=None):
         """Executa laço para"""
         # Exemplo: para #i de 1 ate 10 passo 1 {
         match = re.match(r'para (#\w+) de (.+) ate (.+) passo (.+) \{', linha)
@@ -300,32 +508,18 @@ class InterpretadorRainbow:
             
         var_nome = match.group(1)
         inicio = self.avaliar_expressao(match.group(2))
-        fim = self.avaliar_expressao(match.group(3))
+        limite = self.avaliar_expressao(match.group(3))
         passo = self.avaliar_expressao(match.group(4))
         
-        # Encontrar o bloco
-        i = indice + 1
-        nivel = 1
-        bloco = []
-        
-        while i < len(linhas) and nivel > 0:
-            linha_atual = linhas[i].strip()
-            
-            if '{' in linha_atual:
-                nivel += linha_atual.count('{')
-            if '}' in linha_atual:
-                nivel -= linha_atual.count('}')
-                
-            if nivel > 0:
-                bloco.append(linha_atual)
-                
-            i += 1
+        # Consultar o bloco na tabela de chaves
+        fim_bloco, _, i = self._localizar_bloco(linhas, indice, fim)
         
         # Executar laço
         valor_atual = inicio
-        while (passo > 0 and valor_atual <= fim) or (passo < 0 and valor_atual >= fim):
+        while (passo > 0 and valor_atual <= limite) or (passo < 0 and valor_atual >= limite):
+            self._orcamento.passo()
             self.variaveis[var_nome] = valor_atual
-            self._executar_bloco(bloco)
+            self._executar_bloco(linhas, indice + 1, fim_bloco)
             valor_atual += passo
         
         return i
@@ -430,7 +624,7 @@ class InterpretadorRainbow:
                         if op == '+':
                             # Se algum operando é string ou contém string, fazer concatenação
                             if isinstance(resultado, str) or isinstance(dir, str):
-                                resultado = str(resultado) + str(dir)
+                                resultado = self._orcamento.verificar_texto(str(resultado) + str(dir))
                             else:
                                 resultado = resultado + dir
                         else:
@@ -508,6 +702,10 @@ class InterpretadorRainbow:
     
     def solicitar_entrada(self, prompt):
         """Solicita entrada do usuário"""
+        # A saída pendente deve aparecer antes do prompt
+        if self.saida is not None:
+            self.saida.descarregar()
+        
         if self.ide_callback:
             return self.ide_callback(prompt)
         else:
@@ -519,17 +717,23 @@ class InterpretadorRainbow:
                 return ""
 
 def main():
-    if len(sys.argv) != 2:
-        print("Uso: python interpretador_rainbow.py <arquivo.rainbow>")
+    argumentos = sys.argv[1:]
+    motor = 'python'
+    if len(argumentos) == 3 and argumentos[0] == '--motor':
+        motor = argumentos[1]
+        argumentos = argumentos[2:]
+        
+    if len(argumentos) != 1 or motor not in InterpretadorRainbow.MOTORES:
+        print("Uso: python interpretador_rainbow.py [--motor python|ast|vm|linhas] <arquivo.rainbow>")
         sys.exit(1)
         
-    interpretador = InterpretadorRainbow()
-    sucesso, resultado = interpretador.executar_arquivo(sys.argv[1])
+    # A saída do programa é escrita no terminal à medida que é produzida
+    limites = LimitesExecucao(tempo_maximo=InterpretadorRainbow.TEMPO_MAXIMO_LINHA_COMANDO)
+    interpretador = InterpretadorRainbow(motor=motor, saida=sys.stdout, limites=limites)
+    print("=== EXECUÇÃO ===")
+    sucesso, resultado = interpretador.executar_arquivo(argumentos[0])
     
-    if sucesso:
-        print("=== EXECUÇÃO ===")
-        print(resultado)
-    else:
+    if not sucesso:
         print("=== ERRO ===")
         print(resultado)
 
@@ -0,0 +1,138 @@
+"""
+Limites de Execução da Linguagem Rainbow
+Orçamento de passos, prazo de tempo, volume de saída e tamanho de textos
+verificados pelos motores de execução, e o resultado estruturado de uma execução
+"""
+
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Optional
+from operacoes_rainbow import ErroExecucao, somar
+
+
+@dataclass
+class LimitesExecucao:
+    """
+    Limites de uma execução (None desativa o limite)
+    Um passo é uma iteração de laço ('para' ou 'enquanto'). O custo de uma
+    execução é limitado por max_passos e tempo_maximo; max_iteracoes, o antigo
+    limite fixo por 'enquanto', só vale quando configurado
+    """
+    max_passos: Optional[int] = None            # Iterações de laço no programa inteiro
+    tempo_maximo: Optional[float] = None        # Segundos de relógio por execução
+    max_bytes_saida: Optional[int] = None       # Bytes (UTF-8) escritos por mostrar()
+    max_tamanho_texto: Optional[int] = None     # Caracteres de cada texto criado pelo programa
+    max_iteracoes: Optional[int] = None         # Iterações de cada 'enquanto' (opcional)
+
+
+class ErroLimiteExecucao(ErroExecucao):
+    """Execução interrompida por exceder um dos limites"""
+
+    def __init__(self, limite: str, mensagem: str, linha: int = 0):
+        super().__init__(mensagem, linha)
+        self.limite = limite  # 'passos', 'tempo', 'saida', 'texto' ou 'iteracoes'
+
+
+@dataclass
+class ResultadoExecucao:
+    """Resultado estruturado de uma execução"""
+    sucesso: bool
+    saida: str = ""
+    erro: Optional[str] = None
+    linha: int = 0
+    limite: Optional[str] = None    # Limite excedido, se houver
+    passos: int = 0
+    tempo: float = 0.0
+    bytes_saida: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class OrcamentoExecucao:
+    """
+    Contabiliza o consumo de uma execução contra os LimitesExecucao
+
+    Os motores decrementam 'restante' a cada passo e só chamam verificar()
+    quando ele chega a zero, então o laço quente paga apenas um decremento
+    e um teste por iteração.
+    """
+
+    INTERVALO_VERIFICACAO = 1000  # Passos entre consultas ao relógio
+
+    def __init__(self, limites: Optional[LimitesExecucao] = None,
+                 periodico: Optional[Callable[[], None]] = None):
+        self.limites = limites if limites is not None else LimitesExecucao()
+        # Tarefa executada a cada verificação (ex.: enviar a saída pendente)
+        self.periodico = periodico
+        self.inicio = time.perf_counter()
+        self.prazo = (self.inicio + self.limites.tempo_maximo
+                      if self.limites.tempo_maximo is not None else None)
+        self.passos = 0
+        self.bytes_saida = 0
+        self.limite_excedido: Optional[str] = None
+        # Iterações permitidas por 'enquanto' (infinito quando desativado)
+        self.max_iteracoes = (self.limites.max_iteracoes
+                              if self.limites.max_iteracoes is not None else float('inf'))
+        # Concatenação usada pelos motores: só confere o tamanho se houver limite
+        self.somar = self._somar_limitado if self.limites.max_tamanho_texto is not None else somar
+
+        self._lote = 0
+        self.restante = self.verificar()
+
+    def verificar(self) -> int:
+        """Contabiliza o lote de passos consumido, confere os limites e retorna o próximo lote"""
+        self.passos += self._lote
+        self._lote = self.restante = 0
+        limites = self.limites
+
+        if limites.max_passos is not None and self.passos > limites.max_passos:
+            self._exceder('passos', f"Limite de passos excedido ({limites.max_passos})")
+        if self.prazo is not None and time.perf_counter() > self.prazo:
+            self._exceder('tempo', f"Tempo limite de execução excedido ({limites.tempo_maximo} s)")
+        if self.periodico is not None:
+            self.periodico()
+
+        lote = self.INTERVALO_VERIFICACAO
+        if limites.max_passos is not None:
+            lote = min(lote, limites.max_passos - self.passos + 1)
+        self._lote = lote
+        return lote
+
+    def passo(self):
+        """Conta um passo (para motores que não mantêm 'restante' em variável local)"""
+        self.restante -= 1
+        if not self.restante:
+            self.restante = self.verificar()
+
+    def loop_infinito(self):
+        self._exceder('iteracoes', "Loop infinito detectado!")
+
+    def registrar_saida(self, texto: str):
+        """Contabiliza uma linha escrita por mostrar()"""
+        self.bytes_saida += len(texto.encode('utf-8')) + 1
+        limite = self.limites.max_bytes_saida
+        if limite is not None and self.bytes_saida > limite:
+            self._exceder('saida', f"Limite de saída excedido ({limite} bytes)")
+
+    def verificar_texto(self, valor: Any) -> Any:
+        """Confere o tamanho de um texto criado pelo programa"""
+        limite = self.limites.max_tamanho_texto
+        if limite is not None and valor.__class__ is str and len(valor) > limite:
+            self._exceder('texto', f"Limite de tamanho de texto excedido ({limite} caracteres)")
+        return valor
+
+    def _somar_limitado(self, esq: Any, dir: Any) -> Any:
+        return self.verificar_texto(somar(esq, dir))
+
+    def _exceder(self, limite: str, mensagem: str):
+        self.limite_excedido = limite
+        raise ErroLimiteExecucao(limite, mensagem)
+
+    @property
+    def passos_executados(self) -> int:
+        return self.passos + self._lote - self.restante
+
+    @property
+    def tempo_decorrido(self) -> float:
+        return time.perf_counter() - self.inicio
@@ -0,0 +1,240 @@
+"""
+Máquina Virtual da Linguagem Rainbow
+Executa o bytecode produzido pelo gerador em um laço de despacho com pilha de operandos
+"""
+
+from typing import Any, Callable, Dict, Optional
+from gerador_bytecode import OpCode, ProgramaBytecode
+from limites_execucao import OrcamentoExecucao
+from operacoes_rainbow import (ErroExecucao, formatar_valor, subtrair, multiplicar,
+                               dividir, modulo, maior, menor, maior_igual, menor_igual,
+                               igual, diferente, negar)
+
+
+# Marca os slots de variáveis ainda não atribuídas
+INDEFINIDO = object()
+
+
+class MaquinaVirtual:
+    """Máquina virtual de pilha para programas Rainbow"""
+
+    def __init__(self, saida: Callable[[str], None], entrada: Callable[[str], Any],
+                 orcamento: Optional[OrcamentoExecucao] = None):
+        self.saida = saida      # Recebe o texto de cada mostrar()
+        self.entrada = entrada  # Atende as chamadas a ler()
+        # Limites da execução (passos, tempo, tamanho de textos, iterações de 'enquanto')
+        self.orcamento = orcamento if orcamento is not None else OrcamentoExecucao()
+        self.variaveis: Dict[str, Any] = {}
+
+    def executar(self, programa: ProgramaBytecode) -> Dict[str, Any]:
+        """
+        Executa o programa de bytecode
+        Retorna o dicionário final de variáveis
+        """
+        valores = [INDEFINIDO] * len(programa.nomes)
+        try:
+            self._executar(programa, valores)
+        finally:
+            # Reconstruir o dicionário de variáveis a partir dos slots
+            self.variaveis = {nome: valor for nome, valor in zip(programa.nomes, valores)
+                              if valor is not INDEFINIDO}
+        return self.variaveis
+
+    def _executar(self, programa: ProgramaBytecode, valores: list):
+        """Laço de despacho das instruções; variáveis ficam em valores[slot]"""
+        codigo = programa.codigo
+        argumentos = programa.argumentos
+        constantes = programa.constantes
+        nomes = programa.nomes
+        lacos = programa.lacos
+        saida = self.saida
+        orcamento = self.orcamento
+        verificar = orcamento.verificar
+        somar_textos = orcamento.somar
+        max_iteracoes = orcamento.max_iteracoes
+        restante = orcamento.restante  # Passos até a próxima verificação dos limites
+
+        # Estado dos laços: [valor, fim, passo] para 'para', contador para 'enquanto'
+        estado_lacos: list = [None] * len(lacos)
+
+        pilha: list = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+
+        # Opcodes como variáveis locais para um despacho mais rápido
+        CONST = OpCode.CONST.value
+        CARREGAR = OpCode.CARREGAR.value
+        ARMAZENAR = OpCode.ARMAZENAR.value
+        DESCARTAR = OpCode.DESCARTAR.value
+        SOMAR = OpCode.SOMAR.value
+        SUBTRAIR = OpCode.SUBTRAIR.value
+        MULTIPLICAR = OpCode.MULTIPLICAR.value
+        DIVIDIR = OpCode.DIVIDIR.value
+        MODULO = OpCode.MODULO.value
+        MAIOR = OpCode.MAIOR.value
+        MENOR = OpCode.MENOR.value
+        MAIOR_IGUAL = OpCode.MAIOR_IGUAL.value
+        MENOR_IGUAL = OpCode.MENOR_IGUAL.value
+        IGUAL = OpCode.IGUAL.value
+        DIFERENTE = OpCode.DIFERENTE.value
+        NEGAR = OpCode.NEGAR.value
+        NAO = OpCode.NAO.value
+        SALTAR = OpCode.SALTAR.value
+        SALTAR_SE_FALSO = OpCode.SALTAR_SE_FALSO.value
+        SALTAR_SE_FALSO_OU_MANTER = OpCode.SALTAR_SE_FALSO_OU_MANTER.value
+        SALTAR_SE_VERDADEIRO_OU_MANTER = OpCode.SALTAR_SE_VERDADEIRO_OU_MANTER.value
+        PARA_INICIAR = OpCode.PARA_INICIAR.value
+        PARA_TESTAR = OpCode.PARA_TESTAR.value
+        PARA_AVANCAR = OpCode.PARA_AVANCAR.value
+        ENQUANTO_INICIAR = OpCode.ENQUANTO_INICIAR.value
+        ENQUANTO_CONTAR = OpCode.ENQUANTO_CONTAR.value
+        ENQUANTO_VERIFICAR = OpCode.ENQUANTO_VERIFICAR.value
+        MOSTRAR = OpCode.MOSTRAR.value
+        LER = OpCode.LER.value
+        FIM = OpCode.FIM.value
+
+        pc = 0
+        try:
+            while True:
+                op = codigo[pc]
+                arg = argumentos[pc]
+                pc += 1
+
+                if op == CARREGAR:
+                    valor = valores[arg]
+                    if valor is INDEFINIDO:
+                        raise ErroExecucao(f"Variável {nomes[arg]} não definida")
+                    empilhar(valor)
+                elif op == CONST:
+                    empilhar(constantes[arg])
+                elif op == ARMAZENAR:
+                    valores[arg] = desempilhar()
+
+                # Aritmética: caminho rápido quando nenhum operando é texto
+                elif op == SOMAR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    if a.__class__ is str or b.__class__ is str:
+                        pilha[-1] = somar_textos(a, b)
+                    else:
+                        pilha[-1] = a + b
+                elif op == SUBTRAIR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = subtrair(a, b) if a.__class__ is str or b.__class__ is str else a - b
+                elif op == MULTIPLICAR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = multiplicar(a, b) if a.__class__ is str or b.__class__ is str else a * b
+                elif op == DIVIDIR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    if a.__class__ is str or b.__class__ is str:
+                        pilha[-1] = dividir(a, b)
+                    else:
+                        pilha[-1] = a / b if b != 0 else 0
+                elif op == MODULO:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    if a.__class__ is str or b.__class__ is str:
+                        pilha[-1] = modulo(a, b)
+                    else:
+                        pilha[-1] = a % b if b != 0 else 0
+
+                # Comparações: textos numéricos são convertidos pelas operações genéricas
+                elif op == MENOR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = menor(a, b) if a.__class__ is str or b.__class__ is str else a < b
+                elif op == MENOR_IGUAL:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = menor_igual(a, b) if a.__class__ is str or b.__class__ is str else a <= b
+                elif op == MAIOR:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = maior(a, b) if a.__class__ is str or b.__class__ is str else a > b
+                elif op == MAIOR_IGUAL:
+                    b = desempilhar()
+                    a = pilha[-1]
+                    pilha[-1] = maior_igual(a, b) if a.__class__ is str or b.__class__ is str else a >= b
+                elif op == IGUAL:
+                    b = desempilhar()
+                    pilha[-1] = igual(pilha[-1], b)
+                elif op == DIFERENTE:
+                    b = desempilhar()
+                    pilha[-1] = diferente(pilha[-1], b)
+
+                # Desvios
+                elif op == SALTAR_SE_FALSO:
+                    if not desempilhar():
+                        pc = arg
+                elif op == SALTAR:
+                    pc = arg
+                elif op == SALTAR_SE_FALSO_OU_MANTER:
+                    if pilha[-1]:
+                        desempilhar()
+                    else:
+                        pc = arg
+                elif op == SALTAR_SE_VERDADEIRO_OU_MANTER:
+                    if pilha[-1]:
+                        pc = arg
+                    else:
+                        desempilhar()
+
+                # Laço para
+                elif op == PARA_TESTAR:
+                    valor, fim, passo = estado_lacos[arg]
+                    if (passo > 0 and valor <= fim) or (passo < 0 and valor >= fim):
+                        restante -= 1
+                        if not restante:
+                            restante = verificar()
+                        valores[lacos[arg][0]] = valor
+                    else:
+                        pc = lacos[arg][2]
+                elif op == PARA_AVANCAR:
+                    estado = estado_lacos[arg]
+                    estado[0] += estado[2]
+                    pc = lacos[arg][1]
+                elif op == PARA_INICIAR:
+                    passo = desempilhar()
+                    fim = desempilhar()
+                    estado_lacos[arg] = [desempilhar(), fim, passo]
+
+                # Laço enquanto
+                elif op == ENQUANTO_CONTAR:
+                    if estado_lacos[arg] >= max_iteracoes:
+                        orcamento.loop_infinito()
+                    estado_lacos[arg] += 1
+                    restante -= 1
+                    if not restante:
+                        restante = verificar()
+                elif op == ENQUANTO_INICIAR:
+                    estado_lacos[arg] = 0
+                elif op == ENQUANTO_VERIFICAR:
+                    if estado_lacos[arg] >= max_iteracoes:
+                        orcamento.loop_infinito()
+
+                # Unários e E/S
+                elif op == NAO:
+                    pilha[-1] = not pilha[-1]
+                elif op == NEGAR:
+                    pilha[-1] = negar(pilha[-1])
+                elif op == MOSTRAR:
+                    saida(formatar_valor(desempilhar()))
+                elif op == LER:
+                    pilha[-1] = self.entrada(formatar_valor(pilha[-1]))
+                elif op == DESCARTAR:
+                    desempilhar()
+                elif op == FIM:
+                    return
+                else:
+                    raise ErroExecucao(f"Instrução desconhecida: {op}")
+        except ErroExecucao as e:
+            if not e.linha:
+                e.linha = programa.linhas[pc - 1]
+            raise
+        except Exception as e:
+            raise ErroExecucao(str(e), programa.linhas[pc - 1])
+        finally:
+            orcamento.restante = restante
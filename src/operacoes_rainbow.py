@@ -0,0 +1,141 @@
+"""
+Operações da Linguagem Rainbow
+Semântica dos operadores e conversões de valores compartilhada pelos motores de execução
+"""
+
+from typing import Any, Tuple
+
+
+class ErroExecucao(Exception):
+    """Erro em tempo de execução associado a uma linha do programa"""
+
+    def __init__(self, mensagem: str, linha: int = 0):
+        super().__init__(mensagem)
+        self.linha = linha
+
+
+def converter_literal(lexema: str) -> Any:
+    """Converte o lexema de um literal no valor Python correspondente"""
+    if lexema.startswith('"') and lexema.endswith('"'):
+        return lexema[1:-1]
+    if lexema == 'Verdadeiro':
+        return True
+    if lexema == 'Falso':
+        return False
+    if '.' in lexema:
+        return float(lexema)
+    return int(lexema)
+
+
+def formatar_valor(valor: Any) -> str:
+    """Converte um valor no texto exibido por mostrar()"""
+    if isinstance(valor, bool):
+        return "Verdadeiro" if valor else "Falso"
+    if valor is None:
+        return ""
+    return str(valor)
+
+
+def _para_numeros(esq: Any, dir: Any) -> Tuple[Any, Any]:
+    """Converte operandos de texto para números (operações aritméticas)"""
+    try:
+        if isinstance(esq, str):
+            esq = float(esq) if '.' in esq else int(esq)
+        if isinstance(dir, str):
+            dir = float(dir) if '.' in dir else int(dir)
+    except ValueError:
+        raise ErroExecucao(f"Não é possível converter para número: {esq} ou {dir}")
+    return esq, dir
+
+
+def _comparavel(valor: Any) -> Any:
+    """Converte textos numéricos para números antes de uma comparação"""
+    if isinstance(valor, str) and valor.replace('.', '').replace('-', '').isdigit():
+        try:
+            return float(valor) if '.' in valor else int(valor)
+        except ValueError:
+            return valor
+    return valor
+
+
+def somar(esq: Any, dir: Any) -> Any:
+    """Soma números ou concatena quando algum operando é texto"""
+    if isinstance(esq, str) or isinstance(dir, str):
+        return str(esq) + str(dir)
+    return esq + dir
+
+
+def subtrair(esq: Any, dir: Any) -> Any:
+    esq, dir = _para_numeros(esq, dir)
+    return esq - dir
+
+
+def multiplicar(esq: Any, dir: Any) -> Any:
+    esq, dir = _para_numeros(esq, dir)
+    return esq * dir
+
+
+def dividir(esq: Any, dir: Any) -> Any:
+    esq, dir = _para_numeros(esq, dir)
+    return esq / dir if dir != 0 else 0
+
+
+def modulo(esq: Any, dir: Any) -> Any:
+    esq, dir = _para_numeros(esq, dir)
+    return esq % dir if dir != 0 else 0
+
+
+def maior(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) > _comparavel(dir)
+
+
+def menor(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) < _comparavel(dir)
+
+
+def maior_igual(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) >= _comparavel(dir)
+
+
+def menor_igual(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) <= _comparavel(dir)
+
+
+def igual(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) == _comparavel(dir)
+
+
+def diferente(esq: Any, dir: Any) -> bool:
+    return _comparavel(esq) != _comparavel(dir)
+
+
+def negar(valor: Any) -> Any:
+    """Operador '-' unário"""
+    _, valor = _para_numeros(0, valor)
+    return -valor
+
+
+def nao(valor: Any) -> bool:
+    """Operador lógico NAO"""
+    return not valor
+
+
+# Operadores binários indexados pelo lexema (E/OU são avaliados em curto-circuito pelos motores)
+OPERADORES_BINARIOS = {
+    '+': somar,
+    '-': subtrair,
+    '*': multiplicar,
+    '/': dividir,
+    '%': modulo,
+    '>': maior,
+    '<': menor,
+    '>=': maior_igual,
+    '<=': menor_igual,
+    'igual': igual,
+    'diferente': diferente
+}
+
+OPERADORES_UNARIOS = {
+    '-': negar,
+    'NAO': nao
+}
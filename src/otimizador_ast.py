@@ -0,0 +1,382 @@
+"""
+Otimizador da AST Rainbow
+Roda depois do AnalisadorSemantico e reescreve a AST no lugar antes da execução:
+dobra expressões cujos operandos são literais, propaga variáveis atribuídas
+uma única vez com um valor constante, remove ramos e laços cuja condição é
+constante falsa e atribuições a variáveis que nunca são lidas
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from analisador_sintatico import NoAST, TipoNo
+from analisador_semantico import AnalisadorSemantico, AnotacaoTipos, TipoSimbolo
+from operacoes_rainbow import (ErroExecucao, OPERADORES_BINARIOS, OPERADORES_UNARIOS,
+                               converter_literal)
+from percurso_ast import iterar_ast, reduzir_ast
+
+# Operadores que não falham com operandos de qualquer tipo
+OPERADORES_SEGUROS = ('E', 'OU', 'NAO', 'igual', 'diferente')
+# Operadores que não falham com operandos numéricos ou lógicos: comparações e o '-'
+# unário. A aritmética binária fica de fora porque um inteiro enorme convertido
+# para float (divisão, ou operação com um float) levanta OverflowError
+OPERADORES_SEGUROS_NUMERICOS = ('>', '<', '>=', '<=', '-')
+TIPOS_SEGUROS = (TipoSimbolo.NUMERO, TipoSimbolo.LOGICO)
+
+
+@dataclass
+class Reescrita:
+    """Uma reescrita feita pelo otimizador: o trecho original e o literal que o substituiu"""
+    tipo: str       # 'dobramento', 'propagacao' ou 'remocao'
+    linha: int
+    coluna: int
+    original: str
+    resultado: str
+
+    def __str__(self):
+        return f"Linha: {self.linha:02d} - Coluna: {self.coluna:02d} - {self.original} → {self.resultado} ({self.tipo})"
+
+    def to_dict(self):
+        return {
+            'tipo': self.tipo,
+            'linha': self.linha,
+            'coluna': self.coluna,
+            'original': self.original,
+            'resultado': self.resultado
+        }
+
+
+def lexema_literal(valor) -> Optional[str]:
+    """
+    Lexema de literal que converter_literal transforma de volta no mesmo valor, ou
+    None se o valor não tem um (ex.: floats em notação científica)
+    """
+    if isinstance(valor, bool):
+        return 'Verdadeiro' if valor else 'Falso'
+    if isinstance(valor, str):
+        return f'"{valor}"'
+    lexema = repr(valor)
+    try:
+        convertido = converter_literal(lexema)
+    except ValueError:
+        return None
+    if convertido.__class__ is not valor.__class__ or convertido != valor:
+        return None
+    return lexema
+
+
+def _tipo_valor(valor) -> TipoSimbolo:
+    if isinstance(valor, bool):
+        return TipoSimbolo.LOGICO
+    if isinstance(valor, str):
+        return TipoSimbolo.TEXTO
+    return TipoSimbolo.NUMERO
+
+
+class OtimizadorAST:
+    """
+    Otimizações da AST que preservam a saída e os erros da execução (variáveis
+    que nunca são lidas podem deixar de ser atribuídas)
+    Usa a análise semântica da mesma AST: o número de escritas de cada variável
+    e a anotação de tipos, que é completada com os literais criados. As reescritas
+    ficam em self.reescritas e as contagens em self.estatisticas
+    """
+
+    def __init__(self, analisador: AnalisadorSemantico, max_tamanho_texto: Optional[int] = None):
+        self.analisador = analisador
+        # Textos maiores que o limite da execução não são dobrados: a concatenação
+        # fica para a execução, que a interrompe
+        self.max_tamanho_texto = max_tamanho_texto
+        self.reescritas: List[Reescrita] = []
+        self.estatisticas: Dict[str, int] = {}
+        # Nome -> lexema das variáveis constantes já atribuídas
+        self._constantes: Dict[str, str] = {}
+        self._tipos: AnotacaoTipos = AnotacaoTipos()
+
+    def otimizar(self, ast: NoAST) -> NoAST:
+        """
+        Otimiza a AST no lugar e retorna a raiz
+        Uma variável é constante quando a única escrita nela em todo o programa é uma
+        atribuição de nível superior cujo valor, já dobrado, é um literal. Como na
+        execução as variáveis não têm escopo, toda leitura dela em declarações de
+        nível superior posteriores vê esse valor e é trocada pelo literal
+        """
+        self.reescritas = []
+        self.estatisticas = {
+            'expressoes_dobradas': 0,
+            'leituras_propagadas': 0,
+            'variaveis_constantes': 0,
+            'ramos_removidos': 0,
+            'lacos_removidos': 0,
+            'atribuicoes_removidas': 0,
+            'declaracoes_removidas': 0
+        }
+        self._constantes = {}
+        # Só NoAST pode ser reescrita (as visões de uma ArenaAST são recriadas a cada acesso)
+        if not isinstance(ast, NoAST) or ast.tipo != TipoNo.PROGRAMA:
+            return ast
+
+        self._tipos = self.analisador.tipos
+        escritas = self.analisador.escritas_por_nome()
+        programa = []
+        for declaracao in ast.filhos:
+            # Um 'se' com condição constante pode virar o seu bloco ou desaparecer
+            for comando in self._comandos([reduzir_ast(declaracao, self._otimizar_no)]):
+                programa.append(comando)
+                if (comando.tipo == TipoNo.ATRIBUICAO and escritas.get(comando.valor) == 1
+                        and comando.filhos and comando.filhos[0].tipo == TipoNo.LITERAL):
+                    self._constantes[comando.valor] = comando.filhos[0].valor
+                    self.estatisticas['variaveis_constantes'] += 1
+        ast.filhos = programa
+        self._remover_atribuicoes(ast)
+        return ast
+
+    @staticmethod
+    def _comandos(comandos: List[Optional[NoAST]]) -> List[NoAST]:
+        """Comandos de um bloco depois da otimização: sem os removidos e com os blocos que restaram de um 'se' abertos"""
+        resultado = []
+        for comando in comandos:
+            if comando is None:
+                continue
+            if comando.tipo == TipoNo.BLOCO:
+                # Sem escopos na execução, o bloco pode ser aberto no bloco externo
+                resultado.extend(comando.filhos)
+            else:
+                resultado.append(comando)
+        return resultado
+
+    def _otimizar_no(self, no: NoAST, filhos: List[Optional[NoAST]]) -> Optional[NoAST]:
+        """
+        Combinação de reduzir_ast: o nó com os filhos já otimizados, o literal que o
+        substitui ou, para comandos, o bloco que o substitui ou None se ele foi removido
+        """
+        tipo = no.tipo
+        if tipo == TipoNo.BLOCO:
+            filhos = self._comandos(filhos)
+        if len(filhos) != len(no.filhos) or any(novo is not antigo for novo, antigo in zip(filhos, no.filhos)):
+            no.filhos = filhos
+
+        if tipo == TipoNo.VARIAVEL:
+            lexema = self._constantes.get(no.valor)
+            if lexema is not None:
+                self.estatisticas['leituras_propagadas'] += 1
+                return self._literal(no, 'propagacao', no.valor, lexema, converter_literal(lexema))
+        elif tipo == TipoNo.EXPRESSAO_BINARIA:
+            if len(filhos) == 2 and filhos[0].tipo == TipoNo.LITERAL:
+                if filhos[1].tipo == TipoNo.LITERAL:
+                    return self._dobrar_binaria(no, filhos[0].valor, filhos[1].valor)
+                if no.valor in ('E', 'OU'):
+                    return self._curto_circuito(no, filhos[0], filhos[1])
+        elif tipo == TipoNo.EXPRESSAO_UNARIA:
+            if len(filhos) == 1 and filhos[0].tipo == TipoNo.LITERAL:
+                return self._dobrar_unaria(no, filhos[0].valor)
+        elif tipo == TipoNo.CONDICIONAL:
+            return self._podar_condicional(no)
+        elif tipo == TipoNo.LACO_ENQUANTO:
+            condicao = filhos[0]
+            if condicao.tipo == TipoNo.LITERAL and not converter_literal(condicao.valor):
+                self.estatisticas['lacos_removidos'] += 1
+                self._removido(no, f"enquanto ({condicao.valor})")
+                return None
+        return no
+
+    def _podar_condicional(self, no: NoAST) -> Optional[NoAST]:
+        """
+        Remove os ramos cuja condição é um literal falso; um literal verdadeiro torna
+        o seu bloco o 'senao' e os ramos seguintes inalcançáveis. Sem nenhuma condição
+        restante, o 'se' é substituído pelo bloco que sempre executa (ou removido)
+        filhos = [cond, bloco, (cond, bloco)*, bloco_senao?]
+        """
+        filhos = no.filhos
+        ramos = []
+        senao = None
+        i = 0
+        while i + 1 < len(filhos):
+            condicao = filhos[i]
+            if condicao.tipo != TipoNo.LITERAL:
+                ramos += filhos[i:i + 2]
+            elif converter_literal(condicao.valor):
+                senao = filhos[i + 1]
+                for j in range(i + 2, len(filhos), 2):
+                    self._remover_ramo(filhos, j)
+                break
+            else:
+                self._remover_ramo(filhos, i)
+            i += 2
+        else:
+            if i < len(filhos):
+                senao = filhos[i]
+
+        if not ramos:
+            return senao
+        no.filhos = ramos + [senao] if senao is not None else ramos
+        return no
+
+    def _remover_ramo(self, filhos: List[NoAST], i: int):
+        """Registra a remoção do ramo que começa em filhos[i] (condição e bloco, ou o bloco do 'senao')"""
+        self.estatisticas['ramos_removidos'] += 1
+        if i + 1 < len(filhos):
+            self._removido(filhos[i], f"{'se' if i == 0 else 'senaose'} ({filhos[i].valor})")
+        else:
+            self._removido(filhos[i], "senao")
+
+    def _remover_atribuicoes(self, ast: NoAST):
+        """
+        Remove atribuições e declarações de variáveis que nenhuma expressão lê (as que
+        a análise semântica avisa como não utilizadas e as que deixaram de ser lidas com
+        a propagação). Uma atribuição só é removida se avaliar o valor não tem efeito
+        visível: sem chamadas de ler(), lendo só variáveis já atribuídas e sem operações
+        que possam falhar
+        """
+        lidas = {no.valor for no, _ in iterar_ast(ast) if no.tipo == TipoNo.VARIAVEL}
+        # Blocos a percorrer, com as variáveis certamente atribuídas antes deles
+        pilha = [(ast, frozenset())]
+        while pilha:
+            bloco, atribuidas = pilha.pop()
+            atribuidas = set(atribuidas)
+            comandos = []
+            for comando in bloco.filhos:
+                tipo = comando.tipo
+                if tipo == TipoNo.ATRIBUICAO:
+                    if comando.valor not in lidas and self._sem_efeitos(comando.filhos[0], atribuidas):
+                        self.estatisticas['atribuicoes_removidas'] += 1
+                        self._removido(comando, f"{comando.valor} recebe ...")
+                        continue
+                    atribuidas.add(comando.valor)
+                elif tipo == TipoNo.DECLARACAO_VARIAVEL:
+                    if comando.valor['nome'] not in lidas:
+                        self.estatisticas['declaracoes_removidas'] += 1
+                        self._removido(comando, f"{comando.valor['tipo']} {comando.valor['nome']}")
+                        continue
+                else:
+                    # Os blocos de 'se', 'para' e 'enquanto'; no corpo do 'para' a variável de controle já tem valor
+                    controle = {comando.valor} if tipo == TipoNo.LACO_PARA else set()
+                    for filho in comando.filhos:
+                        if filho.tipo == TipoNo.BLOCO:
+                            pilha.append((filho, frozenset(atribuidas | controle)))
+                comandos.append(comando)
+            if len(comandos) != len(bloco.filhos):
+                bloco.filhos = comandos
+
+    def _sem_efeitos(self, valor: NoAST, atribuidas: set) -> bool:
+        """
+        Se avaliar a expressão não lê entrada nem pode falhar: só literais,
+        variáveis já atribuídas, os OPERADORES_SEGUROS e, com operandos de tipo
+        garantido numérico ou lógico, comparações e '-' unário
+        """
+        for no, _ in iterar_ast(valor):
+            tipo = no.tipo
+            if tipo == TipoNo.CHAMADA_FUNCAO:
+                return False
+            if tipo == TipoNo.VARIAVEL:
+                if no.valor not in atribuidas:
+                    return False
+            elif tipo in (TipoNo.EXPRESSAO_BINARIA, TipoNo.EXPRESSAO_UNARIA):
+                if no.valor in OPERADORES_SEGUROS:
+                    continue
+                if (no.valor not in OPERADORES_SEGUROS_NUMERICOS
+                        or (no.valor == '-' and tipo == TipoNo.EXPRESSAO_BINARIA)
+                        or any(self._tipos.get(filho) not in TIPOS_SEGUROS for filho in no.filhos)):
+                    return False
+        return True
+
+    def _removido(self, no: NoAST, original: str):
+        self.reescritas.append(Reescrita('remocao', no.linha, no.coluna, original, 'removido'))
+
+    def _dobrar_binaria(self, no: NoAST, esq: str, dir: str) -> NoAST:
+        operador = no.valor
+        try:
+            valor_esq, valor_dir = converter_literal(esq), converter_literal(dir)
+            # E/OU devolvem um dos operandos, como nos motores de execução
+            if operador == 'E':
+                valor = valor_esq and valor_dir
+            elif operador == 'OU':
+                valor = valor_esq or valor_dir
+            elif operador in OPERADORES_BINARIOS:
+                valor = OPERADORES_BINARIOS[operador](valor_esq, valor_dir)
+            else:
+                return no
+        except (ErroExecucao, ArithmeticError, TypeError, ValueError):
+            # O erro fica para a execução, que o associa à linha do operador
+            return no
+        return self._dobrado(no, f"{esq} {operador} {dir}", valor)
+
+    def _curto_circuito(self, no: NoAST, esq: NoAST, dir: NoAST) -> NoAST:
+        """
+        E/OU com o operando esquerdo literal: os motores devolvem o próprio esquerdo
+        (falso em E, verdadeiro em OU) ou avaliam e devolvem o direito
+        """
+        if bool(converter_literal(esq.valor)) == (no.valor == 'OU'):
+            resultado, lexema = esq, esq.valor
+        else:
+            resultado, lexema = dir, '...'
+        self.estatisticas['expressoes_dobradas'] += 1
+        self.reescritas.append(Reescrita('dobramento', no.linha, no.coluna,
+                                         f"{esq.valor} {no.valor} ...", lexema))
+        return resultado
+
+    def _dobrar_unaria(self, no: NoAST, operando: str) -> NoAST:
+        operador = no.valor
+        if operador not in OPERADORES_UNARIOS:
+            return no
+        try:
+            valor = OPERADORES_UNARIOS[operador](converter_literal(operando))
+        except (ErroExecucao, ArithmeticError, TypeError, ValueError):
+            return no
+        return self._dobrado(no, f"{operador} {operando}", valor)
+
+    def _dobrado(self, no: NoAST, original: str, valor) -> NoAST:
+        """Literal com o valor da expressão, se houver lexema para ele"""
+        lexema = lexema_literal(valor)
+        if lexema is None:
+            return no
+        if (self.max_tamanho_texto is not None and isinstance(valor, str)
+                and len(valor) > self.max_tamanho_texto):
+            return no
+        self.estatisticas['expressoes_dobradas'] += 1
+        return self._literal(no, 'dobramento', original, lexema, valor)
+
+    def _literal(self, no: NoAST, tipo: str, original: str, lexema: str, valor) -> NoAST:
+        """Cria o literal na posição do nó, anotado com o tipo do valor"""
+        literal = NoAST(TipoNo.LITERAL, lexema, [], no.linha, no.coluna)
+        self._tipos[literal] = _tipo_valor(valor)
+        self.reescritas.append(Reescrita(tipo, no.linha, no.coluna, original, lexema))
+        return literal
+
+
+def main():
+    """Função principal para testar o otimizador"""
+    import sys
+    from analisador_lexico import AnalisadorLexico
+    from analisador_sintatico import AnalisadorSintatico
+
+    if len(sys.argv) < 2:
+        print("Uso: python otimizador_ast.py <arquivo.rainbow>")
+        return
+
+    try:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            codigo = f.read()
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{sys.argv[1]}' não encontrado")
+        return
+
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    ast, erros_sintaticos = AnalisadorSintatico().analisar(tokens)
+    if not ast:
+        print(f"❌ {len(erros_sintaticos)} erro(s) sintático(s)")
+        return
+
+    analisador = AnalisadorSemantico()
+    analisador.analisar(ast)
+    otimizador = OtimizadorAST(analisador)
+    otimizador.otimizar(ast)
+
+    print("=== OTIMIZAÇÃO ===")
+    for reescrita in otimizador.reescritas:
+        print(f"  {reescrita}")
+    for nome, total in otimizador.estatisticas.items():
+        print(f"{nome}: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Percursos da AST Rainbow com pilha explícita
+Nenhum percurso usa recursão, então a profundidade da árvore (blocos aninhados,
+cadeias longas de operadores) não esbarra no limite de recursão do Python.
+Funcionam com qualquer nó que tenha 'filhos' (NoAST ou NoArena).
+Em árvores rasas a pilha custa mais que a recursão (a análise semântica ficou
+15-20% mais lenta ao passar para estes percursos); por isso reduzir_ast trata à
+parte as expressões curtas, cujos filhos são todos folhas, e quem a chama pode
+dispensá-la para folhas.
+"""
+
+from types import GeneratorType
+from typing import Any, Callable, Iterator, Tuple
+
+
+def iterar_ast(raiz) -> Iterator[Tuple[Any, int]]:
+    """Pré-ordem: (nó, profundidade) de cada nó, com a raiz na profundidade 0"""
+    yield raiz, 0
+    # Um iterador de filhos por nível aberto
+    pilha = [iter(raiz.filhos)]
+    while pilha:
+        for no in pilha[-1]:
+            yield no, len(pilha)
+            filhos = no.filhos
+            if filhos:
+                pilha.append(iter(filhos))
+                break
+        else:
+            pilha.pop()
+
+
+def reduzir_ast(raiz, combinar: Callable[[Any, list], Any]) -> Any:
+    """
+    Pós-ordem: combinar(no, resultados) recebe a lista com o resultado de cada
+    filho, em ordem, e devolve o resultado do nó; retorna o resultado da raiz
+    """
+    filhos = raiz.filhos
+    if not filhos:
+        return combinar(raiz, [])
+
+    # Caso comum de expressões curtas: todos os filhos da raiz são folhas
+    pendentes = iter(filhos)
+    resultados = []
+    for filho in pendentes:
+        if filho.filhos:
+            break
+        resultados.append(combinar(filho, []))
+    else:
+        return combinar(raiz, resultados)
+
+    # Por nível aberto: (nó, iterador dos filhos restantes, resultados dos já visitados)
+    pilha = [(raiz, pendentes, resultados), (filho, iter(filho.filhos), [])]
+    while True:
+        no, pendentes, resultados = pilha[-1]
+        for filho in pendentes:
+            filhos = filho.filhos
+            if filhos:
+                pilha.append((filho, iter(filhos), []))
+                break
+            resultados.append(combinar(filho, []))
+        else:
+            pilha.pop()
+            resultado = combinar(no, resultados)
+            if not pilha:
+                return resultado
+            pilha[-1][2].append(resultado)
+
+
+def percorrer_ast(raiz, visitante: Callable[[Any], Any]) -> Any:
+    """
+    Percurso geral, para quem precisa agir entre um filho e outro
+    visitante(no) devolve o resultado do nó ou, quando precisa visitar filhos, um
+    gerador que faz yield de cada filho e recebe de volta o resultado dele; o
+    valor do return do gerador é o resultado do nó. Retorna o resultado da raiz.
+    """
+    resultado = visitante(raiz)
+    if resultado.__class__ is not GeneratorType:
+        return resultado
+
+    pilha = [resultado]
+    resultado = None
+    while pilha:
+        try:
+            filho = pilha[-1].send(resultado)
+        except StopIteration as fim:
+            pilha.pop()
+            resultado = fim.value
+            continue
+
+        resultado = visitante(filho)
+        if resultado.__class__ is GeneratorType:
+            pilha.append(resultado)
+            resultado = None
+
+    return resultado
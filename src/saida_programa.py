@@ -0,0 +1,62 @@
+"""
+Saída em Fluxo dos Programas Rainbow
+Encaminha as linhas de mostrar() para um destino (função ou arquivo) em lotes
+limitados, em vez de acumular toda a saída até o fim da execução
+"""
+
+import time
+from typing import Any, Callable, List, Union
+
+
+class SaidaStreaming:
+    """
+    Buffer limitado entre o programa e o destino da saída
+
+    O lote é enviado quando atinge max_linhas ou max_bytes, quando passam
+    'intervalo' segundos desde o último envio, antes de cada ler() e no fim
+    da execução.
+    """
+
+    def __init__(self, destino: Union[Callable[[str], Any], Any], max_linhas: int = 256,
+                 max_bytes: int = 64 * 1024, intervalo: float = 0.1):
+        # Destino: função que recebe o texto ou objeto com write() (ex.: sys.stdout)
+        if callable(destino):
+            self._enviar = destino
+            self._flush = None
+        elif hasattr(destino, 'write'):
+            self._enviar = destino.write
+            self._flush = getattr(destino, 'flush', None)
+        else:
+            raise TypeError("Destino da saída deve ser uma função ou um objeto com write()")
+
+        self.max_linhas = max_linhas
+        self.max_bytes = max_bytes
+        self.intervalo = intervalo
+        self._buffer: List[str] = []
+        self._bytes = 0
+        self._ultimo_envio = time.perf_counter()
+
+    def escrever(self, linha: str):
+        """Acrescenta uma linha de mostrar() ao lote"""
+        self._buffer.append(linha)
+        self._bytes += len(linha) + 1
+        if (len(self._buffer) >= self.max_linhas or self._bytes >= self.max_bytes
+                or time.perf_counter() - self._ultimo_envio >= self.intervalo):
+            self.descarregar()
+
+    def verificar_intervalo(self):
+        """Envia o lote pendente se o intervalo expirou (chamado periodicamente pelos motores)"""
+        if self._buffer and time.perf_counter() - self._ultimo_envio >= self.intervalo:
+            self.descarregar()
+
+    def descarregar(self):
+        """Envia imediatamente as linhas pendentes ao destino"""
+        self._ultimo_envio = time.perf_counter()
+        if not self._buffer:
+            return
+        texto = "\n".join(self._buffer) + "\n"
+        self._buffer = []
+        self._bytes = 0
+        self._enviar(texto)
+        if self._flush is not None:
+            self._flush()
@@ -0,0 +1,527 @@
+"""
+Transpilador Rainbow → Python
+Converte a AST validada em código Python, compila com compile() e mantém
+um cache de programas compilados indexado pelo hash do código fonte
+"""
+
+import hashlib
+import hmac
+import marshal
+import os
+import re
+import secrets
+import stat
+import sys
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional
+from analisador_sintatico import NoAST, TipoNo
+from analisador_semantico import AnotacaoTipos, TipoSimbolo
+from operacoes_rainbow import (ErroExecucao, converter_literal, formatar_valor, somar, subtrair,
+                               multiplicar, dividir, modulo, maior, menor, maior_igual,
+                               menor_igual, igual, diferente, negar)
+from limites_execucao import OrcamentoExecucao
+from percurso_ast import reduzir_ast
+
+
+# Nome de arquivo usado nos objetos de código (identifica os quadros do programa no traceback)
+ARQUIVO_PROGRAMA = '<rainbow>'
+
+# Versão do formato gerado; faz parte da chave do cache
+VERSAO_TRANSPILADOR = '3'
+
+
+def _faixa(inicio, fim, passo):
+    """Valores da variável de controle de um laço 'para'"""
+    if inicio.__class__ is int and fim.__class__ is int and passo.__class__ is int:
+        if passo > 0:
+            return range(inicio, fim + 1, passo)
+        if passo < 0:
+            return range(inicio, fim - 1, passo)
+        return ()
+    return _faixa_generica(inicio, fim, passo)
+
+
+def _faixa_generica(inicio, fim, passo):
+    valor = inicio
+    while (passo > 0 and valor <= fim) or (passo < 0 and valor >= fim):
+        yield valor
+        valor += passo
+
+
+# Funções disponíveis para o código gerado
+AMBIENTE_EXECUCAO = {
+    '__builtins__': {'locals': locals},
+    '_str': str,
+    '_somar': somar,
+    '_subtrair': subtrair,
+    '_multiplicar': multiplicar,
+    '_dividir': dividir,
+    '_modulo': modulo,
+    '_maior': maior,
+    '_menor': menor,
+    '_maior_igual': maior_igual,
+    '_menor_igual': menor_igual,
+    '_igual': igual,
+    '_diferente': diferente,
+    '_negar': negar,
+    '_formatar': formatar_valor,
+    '_faixa': _faixa
+}
+
+# Operador → (função genérica, expressão rápida para operandos não-texto)
+OPERACOES_PYTHON = {
+    '+': ('_somar', '{a} + {b}'),
+    '-': ('_subtrair', '{a} - {b}'),
+    '*': ('_multiplicar', '{a} * {b}'),
+    '/': ('_dividir', '({a} / {b} if {b} != 0 else 0)'),
+    '%': ('_modulo', '({a} % {b} if {b} != 0 else 0)'),
+    '>': ('_maior', '{a} > {b}'),
+    '<': ('_menor', '{a} < {b}'),
+    '>=': ('_maior_igual', '{a} >= {b}'),
+    '<=': ('_menor_igual', '{a} <= {b}'),
+    'igual': ('_igual', '{a} == {b}'),
+    'diferente': ('_diferente', '{a} != {b}')
+}
+
+# Tipos anotados cujos valores nunca são texto (dispensam a verificação do caminho rápido)
+TIPOS_NAO_TEXTO = (TipoSimbolo.NUMERO, TipoSimbolo.LOGICO)
+
+
+class ErroTranspilacao(Exception):
+    """
+    O código gerado não foi aceito por compile(): aninhamento de blocos ou de
+    parênteses além dos limites do compilador Python. O programa Rainbow é
+    válido e deve ser executado por outro motor
+    """
+
+
+@dataclass
+class ProgramaPython:
+    """Programa Rainbow compilado para um objeto de código Python"""
+    codigo: CodeType
+    nomes: List[str]           # Variável Rainbow de cada local v0, v1, ...
+    mapa_linhas: List[int]     # Linha Rainbow de cada linha do código gerado
+
+    def linha_rainbow(self, linha_python: int) -> int:
+        if 1 <= linha_python <= len(self.mapa_linhas):
+            return self.mapa_linhas[linha_python - 1]
+        return 0
+
+
+class TranspiladorPython:
+    """
+    Gera código Python equivalente a uma AST Rainbow
+    tipos: anotação de tipos do AnalisadorSemantico (AnalisadorSemantico.tipos) da
+    mesma AST; com ela, as operações cujos operandos têm tipo garantido são geradas
+    sem verificar em tempo de execução se algum operando é texto
+    """
+
+    def __init__(self, tipos: Optional[AnotacaoTipos] = None):
+        self._tipos: AnotacaoTipos = tipos if tipos is not None else AnotacaoTipos()
+        self._linhas: List[str] = []
+        self._mapa: List[int] = []
+        self._nomes: Dict[str, str] = {}
+        self._temporarias = 0
+
+        self._comandos = {
+            TipoNo.BLOCO: self._gerar_bloco,
+            TipoNo.DECLARACAO_VARIAVEL: self._gerar_declaracao,
+            TipoNo.ATRIBUICAO: self._gerar_atribuicao,
+            TipoNo.CONDICIONAL: self._gerar_condicional,
+            TipoNo.LACO_PARA: self._gerar_para,
+            TipoNo.LACO_ENQUANTO: self._gerar_enquanto,
+            TipoNo.CHAMADA_FUNCAO: self._gerar_chamada
+        }
+        self._expressoes = {
+            TipoNo.LITERAL: self._expr_literal,
+            TipoNo.VARIAVEL: self._expr_variavel,
+            TipoNo.EXPRESSAO_BINARIA: self._expr_binaria,
+            TipoNo.EXPRESSAO_UNARIA: self._expr_unaria,
+            TipoNo.CHAMADA_FUNCAO: self._expr_chamada
+        }
+
+    def transpilar(self, ast: NoAST) -> str:
+        """Retorna o código Python da função _programa(_saida, _entrada, _orcamento)"""
+        self._linhas = []
+        self._mapa = []
+        self._nomes = {}
+        self._temporarias = 0
+
+        self._escrever(0, "def _programa(_saida, _entrada, _orcamento):", ast.linha)
+        # Limites da execução; _restante conta os passos até a próxima verificação
+        self._escrever(1, "_verificar = _orcamento.verificar", ast.linha)
+        self._escrever(1, "_loop_infinito = _orcamento.loop_infinito", ast.linha)
+        self._escrever(1, "_max_iteracoes = _orcamento.max_iteracoes", ast.linha)
+        self._escrever(1, "_restante = _orcamento.restante", ast.linha)
+        self._gerar_corpo(ast, 1)
+        self._escrever(1, "return locals()", ast.linha)
+        return "\n".join(self._linhas) + "\n"
+
+    def compilar(self, ast: NoAST) -> ProgramaPython:
+        """
+        Transpila e compila a AST em um objeto de código
+        Levanta ErroTranspilacao se o Python não compila o código gerado (ex.: mais
+        de 20 laços aninhados ou cadeias de centenas de operadores)
+        """
+        fonte = self.transpilar(ast)
+        try:
+            codigo = compile(fonte, ARQUIVO_PROGRAMA, 'exec')
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise ErroTranspilacao(str(e)) from e
+        nomes = [''] * len(self._nomes)
+        for nome, local in self._nomes.items():
+            nomes[int(local[1:])] = nome
+        return ProgramaPython(codigo, nomes, list(self._mapa))
+
+    # Utilitários
+
+    def _escrever(self, nivel: int, codigo: str, linha: int):
+        self._linhas.append("    " * nivel + codigo)
+        self._mapa.append(linha)
+
+    def _local(self, nome: str) -> str:
+        """Nome da variável local Python que guarda a variável Rainbow"""
+        if nome not in self._nomes:
+            self._nomes[nome] = f"v{len(self._nomes)}"
+        return self._nomes[nome]
+
+    def _contar_passo(self, nivel: int, linha: int):
+        """Conta uma iteração de laço no orçamento da execução"""
+        self._escrever(nivel, "_restante -= 1", linha)
+        self._escrever(nivel, "if not _restante: _restante = _verificar()", linha)
+
+    def _temporaria(self) -> str:
+        self._temporarias += 1
+        return f"_t{self._temporarias}"
+
+    # Comandos
+
+    def _gerar_corpo(self, no: NoAST, nivel: int):
+        """Gera os comandos de um bloco; blocos vazios viram 'pass'"""
+        if not no.filhos:
+            self._escrever(nivel, "pass", no.linha)
+            return
+        for filho in no.filhos:
+            self._comandos[filho.tipo](filho, nivel)
+
+    def _gerar_bloco(self, no: NoAST, nivel: int):
+        self._gerar_corpo(no, nivel)
+
+    def _gerar_declaracao(self, no: NoAST, nivel: int):
+        self._escrever(nivel, "pass", no.linha)
+
+    def _gerar_atribuicao(self, no: NoAST, nivel: int):
+        self._escrever(nivel, f"{self._local(no.valor)} = {self._expr(no.filhos[0])}", no.linha)
+
+    def _gerar_condicional(self, no: NoAST, nivel: int):
+        """se / senaose / senao: filhos = [cond, bloco, (cond, bloco)*, bloco_senao?]"""
+        filhos = no.filhos
+        i = 0
+        while i + 1 < len(filhos):
+            palavra = "if" if i == 0 else "elif"
+            self._escrever(nivel, f"{palavra} {self._expr(filhos[i])}:", filhos[i].linha)
+            self._gerar_corpo(filhos[i + 1], nivel + 1)
+            i += 2
+        if i < len(filhos):
+            self._escrever(nivel, "else:", filhos[i].linha)
+            self._gerar_corpo(filhos[i], nivel + 1)
+
+    def _gerar_para(self, no: NoAST, nivel: int):
+        inicio, fim, passo = (self._expr(filho) for filho in no.filhos[:3])
+        self._escrever(nivel, f"for {self._local(no.valor)} in _faixa({inicio}, {fim}, {passo}):", no.linha)
+        self._contar_passo(nivel + 1, no.linha)
+        self._gerar_corpo(no.filhos[3], nivel + 1)
+
+    def _gerar_enquanto(self, no: NoAST, nivel: int):
+        contador = self._temporaria()
+        self._escrever(nivel, f"{contador} = 0", no.linha)
+        self._escrever(nivel, f"while {self._expr(no.filhos[0])}:", no.linha)
+        self._escrever(nivel + 1, f"if {contador} >= _max_iteracoes: _loop_infinito()", no.linha)
+        self._escrever(nivel + 1, f"{contador} += 1", no.linha)
+        self._contar_passo(nivel + 1, no.linha)
+        self._gerar_corpo(no.filhos[1], nivel + 1)
+        self._escrever(nivel, f"if {contador} >= _max_iteracoes: _loop_infinito()", no.linha)
+
+    def _gerar_chamada(self, no: NoAST, nivel: int):
+        if no.valor == "mostrar":
+            valor = self._expr(no.filhos[0]) if no.filhos else "''"
+            tipo = self._tipos.get(no.filhos[0]) if no.filhos else TipoSimbolo.TEXTO
+            if tipo is TipoSimbolo.TEXTO:
+                self._escrever(nivel, f"_saida({valor})", no.linha)
+            elif tipo is TipoSimbolo.NUMERO:
+                # Números garantidos nunca são lógicos: _formatar seria str()
+                self._escrever(nivel, f"_saida(_str({valor}))", no.linha)
+            else:
+                self._escrever(nivel, f"_saida(_formatar({valor}))", no.linha)
+        else:
+            self._escrever(nivel, self._expr(no), no.linha)
+
+    # Expressões
+
+    def _expr(self, no: NoAST) -> str:
+        """Código Python da expressão, montado em pós-ordem sem recursão"""
+        return reduzir_ast(no, self._combinar_expr)
+
+    def _combinar_expr(self, no: NoAST, operandos: List[str]) -> str:
+        return self._expressoes[no.tipo](no, operandos)
+
+    def _expr_literal(self, no: NoAST, operandos: List[str]) -> str:
+        return repr(converter_literal(no.valor))
+
+    def _expr_variavel(self, no: NoAST, operandos: List[str]) -> str:
+        return self._local(no.valor)
+
+    def _expr_binaria(self, no: NoAST, operandos: List[str]) -> str:
+        operador = no.valor
+        esq, dir = operandos
+
+        if operador == 'E':
+            return f"({esq} and {dir})"
+        if operador == 'OU':
+            return f"({esq} or {dir})"
+
+        generica, rapida = OPERACOES_PYTHON[operador]
+        tipo_esq = self._tipos.get(no.filhos[0])
+        tipo_dir = self._tipos.get(no.filhos[1])
+        if tipo_esq is TipoSimbolo.TEXTO or tipo_dir is TipoSimbolo.TEXTO:
+            # Algum operando é sempre texto: só a operação genérica serve
+            return f"{generica}({esq}, {dir})"
+        if tipo_esq in TIPOS_NAO_TEXTO and tipo_dir in TIPOS_NAO_TEXTO:
+            # Nenhum operando pode ser texto: caminho rápido sem verificação
+            if rapida.count('{b}') == 1:
+                return f"({rapida.format(a=f'({esq})', b=f'({dir})')})"
+            # A tupla avalia os operandos uma vez, na ordem
+            a, b = self._temporaria(), self._temporaria()
+            return f"({rapida.format(a=a, b=b)} if (({a} := {esq}), ({b} := {dir})) else 0)"
+
+        # Caminho rápido quando nenhum operando é texto; '|' avalia os dois lados
+        a, b = self._temporaria(), self._temporaria()
+        return (f"({generica}({a}, {b}) if ((({a} := {esq}).__class__ is _str) | "
+                f"(({b} := {dir}).__class__ is _str)) else {rapida.format(a=a, b=b)})")
+
+    def _expr_unaria(self, no: NoAST, operandos: List[str]) -> str:
+        operando = operandos[0]
+        if no.valor == 'NAO':
+            return f"(not {operando})"
+        if self._tipos.get(no.filhos[0]) is TipoSimbolo.NUMERO:
+            return f"(-{operando})"
+        return f"_negar({operando})"
+
+    def _expr_chamada(self, no: NoAST, operandos: List[str]) -> str:
+        prompt = operandos[0] if operandos else "''"
+        return f"_entrada(_formatar({prompt}))"
+
+
+class ExecutorPython:
+    """Executa programas compilados pelo TranspiladorPython"""
+
+    def __init__(self, saida: Callable[[str], None], entrada: Callable[[str], Any],
+                 orcamento: Optional[OrcamentoExecucao] = None):
+        self.saida = saida      # Recebe o texto de cada mostrar()
+        self.entrada = entrada  # Atende as chamadas a ler()
+        # Limites da execução (passos, tempo, tamanho de textos, iterações de 'enquanto')
+        self.orcamento = orcamento if orcamento is not None else OrcamentoExecucao()
+        self.variaveis: Dict[str, Any] = {}
+
+    def executar(self, programa: ProgramaPython) -> Dict[str, Any]:
+        """
+        Executa o programa compilado
+        Retorna o dicionário final de variáveis
+        """
+        self.variaveis = {}
+        ambiente = dict(AMBIENTE_EXECUCAO)
+        ambiente['_somar'] = self.orcamento.somar
+        exec(programa.codigo, ambiente)
+
+        try:
+            locais = ambiente['_programa'](self.saida, self.entrada, self.orcamento)
+        except Exception as e:
+            raise self._converter_erro(programa, e)
+        self.orcamento.restante = locais['_restante']
+
+        for indice, nome in enumerate(programa.nomes):
+            local = f"v{indice}"
+            if local in locais:
+                self.variaveis[nome] = locais[local]
+        return self.variaveis
+
+    def _converter_erro(self, programa: ProgramaPython, erro: Exception) -> ErroExecucao:
+        """Associa o erro à linha Rainbow e recupera o contador de passos do programa"""
+        quadro = None
+        tb = erro.__traceback__
+        while tb is not None:
+            # Quadro mais interno do programa no traceback
+            if tb.tb_frame.f_code.co_filename == ARQUIVO_PROGRAMA:
+                quadro = tb
+            tb = tb.tb_next
+
+        linha = 0
+        if quadro is not None:
+            linha = programa.linha_rainbow(quadro.tb_lineno)
+            self.orcamento.restante = quadro.tb_frame.f_locals.get('_restante', self.orcamento.restante)
+
+        if isinstance(erro, ErroExecucao):
+            if not erro.linha:
+                erro.linha = linha
+            return erro
+        if isinstance(erro, NameError):
+            # Variável lida antes de qualquer atribuição
+            return ErroExecucao(f"Variável {self._variavel_erro(programa, erro)} não definida", linha)
+        return ErroExecucao(str(erro), linha)
+
+    def _variavel_erro(self, programa: ProgramaPython, erro: Exception) -> str:
+        match = re.search(r"'v(\d+)'", str(erro))
+        if match and int(match.group(1)) < len(programa.nomes):
+            return programa.nomes[int(match.group(1))]
+        return "?"
+
+
+class CacheProgramas:
+    """
+    Cache de programas compilados indexado pelo hash do código fonte e da
+    configuração que afeta a geração de código (ex.: o limite de tamanho de texto
+    com que o otimizador dobrou as constantes)
+    Em memória por padrão. O cache em disco é opcional: como carregar um arquivo
+    executa o objeto de código nele, só são lidos arquivos de um diretório do
+    próprio usuário sem escrita para o grupo e os demais, e cada arquivo leva um
+    HMAC com uma chave secreta (chave_mac ou o arquivo 'chave' do diretório,
+    criado com permissão 0600). Sem como verificar o dono (fora do POSIX), o
+    cache em disco fica desativado
+    """
+
+    def __init__(self, diretorio: Optional[str] = None, chave_mac: Optional[bytes] = None):
+        self.diretorio = diretorio  # None: só em memória
+        self._chave_mac = chave_mac
+        self._memoria: Dict[str, ProgramaPython] = {}
+
+    @staticmethod
+    def chave(codigo: str, configuracao: str = '') -> str:
+        conteudo = f"{VERSAO_TRANSPILADOR}\0{configuracao}\0{codigo}".encode('utf-8')
+        return hashlib.sha256(conteudo).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.{sys.implementation.cache_tag}.rbc")
+
+    def obter(self, codigo: str, configuracao: str = '') -> Optional[ProgramaPython]:
+        """Retorna o programa compilado para o código com a configuração ou None"""
+        chave = self.chave(codigo, configuracao)
+        programa = self._memoria.get(chave)
+        if programa is not None or not self.diretorio:
+            return programa
+
+        chave_mac = self._obter_chave_mac(criar=False)
+        if chave_mac is None:
+            return None
+        try:
+            conteudo = _ler_arquivo_privado(self._caminho(chave), publico=True)
+            if conteudo is None or len(conteudo) < TAMANHO_MAC:
+                return None
+            mac, dados = conteudo[:TAMANHO_MAC], conteudo[TAMANHO_MAC:]
+            if not hmac.compare_digest(mac, self._mac(chave_mac, chave, dados)):
+                return None
+            codigo_objeto, nomes, mapa_linhas = marshal.loads(dados)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        programa = ProgramaPython(codigo_objeto, list(nomes), list(mapa_linhas))
+        self._memoria[chave] = programa
+        return programa
+
+    def armazenar(self, codigo: str, programa: ProgramaPython, configuracao: str = ''):
+        """Guarda o programa em memória e, se configurado, em disco"""
+        chave = self.chave(codigo, configuracao)
+        self._memoria[chave] = programa
+        if not self.diretorio:
+            return
+
+        try:
+            os.makedirs(self.diretorio, mode=0o700, exist_ok=True)
+            chave_mac = self._obter_chave_mac(criar=True)
+            if chave_mac is None:
+                return
+            dados = marshal.dumps((programa.codigo, programa.nomes, programa.mapa_linhas))
+            caminho = self._caminho(chave)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(self._mac(chave_mac, chave, dados) + dados)
+            os.replace(temporario, caminho)
+        except (OSError, ValueError):
+            pass  # O cache em disco é apenas uma otimização
+
+    def limpar(self):
+        self._memoria.clear()
+
+    @staticmethod
+    def _mac(chave_mac: bytes, chave: str, dados: bytes) -> bytes:
+        """HMAC do conteúdo, ligado ao nome do arquivo (um programa não vale sob outro hash)"""
+        return hmac.new(chave_mac, chave.encode('ascii') + b'\0' + dados, hashlib.sha256).digest()
+
+    def _obter_chave_mac(self, criar: bool) -> Optional[bytes]:
+        """Chave do HMAC, ou None se o diretório não é seguro ou a chave não existe"""
+        if not _diretorio_privado(self.diretorio):
+            return None
+        if self._chave_mac is not None:
+            return self._chave_mac
+
+        caminho = os.path.join(self.diretorio, ARQUIVO_CHAVE)
+        chave_mac = _ler_arquivo_privado(caminho, publico=False)
+        if chave_mac is None and criar:
+            try:
+                descritor = os.open(caminho, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(descritor, 'wb') as f:
+                    f.write(secrets.token_bytes(TAMANHO_MAC))
+            except FileExistsError:
+                pass  # Criada por outro processo
+            chave_mac = _ler_arquivo_privado(caminho, publico=False)
+        if chave_mac is None or len(chave_mac) != TAMANHO_MAC:
+            return None
+        self._chave_mac = chave_mac
+        return chave_mac
+
+
+# Tamanho do HMAC-SHA256 e da chave; nome do arquivo da chave no diretório do cache
+TAMANHO_MAC = 32
+ARQUIVO_CHAVE = 'chave'
+
+
+def _diretorio_privado(diretorio: str) -> bool:
+    """O diretório existe, é do usuário atual e só ele pode escrever nele"""
+    if not hasattr(os, 'getuid'):
+        return False
+    try:
+        info = os.lstat(diretorio)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid()
+            and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _ler_arquivo_privado(caminho: str, publico: bool) -> Optional[bytes]:
+    """
+    Conteúdo de um arquivo regular do usuário atual que só ele pode escrever (e,
+    se publico é falso, ler), sem seguir links simbólicos; None se não atende
+    """
+    try:
+        descritor = os.open(caminho, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+    with os.fdopen(descritor, 'rb') as f:
+        info = os.fstat(f.fileno())
+        proibidos = stat.S_IWGRP | stat.S_IWOTH
+        if not publico:
+            proibidos |= stat.S_IRGRP | stat.S_IROTH
+        if (not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid()
+                or info.st_mode & proibidos):
+            return None
+        return f.read()
+
+
+def diretorio_cache_padrao() -> Optional[str]:
+    """Diretório do cache em disco: a variável de ambiente RAINBOW_CACHE ou None (só em memória)"""
+    return os.environ.get('RAINBOW_CACHE') or None
+
+
+# Cache compartilhado pelos interpretadores do processo (IDE, linha de comando)
+CACHE_PROGRAMAS = CacheProgramas(diretorio_cache_padrao())
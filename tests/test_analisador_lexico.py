@@ -0,0 +1,270 @@
+"""Testes do analisador léxico: o coletor de lixo pausado durante a varredura e as
+formas alternativas de análise, que devem dar os mesmos tokens e erros de analisar"""
+
+import gc
+import glob
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+import analisador_lexico
+from analisador_lexico import AnalisadorLexico, TokensCompactos, TokenType
+from analisador_sintatico import AnalisadorSintatico
+
+CODIGO = 'RAINBOW.\n#x recebe 1 + 2.\nmostrar(#x).\n'
+
+# String, chaves, símbolo, nome e escape inválidos, espalhados por várias linhas
+CODIGO_COM_ERROS = ('RAINBOW.\n{ #x recebe "abc.\n} }\n#y recebe 3 @ 2.\n'
+                    '#' + 'v' * 60 + ' recebe "a\\q".\nmostrar(#x).\n{\n')
+
+
+def codigos_de_teste():
+    """Os programas de exemplos/ e tests/ e um com erros léxicos"""
+    arquivos = sorted(glob.glob(os.path.join(RAIZ, "exemplos", "*.rainbow"))
+                      + glob.glob(os.path.join(RAIZ, "tests", "*.rainbow")))
+    codigos = {}
+    for arquivo in arquivos:
+        with open(arquivo, encoding='utf-8', newline='') as f:
+            codigos[os.path.basename(arquivo)] = f.read()
+    codigos['erros léxicos'] = CODIGO_COM_ERROS
+    return codigos
+
+
+def em_dicts(itens):
+    return [item.to_dict() for item in itens]
+
+
+def contagens_esperadas(tokens):
+    """Contagens como a análise as acumulava token a token antes de as estatísticas serem sob demanda"""
+    reservadas = AnalisadorLexico().palavras_reservadas
+    tokens_por_tipo = {}
+    for token in tokens:
+        tokens_por_tipo[token.tipo.name] = tokens_por_tipo.get(token.tipo.name, 0) + 1
+    return {
+        'tokens_por_tipo': tokens_por_tipo,
+        'palavras_reservadas_usadas': {t.lexema for t in tokens if t.lexema in reservadas},
+        'variaveis_declaradas': {t.lexema for t in tokens if t.tipo is TokenType.VARIAVEL},
+    }
+
+
+def estatisticas_esperadas(codigo, tokens):
+    quebras = codigo.count('\n')
+    return {**contagens_esperadas(tokens), 'total_linhas': quebras + 1,
+            'total_caracteres': len(codigo) - quebras}
+
+
+class TestColetorDeLixo(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(gc.enable if gc.isenabled() else gc.disable)
+
+    def test_restaura_coletor_ativo(self):
+        gc.enable()
+        for modo in AnalisadorLexico.MODOS:
+            AnalisadorLexico(modo).analisar(CODIGO)
+            self.assertTrue(gc.isenabled())
+
+    def test_nao_reativa_coletor_desativado(self):
+        gc.disable()
+        for modo in AnalisadorLexico.MODOS:
+            AnalisadorLexico(modo).analisar(CODIGO)
+            self.assertFalse(gc.isenabled())
+
+    def test_varreduras_simultaneas(self):
+        # A primeira varredura a terminar não reativa o coletor da outra
+        gc.enable()
+        dentro = threading.Event()
+        liberar = threading.Event()
+        estados = []
+        analisar_padrao = AnalisadorLexico._analisar_padrao
+
+        def analisar_bloqueado(lexico, *args):
+            dentro.set()
+            liberar.wait(5)
+            analisar_padrao(lexico, *args)
+            estados.append(gc.isenabled())
+
+        lento = AnalisadorLexico()
+        lento._analisar_padrao = lambda *args: analisar_bloqueado(lento, *args)
+        thread = threading.Thread(target=lento.analisar, args=(CODIGO,))
+        thread.start()
+        try:
+            self.assertTrue(dentro.wait(5))
+            AnalisadorLexico().analisar(CODIGO)
+            self.assertFalse(gc.isenabled())
+        finally:
+            liberar.set()
+            thread.join(5)
+        self.assertEqual(estados, [False])
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(analisador_lexico._varreduras_ativas, 0)
+
+
+
+class TestAnaliseEmFluxo(unittest.TestCase):
+    """analisar_fluxo lendo arquivos e buffers em blocos pequenos"""
+
+    TAMANHO_BLOCO = 16
+
+    def comparar(self, codigo, abrir_fonte):
+        esperados, erros_esperados = AnalisadorLexico().analisar(codigo)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'programa.rainbow')
+            with open(caminho, 'w', encoding='utf-8', newline='') as f:
+                f.write(codigo)
+            erros = []
+            with abrir_fonte(caminho) as fonte:
+                tokens = list(AnalisadorLexico().analisar_fluxo(fonte, erros, self.TAMANHO_BLOCO))
+        self.assertEqual(em_dicts(tokens), em_dicts(esperados))
+        self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+    def test_arquivo_texto(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                self.comparar(codigo, lambda caminho: open(caminho, encoding='utf-8', newline=''))
+
+    def test_arquivo_binario(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                self.comparar(codigo, lambda caminho: open(caminho, 'rb'))
+
+    def test_mmap(self):
+        def abrir_mmap(caminho):
+            with open(caminho, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                self.comparar(codigo, abrir_mmap)
+
+    def test_bytes(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                esperados, erros_esperados = AnalisadorLexico().analisar(codigo)
+                erros = []
+                tokens = list(AnalisadorLexico().analisar_fluxo(codigo.encode('utf-8'), erros,
+                                                                self.TAMANHO_BLOCO))
+                self.assertEqual(em_dicts(tokens), em_dicts(esperados))
+                self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+
+
+class TestTokensCompactos(unittest.TestCase):
+    """analisar_compacto em blocos pequenos, nos dois modos de varredura"""
+
+    def test_mesmos_tokens_e_erros(self):
+        for modo in AnalisadorLexico.MODOS:
+            for nome, codigo in codigos_de_teste().items():
+                with self.subTest(modo=modo, programa=nome):
+                    esperados, erros_esperados = AnalisadorLexico(modo).analisar(codigo)
+                    tokens, erros = AnalisadorLexico(modo).analisar_compacto(codigo, tamanho_bloco=16)
+                    self.assertIsInstance(tokens, TokensCompactos)
+                    self.assertEqual(em_dicts(tokens), em_dicts(esperados))
+                    self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+    def test_acesso_por_indice(self):
+        esperados, _ = AnalisadorLexico().analisar(CODIGO_COM_ERROS)
+        tokens, _ = AnalisadorLexico().analisar_compacto(CODIGO_COM_ERROS)
+        self.assertEqual(len(tokens), len(esperados))
+        for i, token in enumerate(esperados):
+            self.assertEqual(tokens[i], token)
+            self.assertEqual((tokens.tipo(i), tokens.lexema(i)), (token.tipo, token.lexema))
+        self.assertEqual(tokens[-1], esperados[-1])
+        self.assertEqual(tokens[2:9:3], esperados[2:9:3])
+
+    def test_mesma_ast(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                esperados, _ = AnalisadorLexico().analisar(codigo)
+                tokens, _ = AnalisadorLexico().analisar_compacto(codigo)
+                ast_esperada, erros_esperados = AnalisadorSintatico().analisar(esperados)
+                ast, erros = AnalisadorSintatico().analisar(tokens)
+                self.assertEqual(ast.to_dict(), ast_esperada.to_dict())
+                self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+
+
+class TestEstatisticas(unittest.TestCase):
+
+    def test_stats_da_analise(self):
+        for modo in AnalisadorLexico.MODOS:
+            for nome, codigo in codigos_de_teste().items():
+                with self.subTest(modo=modo, programa=nome):
+                    lexico = AnalisadorLexico(modo)
+                    tokens, _ = lexico.analisar(codigo)
+                    self.assertEqual(lexico.stats, estatisticas_esperadas(codigo, tokens))
+                    self.assertEqual(lexico.estatisticas(tokens), lexico.stats)
+
+    def test_mesmas_stats_nas_outras_formas(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                tokens, _ = AnalisadorLexico().analisar(codigo)
+                esperadas = estatisticas_esperadas(codigo, tokens)
+
+                lexico = AnalisadorLexico()
+                lexico.analisar_compacto(codigo, tamanho_bloco=16)
+                self.assertEqual(lexico.stats, esperadas)
+
+                lexico = AnalisadorLexico()
+                for _ in lexico.analisar_fluxo(codigo.encode('utf-8'), tamanho_bloco=16):
+                    pass
+                self.assertEqual(lexico.stats, esperadas)
+
+    def test_stats_nao_acumulam_entre_analises(self):
+        lexico = AnalisadorLexico()
+        tokens_erros, _ = lexico.analisar(CODIGO_COM_ERROS)
+        tokens, _ = lexico.analisar(CODIGO)
+        self.assertEqual(lexico.stats, estatisticas_esperadas(CODIGO, tokens))
+        # Outros tokens: contagens deles, totais da última análise
+        stats = lexico.estatisticas(tokens_erros)
+        self.assertEqual(stats, {**contagens_esperadas(tokens_erros), 'total_linhas': 4,
+                                 'total_caracteres': len(CODIGO) - 3})
+
+    def test_sem_estatisticas(self):
+        lexico = AnalisadorLexico(estatisticas=False)
+        tokens, _ = lexico.analisar(CODIGO)
+        vazias = {'tokens_por_tipo': {}, 'palavras_reservadas_usadas': set(), 'variaveis_declaradas': set()}
+        self.assertEqual(lexico.stats, {**vazias, 'total_linhas': 4, 'total_caracteres': len(CODIGO) - 3})
+        # Os relatórios contam os tokens recebidos
+        self.assertEqual(lexico.estatisticas(tokens), estatisticas_esperadas(CODIGO, tokens))
+
+
+
+class TestAnaliseParalela(unittest.TestCase):
+    """analisar_paralelo com trechos de poucas linhas, para que chaves e erros atravessem trechos"""
+
+    # Chaves abertas e fechadas em trechos diferentes, fechamentos sem par e uma chave não fechada
+    CHAVES = 'RAINBOW.\n{\n{ #x recebe 1.\n}\n} }\n}\n{ {\n}\n'
+
+    def comparar(self, modo, codigo):
+        esperados, erros_esperados = AnalisadorLexico(modo).analisar(codigo)
+        tokens, erros = AnalisadorLexico(modo).analisar_paralelo(codigo, processos=2, tamanho_trecho=16)
+        self.assertEqual(em_dicts(tokens), em_dicts(esperados))
+        self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+    def test_mesmos_tokens_e_erros(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                self.comparar('padrao', codigo)
+
+    def test_chaves_entre_trechos(self):
+        for modo in AnalisadorLexico.MODOS:
+            with self.subTest(modo):
+                self.comparar(modo, self.CHAVES)
+                self.comparar(modo, CODIGO_COM_ERROS)
+
+    def test_um_processo(self):
+        tokens, erros = AnalisadorLexico().analisar_paralelo(CODIGO_COM_ERROS, processos=1)
+        esperados, erros_esperados = AnalisadorLexico().analisar(CODIGO_COM_ERROS)
+        self.assertEqual(em_dicts(tokens), em_dicts(esperados))
+        self.assertEqual(em_dicts(erros), em_dicts(erros_esperados))
+
+
+if __name__ == "__main__":
+    unittest.main()
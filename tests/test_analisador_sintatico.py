@@ -0,0 +1,84 @@
+"""Testes do parser de expressões: precedência, associatividade e parênteses profundos"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, TipoNo
+
+
+def analisar_expressao(expressao):
+    codigo = f'RAINBOW.\n#r recebe {expressao}.\n'
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    return AnalisadorSintatico().analisar(tokens)
+
+
+def em_texto(no):
+    """Árvore como expressão prefixada: (operador filhos...)"""
+    if not no.filhos:
+        return str(no.valor)
+    return "(" + " ".join([str(no.valor)] + [em_texto(filho) for filho in no.filhos]) + ")"
+
+
+class TestPrecedencia(unittest.TestCase):
+
+    CASOS = {
+        '1 + 2 * 3': '(+ 1 (* 2 3))',
+        '2 * (3 + 4) / 5': '(/ (* 2 (+ 3 4)) 5)',
+        '1 - 2 - 3': '(- (- 1 2) 3)',
+        '8 / 4 / 2': '(/ (/ 8 4) 2)',
+        '#a OU #b E #c': '(OU #a (E #b #c))',
+        'NAO #a E #b': '(E (NAO #a) #b)',
+        '- - 1': '(- (- 1))',
+        '-(1 + 2)': '(- (+ 1 2))',
+        '#a < 1 igual #b >= 2': '(igual (< #a 1) (>= #b 2))',
+        '#a + 1 > #b * 2 OU NAO #c': '(OU (> (+ #a 1) (* #b 2)) (NAO #c))',
+        '((1))': '1',
+        'ler("x")': '(ler "x")',
+        'ler((1 + 2) * 3)': '(ler (* (+ 1 2) 3))',
+        'ler()': 'ler',
+    }
+
+    def test_arvores(self):
+        for expressao, esperado in self.CASOS.items():
+            with self.subTest(expressao=expressao):
+                ast, erros = analisar_expressao(expressao)
+                self.assertEqual(erros, [])
+                atribuicao = ast.filhos[0]
+                self.assertEqual(atribuicao.tipo, TipoNo.ATRIBUICAO)
+                self.assertEqual(em_texto(atribuicao.filhos[0]), esperado)
+
+    def test_parentese_nao_fechado(self):
+        _, erros = analisar_expressao('(1 + 2')
+        self.assertIn("Esperado FECHA_PARENTESES", str(erros[0]))
+
+
+class TestParentesesProfundos(unittest.TestCase):
+    """Parênteses aninhados além do limite de recursão do Python"""
+
+    PROFUNDIDADE = 3000
+
+    def test_parenteses(self):
+        expressao = '(' * self.PROFUNDIDADE + '1 + 2' + ')' * self.PROFUNDIDADE
+        ast, erros = analisar_expressao(expressao)
+        self.assertEqual(erros, [])
+        soma = ast.filhos[0].filhos[0]
+        self.assertEqual((soma.valor, [filho.valor for filho in soma.filhos]), ('+', ['1', '2']))
+
+    def test_argumento_de_ler(self):
+        expressao = 'ler(' * self.PROFUNDIDADE + '"x"' + ')' * self.PROFUNDIDADE
+        ast, erros = analisar_expressao(expressao)
+        self.assertEqual(erros, [])
+        no, niveis = ast.filhos[0].filhos[0], 0
+        while no.filhos:
+            self.assertEqual(no.valor, 'ler')
+            no, niveis = no.filhos[0], niveis + 1
+        self.assertEqual((no.valor, niveis), ('"x"', self.PROFUNDIDADE))
+
+
+if __name__ == "__main__":
+    unittest.main()
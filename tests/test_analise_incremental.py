@@ -0,0 +1,79 @@
+"""Testes das análises incrementais: resultados já retornados não mudam depois de uma edição"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico, LexicoIncremental
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+
+CODIGO = 'RAINBOW.\n#x recebe 1.\nmostrar(#x +).\n#y recebe 2.\n'
+# Uma linha inserida no início: as declarações seguintes são reaproveitadas uma linha abaixo
+EDITADO = 'RAINBOW.\n#z recebe 0.\n' + CODIGO.split('\n', 1)[1]
+
+
+def tokens(codigo):
+    return AnalisadorLexico(estatisticas=False).analisar(codigo)[0]
+
+
+class TestLexicoIncremental(unittest.TestCase):
+
+    def test_erros_anteriores_nao_mudam(self):
+        lexico = LexicoIncremental(AnalisadorLexico(estatisticas=False), 'RAINBOW.\nmostrar(#).\n')
+        _, erros = lexico.resultado()
+        linhas = [erro.linha for erro in erros]
+        self.assertEqual(linhas, [2])
+
+        lexico.editar(2, 1, 'mostrar(0).\n')
+        _, erros_editados = lexico.resultado()
+        self.assertEqual([erro.linha for erro in erros], linhas)
+        self.assertEqual(erros_editados, AnalisadorLexico().analisar(lexico.codigo())[1])
+
+    def test_tokens_anteriores_nao_mudam(self):
+        lexico = LexicoIncremental(AnalisadorLexico(estatisticas=False), 'RAINBOW.\n#x recebe 1.\n')
+        tokens_anteriores, _ = lexico.resultado()
+        linhas = [token.linha for token in tokens_anteriores]
+
+        lexico.editar(2, 1, '#z recebe 0.\n')
+        tokens_editados, _ = lexico.resultado()
+        self.assertEqual([token.linha for token in tokens_anteriores], linhas)
+        self.assertEqual(tokens_editados, tokens(lexico.codigo()))
+
+
+class TestSintaticoIncremental(unittest.TestCase):
+
+    def test_erros_anteriores_nao_mudam(self):
+        parser = AnalisadorSintatico()
+        _, erros = parser.analisar_incremental(tokens(CODIGO))
+        linhas = [erro.linha for erro in erros]
+        self.assertEqual(linhas, [3])
+
+        _, erros_editados = parser.analisar_incremental(tokens(EDITADO))
+        self.assertEqual([erro.linha for erro in erros], linhas)
+        self.assertEqual(erros_editados, AnalisadorSintatico().analisar(tokens(EDITADO))[1])
+
+
+class TestSemanticoIncremental(unittest.TestCase):
+
+    CODIGO = 'RAINBOW.\nmostrar(1 E 2).\nmostrar(#x + #w).\n'
+    EDITADO = 'RAINBOW.\nmostrar(0).\n' + CODIGO.split('\n', 1)[1]
+
+    def test_diagnosticos_anteriores_nao_mudam(self):
+        parser = AnalisadorSintatico()
+        semantico = AnalisadorSemantico()
+        erros, avisos = semantico.analisar_incremental(parser.analisar_incremental(tokens(self.CODIGO))[0])
+        linhas = [diagnostico.linha for diagnostico in erros + avisos]
+        self.assertEqual(linhas, [2, 3, 3, 3])
+
+        editados = semantico.analisar_incremental(parser.analisar_incremental(tokens(self.EDITADO))[0])
+        self.assertEqual([diagnostico.linha for diagnostico in erros + avisos], linhas)
+        completa = AnalisadorSemantico().analisar(AnalisadorSintatico().analisar(tokens(self.EDITADO))[0])
+        self.assertEqual(editados, completa)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Testes da anotação de tipos: a consulta é pelo próprio nó, não pelo id"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, NoAST, TipoNo
+from analisador_semantico import AnalisadorSemantico, AnotacaoTipos, TipoSimbolo
+from otimizador_ast import OtimizadorAST
+from percurso_ast import iterar_ast
+
+
+def literal(lexema):
+    return NoAST(TipoNo.LITERAL, lexema, [], 1, 1)
+
+
+class TestAnotacaoTipos(unittest.TestCase):
+
+    def test_no_igual_nao_compartilha_anotacao(self):
+        tipos = AnotacaoTipos()
+        anotado = literal('1')
+        tipos[anotado] = TipoSimbolo.NUMERO
+        self.assertEqual(tipos.get(anotado), TipoSimbolo.NUMERO)
+        self.assertIsNone(tipos.get(literal('1')))
+        self.assertNotIn(literal('1'), tipos)
+
+    def test_id_de_no_descartado_nao_e_reaproveitado(self):
+        # Com um dicionário por id, o nó novo ocuparia a memória do descartado
+        tipos = AnotacaoTipos()
+        descartado = literal('1')
+        tipos[descartado] = TipoSimbolo.NUMERO
+        del descartado
+        novo = literal('"a"')
+        self.assertNotIn(novo, tipos)
+        self.assertEqual(len(tipos), 1)
+
+    def test_otimizador_anota_os_literais_criados(self):
+        codigo = 'RAINBOW.\n#x recebe ler("x").\nmostrar(#x + (2 * 3)).\n'
+        ast, _ = AnalisadorSintatico().analisar(AnalisadorLexico(estatisticas=False).analisar(codigo)[0])
+        analisador = AnalisadorSemantico()
+        analisador.analisar(ast)
+        otimizada = OtimizadorAST(analisador).otimizar(ast)
+        dobrados = [no for no, _ in iterar_ast(otimizada) if no.tipo == TipoNo.LITERAL and no.valor == '6']
+        self.assertEqual(len(dobrados), 1)
+        self.assertEqual(analisador.tipo_de(dobrados[0]), TipoSimbolo.NUMERO)
+
+
+if __name__ == "__main__":
+    unittest.main()
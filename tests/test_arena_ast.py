@@ -0,0 +1,102 @@
+"""Testes da AST em arena: ArenaAST e NoArena devem equivaler à árvore de NoAST"""
+
+import glob
+import io
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, ArenaAST, NoAST, NoArena, TipoNo
+from analisador_semantico import AnalisadorSemantico
+
+# Declarações válidas entre erros sintáticos, para que a recuperação também seja comparada
+CODIGO_COM_ERROS = ('RAINBOW.\n#a recebe (1 + 2.\n#b recebe #a * 2.\nse (#b > 1) { mostrar(#b).\n'
+                    '#c recebe .\npara #i de 1 ate 3 passo 1 { #a recebe #a + #i. }\n')
+
+
+def codigos_de_teste():
+    """Os programas de exemplos/ e tests/ e um com erros sintáticos"""
+    arquivos = sorted(glob.glob(os.path.join(RAIZ, "exemplos", "*.rainbow"))
+                      + glob.glob(os.path.join(RAIZ, "tests", "*.rainbow")))
+    codigos = {}
+    for arquivo in arquivos:
+        with open(arquivo, encoding='utf-8') as f:
+            codigos[os.path.basename(arquivo)] = f.read()
+    codigos['erros sintáticos'] = CODIGO_COM_ERROS
+    return codigos
+
+
+def em_dicts(itens):
+    return [item.to_dict() for item in itens]
+
+
+def analisar(codigo, compacto):
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    parser = AnalisadorSintatico()
+    return parser.analisar_compacto(tokens) if compacto else parser.analisar(tokens)
+
+
+class TestArenaAST(unittest.TestCase):
+
+    def test_analisar_compacto(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                ast, erros = analisar(codigo, compacto=False)
+                raiz, erros_arena = analisar(codigo, compacto=True)
+                self.assertIsInstance(raiz, NoArena)
+                self.assertEqual(raiz.to_dict(), ast.to_dict())
+                self.assertEqual(em_dicts(erros_arena), em_dicts(erros))
+
+    def test_percurso_por_indice(self):
+        ast, _ = analisar(CODIGO_COM_ERROS, compacto=False)
+        arena = ArenaAST.de_no(ast)
+        pendentes = [(ast, 0)]
+        visitados = 0
+        while pendentes:
+            no, i = pendentes.pop()
+            visitados += 1
+            self.assertEqual((arena.tipo(i), arena.valor(i)), (no.tipo, no.valor))
+            vista = arena.no(i)
+            self.assertEqual((vista.tipo, vista.valor, vista.linha, vista.coluna),
+                             (no.tipo, no.valor, no.linha, no.coluna))
+            filhos = list(arena.filhos(i))
+            self.assertEqual([filho.indice for filho in vista.filhos], filhos)
+            self.assertEqual(len(filhos), len(no.filhos))
+            pendentes.extend(zip(no.filhos, filhos))
+        self.assertEqual(visitados, len(arena))
+        # Valores repetidos ficam uma vez na tabela
+        valores = [valor for valor in arena.tabela_valores if not isinstance(valor, dict)]
+        self.assertEqual(len(valores), len(set(valores)))
+
+    def test_anexar(self):
+        ast, _ = analisar(CODIGO_COM_ERROS, compacto=False)
+        arena = ArenaAST()
+        raiz = arena.acrescentar(NoAST(ast.tipo, ast.valor, [], ast.linha, ast.coluna))
+        for declaracao in ast.filhos:
+            arena.anexar(raiz, declaracao)
+        self.assertEqual(arena.no(raiz).to_dict(), ast.to_dict())
+        self.assertEqual(arena.raiz, arena.no(raiz))
+
+    def test_mesma_analise_semantica_e_relatorio(self):
+        for nome, codigo in codigos_de_teste().items():
+            with self.subTest(nome):
+                ast, _ = analisar(codigo, compacto=False)
+                raiz, _ = analisar(codigo, compacto=True)
+                erros, avisos = AnalisadorSemantico().analisar(ast)
+                erros_arena, avisos_arena = AnalisadorSemantico().analisar(raiz)
+                self.assertEqual(em_dicts(erros_arena), em_dicts(erros))
+                self.assertEqual(em_dicts(avisos_arena), em_dicts(avisos))
+
+                texto, texto_arena = io.StringIO(), io.StringIO()
+                AnalisadorSintatico()._escrever_ast(texto, ast, 0)
+                AnalisadorSintatico()._escrever_ast(texto_arena, raiz, 0)
+                self.assertEqual(texto_arena.getvalue(), texto.getvalue())
+                self.assertEqual(raiz.tipo, TipoNo.PROGRAMA)
+
+
+if __name__ == "__main__":
+    unittest.main()
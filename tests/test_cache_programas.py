@@ -0,0 +1,101 @@
+"""
+Testes do cache de programas compilados do motor 'python'
+O cache em disco só carrega arquivos privados do usuário com HMAC válido
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+from interpretador_rainbow import InterpretadorRainbow
+from limites_execucao import LimitesExecucao
+from transpilador_python import CacheProgramas, TranspiladorPython, ARQUIVO_CHAVE
+
+CODIGO = 'RAINBOW.\n#a recebe 2.\nmostrar(#a * 3).\n'
+
+
+def compilar(codigo):
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    ast, _ = AnalisadorSintatico().analisar(tokens)
+    return TranspiladorPython().compilar(ast)
+
+
+@unittest.skipUnless(hasattr(os, 'getuid'), "o cache em disco exige POSIX")
+class TestCacheProgramas(unittest.TestCase):
+
+    def setUp(self):
+        temporario = tempfile.TemporaryDirectory()
+        self.addCleanup(temporario.cleanup)
+        self.diretorio = os.path.join(temporario.name, 'cache')
+        CacheProgramas(self.diretorio).armazenar(CODIGO, compilar(CODIGO))
+        self.arquivo = CacheProgramas(self.diretorio)._caminho(CacheProgramas.chave(CODIGO))
+
+    def test_padrao_somente_em_memoria(self):
+        ambiente = {chave: valor for chave, valor in os.environ.items() if chave != 'RAINBOW_CACHE'}
+        saida = subprocess.run(
+            [sys.executable, '-c', 'from transpilador_python import CACHE_PROGRAMAS; print(CACHE_PROGRAMAS.diretorio)'],
+            cwd=os.path.join(RAIZ, "src"), env=ambiente, capture_output=True, text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), 'None')
+
+    def test_programa_lido_do_disco(self):
+        self.assertEqual(os.stat(self.diretorio).st_mode & 0o777, 0o700)
+        self.assertEqual(os.stat(os.path.join(self.diretorio, ARQUIVO_CHAVE)).st_mode & 0o777, 0o600)
+        self.assertIsNotNone(CacheProgramas(self.diretorio).obter(CODIGO))
+
+    def test_arquivo_alterado_rejeitado(self):
+        with open(self.arquivo, 'r+b') as f:
+            conteudo = f.read()
+            f.seek(len(conteudo) - 1)
+            f.write(bytes([conteudo[-1] ^ 1]))
+        self.assertIsNone(CacheProgramas(self.diretorio).obter(CODIGO))
+
+    def test_chave_diferente_rejeitada(self):
+        self.assertIsNone(CacheProgramas(self.diretorio, chave_mac=b'x' * 32).obter(CODIGO))
+
+    def test_programa_sob_outro_hash_rejeitado(self):
+        outro = 'RAINBOW.\nmostrar(1).\n'
+        os.replace(self.arquivo, CacheProgramas(self.diretorio)._caminho(CacheProgramas.chave(outro)))
+        self.assertIsNone(CacheProgramas(self.diretorio).obter(outro))
+
+    def test_diretorio_com_escrita_para_outros_rejeitado(self):
+        os.chmod(self.diretorio, 0o777)
+        self.assertIsNone(CacheProgramas(self.diretorio).obter(CODIGO))
+
+    def test_arquivo_com_escrita_para_outros_rejeitado(self):
+        os.chmod(self.arquivo, 0o666)
+        self.assertIsNone(CacheProgramas(self.diretorio).obter(CODIGO))
+
+    def test_chave_legivel_por_outros_rejeitada(self):
+        os.chmod(os.path.join(self.diretorio, ARQUIVO_CHAVE), 0o644)
+        self.assertIsNone(CacheProgramas(self.diretorio).obter(CODIGO))
+
+
+class TestChaveDoCache(unittest.TestCase):
+
+    def test_limite_de_texto_faz_parte_da_chave(self):
+        # Sem limite o otimizador dobra a concatenação; com limite ela fica para a execução
+        codigo = 'RAINBOW.\nmostrar("abcdef" + "ghijkl").\n'
+        with tempfile.NamedTemporaryFile('w', suffix='.rainbow', encoding='utf-8', delete=False) as f:
+            f.write(codigo)
+        self.addCleanup(os.unlink, f.name)
+        cache = CacheProgramas(None)
+
+        sem_limite = InterpretadorRainbow(cache_programas=cache)
+        self.assertTrue(sem_limite.executar_arquivo(f.name)[0])
+        self.assertTrue(sem_limite.programa_em_cache(codigo))
+
+        com_limite = InterpretadorRainbow(cache_programas=cache, limites=LimitesExecucao(max_tamanho_texto=5))
+        self.assertFalse(com_limite.programa_em_cache(codigo))
+        self.assertFalse(com_limite.executar_arquivo(f.name)[0])
+        self.assertEqual(com_limite.resultado.limite, 'texto')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Testes dos diagnósticos: o texto é o das mensagens montadas antes dos registros Diagnostico"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import AnalisadorSemantico
+from diagnosticos import Diagnostico, LEXICO, SINTATICO, SEMANTICO, ERRO, AVISO
+
+CODIGO_LEXICO = ('RAINBOW.\n{ #x recebe "abc.\n} }\n#y recebe 3 @ 2.\n'
+                 '#' + 'v' * 60 + ' recebe "a\\q".\n{\n')
+
+CODIGO_SINTATICO = 'RAINBOW.\n#a recebe (1 + 2.\nse #a { mostrar(#a).\n#b recebe .\nxyz.\n'
+
+CODIGO_SEMANTICO = ('RAINBOW.\nnumero #n.\nnumero #n.\ntexto #t.\nlogico #l.\n#l recebe Verdadeiro.\n'
+                    '#n recebe #t - 1.\n#t recebe 5.\nse (#n) { mostrar(#z). }\n'
+                    'enquanto (1) { #n recebe NAO 3. }\n'
+                    'para #t de 1 ate "a" passo 1 { mostrar(-#l). }\n#u recebe ler(2) + Verdadeiro.\n'
+                    'mostrar(#n < "a").\nmostrar(#l E 1).\nmostrar(#n + #l).\nnumero #nunca.\n')
+
+# Textos gerados pelas análises quando os erros eram strings formatadas na hora
+ESPERADOS = {
+    'lexico': (CODIGO_LEXICO, {
+        'lexico': [
+            'Linha: 02 - Coluna: 13 - Erro: String não fechada',
+            'Linha: 03 - Coluna: 03 - Erro: Chave de fechamento sem correspondente',
+            "Linha: 04 - Coluna: 13 - Erro: Símbolo não reconhecido: '@'",
+            'Linha: 05 - Coluna: 01 - Erro: Nome de variável muito longo: #vvvvvvvvvvvvvvvvvvv...',
+            "Linha: 05 - Coluna: 73 - Erro: Caractere de escape inválido '\\q'",
+            'Linha: 06 - Coluna: 01 - Erro: Chave aberta não foi fechada',
+        ],
+        'sintatico': [
+            'Linha: 02 - Coluna: 01 - Erro Sintático: Declaração inválida: ABRE_CHAVES',
+            'Linha: 03 - Coluna: 01 - Erro Sintático: Declaração inválida: FECHA_CHAVES',
+            'Linha: 03 - Coluna: 01 - Erro Sintático: Token não processado: FECHA_CHAVES',
+            'Linha: 03 - Coluna: 03 - Erro Sintático: Declaração inválida: FECHA_CHAVES',
+            'Linha: 03 - Coluna: 03 - Erro Sintático: Token não processado: FECHA_CHAVES',
+            'Linha: 04 - Coluna: 15 - Erro Sintático: Esperado FIM_LINHA, encontrado NUMERO',
+            'Linha: 04 - Coluna: 15 - Erro Sintático: Declaração inválida: NUMERO',
+            'Linha: 06 - Coluna: 01 - Erro Sintático: Declaração inválida: ABRE_CHAVES',
+        ],
+        'erros': [],
+        'avisos': [],
+    }),
+    'sintatico': (CODIGO_SINTATICO, {
+        'lexico': [
+            'Linha: 05 - Coluna: 01 - Erro: Identificador inválido: xyz',
+            'Linha: 03 - Coluna: 07 - Erro: Chave aberta não foi fechada',
+        ],
+        'sintatico': [
+            'Linha: 02 - Coluna: 17 - Erro Sintático: Esperado FECHA_PARENTESES, encontrado FIM_LINHA',
+            'Linha: 02 - Coluna: 17 - Erro Sintático: Declaração inválida: FIM_LINHA',
+            'Linha: 04 - Coluna: 11 - Erro Sintático: Expressão inválida: FIM_LINHA',
+            'Linha: 04 - Coluna: 11 - Erro Sintático: Declaração inválida: FIM_LINHA',
+            'Linha: 05 - Coluna: 04 - Erro Sintático: Declaração inválida: FIM_LINHA',
+        ],
+        'erros': [],
+        'avisos': ["Linha: 03 - Coluna: 04 - Aviso: Variável '#a' usada sem declaração explícita"],
+    }),
+    'semantico': (CODIGO_SEMANTICO, {
+        'lexico': [],
+        'sintatico': [],
+        'erros': [
+            "Linha: 03 - Coluna: 01 - Erro: Variável '#n' já foi declarada neste escopo",
+            "Linha: 07 - Coluna: 14 - Erro: Operador '-' requer operandos do tipo 'numero'",
+            "Linha: 09 - Coluna: 01 - Erro: Condição deve ser do tipo 'logico', encontrado 'NUMERO'",
+            "Linha: 10 - Coluna: 01 - Erro: Condição do 'enquanto' deve ser do tipo 'logico'",
+            "Linha: 10 - Coluna: 26 - Erro: Operador 'NAO' requer operando do tipo 'logico'",
+            "Linha: 11 - Coluna: 01 - Erro: Expressões do laço 'para' devem ser do tipo 'numero'",
+            "Linha: 11 - Coluna: 40 - Erro: Operador '-' unário requer operando do tipo 'numero'",
+            "Linha: 14 - Coluna: 12 - Erro: Operador 'E' requer operandos do tipo 'logico'",
+            "Linha: 15 - Coluna: 12 - Erro: Operador '+' requer tipos compatíveis",
+        ],
+        'avisos': [
+            "Linha: 09 - Coluna: 19 - Aviso: Variável '#z' usada sem declaração explícita",
+            "Linha: 10 - Coluna: 16 - Aviso: Possível incompatibilidade de tipos - esperado 'NUMERO', "
+            "encontrado 'LOGICO'",
+            "Linha: 12 - Coluna: 11 - Aviso: Argumento de 'ler' deve ser do tipo 'texto'",
+            "Linha: 16 - Coluna: 01 - Aviso: Variável '#nunca' declarada mas não utilizada",
+        ],
+    }),
+}
+
+
+def diagnosticos(codigo):
+    """Diagnósticos de cada fase, com a fase e a severidade que devem ter"""
+    tokens, erros_lexicos = AnalisadorLexico().analisar(codigo)
+    ast, erros_sintaticos = AnalisadorSintatico().analisar(tokens)
+    erros, avisos = AnalisadorSemantico().analisar(ast)
+    return {
+        'lexico': (erros_lexicos, LEXICO, ERRO),
+        'sintatico': (erros_sintaticos, SINTATICO, ERRO),
+        'erros': (erros, SEMANTICO, ERRO),
+        'avisos': (avisos, SEMANTICO, AVISO),
+    }
+
+
+class TestTextoDosDiagnosticos(unittest.TestCase):
+
+    def test_mesmo_texto(self):
+        for nome, (codigo, esperados) in ESPERADOS.items():
+            for grupo, (lista, fase, severidade) in diagnosticos(codigo).items():
+                with self.subTest(programa=nome, grupo=grupo):
+                    self.assertEqual([str(d) for d in lista], esperados[grupo])
+                    self.assertTrue(all(d.fase == fase and d.severidade == severidade for d in lista))
+
+    def test_to_dict(self):
+        for nome, (codigo, _) in ESPERADOS.items():
+            for grupo, (lista, _, _) in diagnosticos(codigo).items():
+                for diagnostico in lista:
+                    with self.subTest(programa=nome, diagnostico=str(diagnostico)):
+                        dados = diagnostico.to_dict()
+                        self.assertEqual(dados, {
+                            'fase': diagnostico.fase, 'severidade': diagnostico.severidade,
+                            'linha': diagnostico.linha, 'coluna': diagnostico.coluna,
+                            'codigo': diagnostico.codigo, 'mensagem': diagnostico.mensagem,
+                        })
+                        self.assertTrue(str(diagnostico).endswith(": " + dados['mensagem']))
+
+
+class TestDiagnostico(unittest.TestCase):
+
+    def test_sem_posicao(self):
+        diagnostico = Diagnostico(SEMANTICO, ERRO, None, None, 'erro_interno_semantico', ('falhou',))
+        self.assertEqual(str(diagnostico), "Erro interno na análise semântica: falhou")
+        self.assertIs(diagnostico.deslocado(3), diagnostico)
+
+    def test_sem_coluna(self):
+        diagnostico = Diagnostico(SEMANTICO, ERRO, 7, None, 'declaracao_mal_formada')
+        self.assertEqual(str(diagnostico), "Linha: 07 - Erro: Declaração de variável mal formada")
+
+    def test_deslocado_nao_muda_o_original(self):
+        diagnostico = Diagnostico(SINTATICO, ERRO, 4, 2, 'declaracao_invalida', ('VIRGULA',))
+        copia = diagnostico.deslocado(-2)
+        self.assertEqual(str(copia), "Linha: 02 - Coluna: 02 - Erro Sintático: Declaração inválida: VIRGULA")
+        self.assertEqual(diagnostico.linha, 4)
+
+    def test_mensagens_com_chaves(self):
+        # '{{' e '}}' nos modelos são chaves literais, não campos
+        self.assertEqual(Diagnostico(SINTATICO, ERRO, 1, 1, 'abre_bloco_esperado').mensagem,
+                         "Esperado '{' para início do bloco")
+        self.assertEqual(Diagnostico(SINTATICO, ERRO, 1, 1, 'fecha_bloco_esperado').mensagem,
+                         "Esperado '}' para fechar o bloco")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Testes dos motores de execução Rainbow
+Os programas de exemplos/ e tests/ são executados em todos os motores e a saída
+é comparada com a do interpretador por linhas
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+import interpretador_rainbow
+from interpretador_rainbow import InterpretadorRainbow
+from limites_execucao import LimitesExecucao
+from transpilador_python import CacheProgramas
+
+
+PROGRAMAS = sorted(glob.glob(os.path.join(RAIZ, "exemplos", "*.rainbow"))
+                   + glob.glob(os.path.join(RAIZ, "tests", "*.rainbow")))
+
+
+def executar(motor, arquivo, entrada="7", limites=None):
+    """Retorna (sucesso, mensagem, linhas de saída) da execução do arquivo"""
+    interpretador = InterpretadorRainbow(ide_callback=lambda prompt: entrada, motor=motor,
+                                         cache_programas=CacheProgramas(None), limites=limites)
+    sucesso, mensagem = interpretador.executar_arquivo(arquivo)
+    return sucesso, mensagem, list(interpretador.output)
+
+
+def executar_codigo(motor, codigo, entrada="7", limites=None):
+    """Grava o código em um arquivo temporário e o executa com executar_arquivo"""
+    with tempfile.NamedTemporaryFile('w', suffix='.rainbow', encoding='utf-8', delete=False) as f:
+        f.write(codigo)
+    try:
+        return executar(motor, f.name, entrada, limites)
+    finally:
+        os.unlink(f.name)
+
+
+class TestMotores(unittest.TestCase):
+
+    def test_programas_iguais_ao_interpretador_por_linhas(self):
+        self.assertTrue(PROGRAMAS)
+        for arquivo in PROGRAMAS:
+            esperado = executar('linhas', arquivo)
+            for motor in InterpretadorRainbow.MOTORES:
+                with self.subTest(programa=os.path.basename(arquivo), motor=motor):
+                    obtido = executar(motor, arquivo)
+                    if esperado[0] or not obtido[0]:
+                        self.assertEqual(obtido, esperado)
+                    else:
+                        # O interpretador por linhas não avalia E/OU/igual entre
+                        # variáveis; até o erro, a saída dele é a mesma
+                        self.assertEqual(obtido[2][:len(esperado[2])], esperado[2])
+
+    def assertIgualAoInterpretadorPorLinhas(self, codigo, saida):
+        esperado = executar_codigo('linhas', codigo)
+        self.assertEqual(esperado[2], saida)
+        for motor in InterpretadorRainbow.MOTORES:
+            with self.subTest(motor=motor):
+                self.assertEqual(executar_codigo(motor, codigo), esperado)
+
+    def test_cadeia_longa_de_operadores(self):
+        # 300 operandos passam do limite de parênteses aninhados do compilador Python;
+        # 3000, do limite de recursão
+        for operandos, saida in ((300, '-2086'), (3000, '-20986')):
+            codigo = ('RAINBOW.\n#a recebe ler("a").\n#b recebe ' + ' - '.join(['#a'] * operandos)
+                      + '.\nmostrar(#b).\n')
+            self.assertIgualAoInterpretadorPorLinhas(codigo, [saida])
+
+    def test_aninhamento_profundo(self):
+        # Mais blocos aninhados que o compilador Python aceita (20 laços, 100 níveis de indentação)
+        codigo = ('RAINBOW.\n#s recebe 0.\n'
+                  + ''.join(f'para #i{nivel} de 1 ate 1 passo 1 {{\n' for nivel in range(22))
+                  + '#s recebe #s + 1.\n' + '}\n' * 22 + 'mostrar(#s).\n')
+        self.assertIgualAoInterpretadorPorLinhas(codigo, ['1'])
+
+        codigo = ('RAINBOW.\n#s recebe ler("s").\n' + 'se (#s > 0) {\n' * 200
+                  + 'mostrar(#s).\n' + '}\n' * 200)
+        self.assertIgualAoInterpretadorPorLinhas(codigo, ['7'])
+
+    def test_enquanto_com_mais_de_1000_iteracoes(self):
+        codigo = ('RAINBOW.\n#i recebe 0.\n'
+                  'enquanto (#i < 5000) {\n#i recebe #i + 1.\n}\nmostrar(#i).\n')
+        self.assertIgualAoInterpretadorPorLinhas(codigo, ['5000'])
+
+        # O limite por laço continua disponível quando configurado explicitamente
+        limites = LimitesExecucao(max_iteracoes=1000)
+        for motor in InterpretadorRainbow.MOTORES:
+            with self.subTest(motor=motor):
+                sucesso, mensagem, _ = executar_codigo(motor, codigo, limites=limites)
+                self.assertFalse(sucesso)
+                self.assertIn("Loop infinito detectado!", mensagem)
+
+    def test_atribuicao_nao_lida_que_estoura_nao_e_removida(self):
+        # #b passa do maior float: dividir ou somar com float levanta OverflowError
+        for expressao in ('#b / 3', '#b + 0.5'):
+            with self.subTest(expressao=expressao):
+                codigo = ('RAINBOW.\n#b recebe 2.\npara #i de 1 ate 11 passo 1 {\n#b recebe #b * #b.\n}\n'
+                          f'#d recebe {expressao}.\nmostrar(1).\n')
+                self.assertIgualAoInterpretadorPorLinhas(codigo, [])
+                self.assertFalse(executar_codigo('python', codigo)[0])
+
+    def test_linha_de_comando_interrompe_loop_infinito(self):
+        self.assertIsNotNone(InterpretadorRainbow.TEMPO_MAXIMO_LINHA_COMANDO)
+        codigo = 'RAINBOW.\n#i recebe 0.\nenquanto (#i > -1) {\n#i recebe #i + 1.\n}\n'
+        with tempfile.NamedTemporaryFile('w', suffix='.rainbow', encoding='utf-8', delete=False) as f:
+            f.write(codigo)
+        self.addCleanup(os.unlink, f.name)
+        for motor in InterpretadorRainbow.MOTORES:
+            with self.subTest(motor=motor):
+                saida = io.StringIO()
+                with mock.patch.object(InterpretadorRainbow, 'TEMPO_MAXIMO_LINHA_COMANDO', 0.2), \
+                        mock.patch.object(sys, 'argv', ['interpretador_rainbow.py', '--motor', motor, f.name]), \
+                        mock.patch.object(interpretador_rainbow, 'CACHE_PROGRAMAS', CacheProgramas(None)), \
+                        contextlib.redirect_stdout(saida):
+                    interpretador_rainbow.main()
+                self.assertIn("Tempo limite de execução excedido", saida.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
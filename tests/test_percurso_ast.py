@@ -0,0 +1,82 @@
+"""Testes dos percursos com pilha explícita em ASTs mais profundas que o limite de recursão"""
+
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from analisador_lexico import AnalisadorLexico
+from analisador_sintatico import AnalisadorSintatico, ArenaAST, NoAST, TipoNo
+from analisador_semantico import AnalisadorSemantico
+
+PROFUNDIDADE = 10000
+
+
+def gerar_blocos(profundidade):
+    """'se' e 'enquanto' alternados (montados direto em NoAST: o parser de comandos é recursivo)"""
+    corpo = NoAST(TipoNo.BLOCO, "bloco", [
+        NoAST(TipoNo.ATRIBUICAO, "#x", [NoAST(TipoNo.LITERAL, "1", [], profundidade + 2, 1)],
+              profundidade + 2, 1)
+    ], profundidade + 2, 1)
+    for nivel in range(profundidade, 0, -1):
+        condicao = NoAST(TipoNo.EXPRESSAO_BINARIA, "<", [
+            NoAST(TipoNo.VARIAVEL, "#x", [], nivel + 1, 5),
+            NoAST(TipoNo.LITERAL, "10", [], nivel + 1, 10),
+        ], nivel + 1, 8)
+        tipo, valor = (TipoNo.CONDICIONAL, "se") if nivel % 2 else (TipoNo.LACO_ENQUANTO, "enquanto")
+        comando = NoAST(tipo, valor, [condicao, corpo], nivel + 1, 1)
+        corpo = NoAST(TipoNo.BLOCO, "bloco", [comando], nivel + 1, 1)
+    inicio = NoAST(TipoNo.ATRIBUICAO, "#x", [NoAST(TipoNo.LITERAL, "0", [], 1, 10)], 1, 1)
+    return NoAST(TipoNo.PROGRAMA, "RAINBOW", [inicio, *corpo.filhos], 0, 1)
+
+
+def analisar_codigo(codigo):
+    tokens, _ = AnalisadorLexico(estatisticas=False).analisar(codigo)
+    ast, erros = AnalisadorSintatico().analisar(tokens)
+    assert not erros, erros[0]
+    return ast
+
+
+def achatar(dicionario):
+    """Campos de cada nó do dicionário em pré-ordem, com a profundidade (== é recursivo)"""
+    nos = []
+    pendentes = [(dicionario, 1)]
+    while pendentes:
+        atual, nivel = pendentes.pop()
+        nos.append((nivel, len(atual['filhos']),
+                    sorted((chave, repr(valor)) for chave, valor in atual.items() if chave != 'filhos')))
+        pendentes.extend((filho, nivel + 1) for filho in reversed(atual['filhos']))
+    return nos
+
+
+class TestPercursoProfundo(unittest.TestCase):
+
+    def test_profundidade_maior_que_limite_de_recursao(self):
+        self.assertGreater(PROFUNDIDADE, sys.getrecursionlimit())
+        casos = [
+            ("blocos se/enquanto", gerar_blocos(PROFUNDIDADE)),
+            ("cadeia de '+'", analisar_codigo(
+                "RAINBOW.\n#x recebe " + " + ".join(["1"] * PROFUNDIDADE) + ".")),
+            ("'NAO' aninhados", analisar_codigo(
+                "RAINBOW.\n#x recebe " + "NAO " * PROFUNDIDADE + "Verdadeiro.")),
+        ]
+        parser = AnalisadorSintatico()
+        for nome, ast in casos:
+            with self.subTest(caso=nome):
+                erros, _ = AnalisadorSemantico().analisar(ast)
+                self.assertEqual(erros, [])
+
+                nos = achatar(ast.to_dict())
+                self.assertGreater(max(nivel for nivel, _, _ in nos), PROFUNDIDADE)
+                arena = ArenaAST()
+                self.assertEqual(achatar(arena.no(arena.acrescentar(ast)).to_dict()), nos)
+
+                # O texto tem indentação proporcional à profundidade: só o percurso interessa
+                with open(os.devnull, 'w', encoding='utf-8') as descarte:
+                    parser._escrever_ast(descarte, ast, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Testes da saída em fluxo: SaidaStreaming entrega o mesmo texto da saída acumulada"""
+
+import glob
+import io
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+from interpretador_rainbow import InterpretadorRainbow
+from saida_programa import SaidaStreaming
+from transpilador_python import CacheProgramas
+
+PROGRAMAS = sorted(glob.glob(os.path.join(RAIZ, "exemplos", "*.rainbow"))
+                   + glob.glob(os.path.join(RAIZ, "tests", "*.rainbow")))
+
+
+class TestSaidaDosMotores(unittest.TestCase):
+
+    def test_mesmo_texto_da_saida_acumulada(self):
+        for arquivo in PROGRAMAS:
+            for motor in InterpretadorRainbow.MOTORES:
+                with self.subTest(programa=os.path.basename(arquivo), motor=motor):
+                    acumulado = InterpretadorRainbow(ide_callback=lambda prompt: "7", motor=motor,
+                                                     cache_programas=CacheProgramas(None))
+                    sucesso, _ = acumulado.executar_arquivo(arquivo)
+
+                    lotes = []
+                    em_fluxo = InterpretadorRainbow(ide_callback=lambda prompt: "7", motor=motor,
+                                                    cache_programas=CacheProgramas(None),
+                                                    saida=SaidaStreaming(lotes.append, max_linhas=2))
+                    self.assertEqual(em_fluxo.executar_arquivo(arquivo)[0], sucesso)
+                    esperado = "".join(linha + "\n" for linha in acumulado.output)
+                    self.assertEqual("".join(lotes), esperado)
+                    self.assertEqual(em_fluxo.output, [])
+
+
+class TestSaidaStreaming(unittest.TestCase):
+
+    def test_lotes_por_linhas_e_bytes(self):
+        lotes = []
+        saida = SaidaStreaming(lotes.append, max_linhas=3, max_bytes=12, intervalo=60)
+        for linha in ("a", "b", "c", "d", "0123456789", "e"):
+            saida.escrever(linha)
+        self.assertEqual(lotes, ["a\nb\nc\n", "d\n0123456789\n"])
+        saida.descarregar()
+        saida.descarregar()
+        self.assertEqual(lotes, ["a\nb\nc\n", "d\n0123456789\n", "e\n"])
+
+    def test_intervalo(self):
+        lotes = []
+        saida = SaidaStreaming(lotes.append, intervalo=0)
+        saida.escrever("a")
+        saida.escrever("b")
+        self.assertEqual(lotes, ["a\n", "b\n"])
+
+    def test_destino_com_write(self):
+        destino = io.StringIO()
+        saida = SaidaStreaming(destino, intervalo=60)
+        saida.escrever("olá")
+        self.assertEqual(destino.getvalue(), "")
+        saida.descarregar()
+        self.assertEqual(destino.getvalue(), "olá\n")
+        with self.assertRaises(TypeError):
+            SaidaStreaming(42)
+
+    def test_saida_pendente_antes_de_ler(self):
+        lotes = []
+        vistos = []
+
+        def responder(prompt):
+            vistos.append("".join(lotes))
+            return "Ana"
+
+        codigo = 'RAINBOW.\nmostrar("antes").\n#nome recebe ler("Nome?").\nmostrar(#nome).\n'
+        for motor in InterpretadorRainbow.MOTORES:
+            with self.subTest(motor=motor):
+                lotes.clear()
+                vistos.clear()
+                interpretador = InterpretadorRainbow(ide_callback=responder, motor=motor,
+                                                     cache_programas=CacheProgramas(None),
+                                                     saida=SaidaStreaming(lotes.append, intervalo=60))
+                sucesso, _ = interpretador.executar_codigo(codigo)
+                self.assertTrue(sucesso)
+                self.assertEqual(vistos, ["antes\n"])
+                self.assertEqual("".join(lotes), "antes\nAna\n")
+
+
+if __name__ == "__main__":
+    unittest.main()